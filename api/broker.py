@@ -0,0 +1,373 @@
+"""
+CrewSight-AI Work Broker
+
+SQLite-backed work queue shared by the API and distributed worker processes,
+with leases, heartbeats, retries and a dead-letter state.
+
+© 2025 Utilyst Inc. All rights reserved.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+
+UNIT_QUEUED = "queued"
+UNIT_CLAIMED = "claimed"
+UNIT_DONE = "done"
+UNIT_DEAD = "dead"
+UNIT_CANCELLED = "cancelled"
+
+
+class SQLiteBroker:
+    """
+    Durable queue of work units claimed by worker processes.
+    
+    A claimed unit is leased to its worker for ``visibility_timeout``
+    seconds; workers extend the lease with heartbeats while they work. A
+    unit whose lease expires (its worker died or hung) becomes visible
+    again, and a unit that failed or expired ``max_attempts`` times is
+    dead-lettered until retried by hand. Failed units are retried after
+    ``retry_delay`` seconds times the number of attempts so far.
+    
+    Every process opens its own connection; claims run in ``BEGIN
+    IMMEDIATE`` transactions so a unit is only ever leased to one worker.
+    Workers on several nodes need the database on storage with working
+    file locks (a local disk shared by containers, not NFS).
+    
+    © 2025 Utilyst Inc. All rights reserved.
+    """
+    
+    def __init__(
+        self,
+        db_path: str = "./output/broker.db",
+        visibility_timeout: float = 600.0,
+        max_attempts: int = 3,
+        retry_delay: float = 30.0,
+    ):
+        """
+        Open (and create if needed) the broker database.
+        
+        Args:
+            db_path: SQLite database shared by the API and the workers
+            visibility_timeout: Seconds a claim lasts without a heartbeat
+            max_attempts: Claims of a unit before it is dead-lettered
+            retry_delay: Base delay in seconds before a failed unit is retried
+        """
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max(1, max_attempts)
+        self.retry_delay = retry_delay
+        
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            db_path, timeout=30.0, isolation_level=None, check_same_thread=False
+        )
+        self._db.row_factory = sqlite3.Row
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS units (
+                unit_id TEXT PRIMARY KEY,
+                job_id TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                available_at REAL NOT NULL,
+                lease_expires_at REAL,
+                worker_id TEXT,
+                error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS units_status_available ON units (status, available_at)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS units_job_id ON units (job_id)")
+    
+    @classmethod
+    def from_env(cls) -> "SQLiteBroker":
+        """Create a broker configured by the ``BROKER_*`` environment variables."""
+        return cls(
+            db_path=os.getenv("BROKER_DATABASE", "./output/broker.db"),
+            visibility_timeout=float(os.getenv("BROKER_VISIBILITY_TIMEOUT", 600)),
+            max_attempts=int(os.getenv("BROKER_MAX_ATTEMPTS", 3)),
+            retry_delay=float(os.getenv("BROKER_RETRY_DELAY", 30)),
+        )
+    
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        """Convert a database row to a unit dictionary."""
+        unit = dict(row)
+        unit['payload'] = json.loads(unit['payload'])
+        return unit
+    
+    def _insert(self, job_id: str, kind: str, payload: Dict[str, Any], now: float) -> str:
+        """Insert a queued unit; the caller holds the lock."""
+        unit_id = uuid.uuid4().hex
+        self._db.execute(
+            """
+            INSERT INTO units
+                (unit_id, job_id, kind, payload, status, available_at, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (unit_id, job_id, kind, json.dumps(payload), UNIT_QUEUED, now, now, now),
+        )
+        return unit_id
+    
+    def enqueue(self, job_id: str, kind: str, payload: Dict[str, Any]) -> str:
+        """
+        Queue a unit of work and return its ID.
+        
+        Args:
+            job_id: Job the unit belongs to
+            kind: Unit type, e.g. ``"retrieve"``
+            payload: JSON-serializable unit inputs
+        """
+        with self._lock:
+            return self._insert(job_id, kind, payload, time.time())
+    
+    def expire_leases(self) -> List[Dict[str, Any]]:
+        """
+        Requeue claimed units whose lease expired, dead-lettering those out of attempts.
+        
+        Returns:
+            List[Dict]: The units dead-lettered by this call
+        """
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                expired = self._db.execute(
+                    "SELECT * FROM units WHERE status = ? AND lease_expires_at <= ?",
+                    (UNIT_CLAIMED, now),
+                ).fetchall()
+                dead = []
+                for row in expired:
+                    error = f"Lease of worker {row['worker_id']} expired"
+                    if row['attempts'] >= self.max_attempts:
+                        status = UNIT_DEAD
+                        dead.append(dict(self._to_dict(row), status=status, error=error))
+                    else:
+                        status = UNIT_QUEUED
+                    self._db.execute(
+                        """
+                        UPDATE units SET status = ?, error = ?, available_at = ?,
+                            lease_expires_at = NULL, updated_at = ?
+                        WHERE unit_id = ?
+                        """,
+                        (status, error, now, now, row['unit_id']),
+                    )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return dead
+    
+    def claim(
+        self,
+        worker_id: str,
+        kinds: Optional[Sequence[str]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Lease the oldest available unit to a worker.
+        
+        Args:
+            worker_id: Claiming worker
+            kinds: Unit types the worker handles; None for all
+        
+        Returns:
+            Dict: The claimed unit, or None if none is available
+        """
+        now = time.time()
+        query = "SELECT * FROM units WHERE status = ? AND available_at <= ?"
+        params: List[Any] = [UNIT_QUEUED, now]
+        if kinds:
+            query += f" AND kind IN ({', '.join('?' for _ in kinds)})"
+            params.extend(kinds)
+        query += " ORDER BY available_at LIMIT 1"
+        
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._db.execute(query, params).fetchone()
+                if row is not None:
+                    self._db.execute(
+                        """
+                        UPDATE units SET status = ?, worker_id = ?, attempts = attempts + 1,
+                            lease_expires_at = ?, updated_at = ?
+                        WHERE unit_id = ?
+                        """,
+                        (UNIT_CLAIMED, worker_id, now + self.visibility_timeout, now,
+                         row['unit_id']),
+                    )
+                    row = self._db.execute(
+                        "SELECT * FROM units WHERE unit_id = ?", (row['unit_id'],)
+                    ).fetchone()
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return self._to_dict(row) if row else None
+    
+    def _update_claimed(
+        self,
+        unit_id: str,
+        worker_id: str,
+        assignments: str,
+        params: tuple,
+    ) -> bool:
+        """Update a unit only while it is still leased to ``worker_id``."""
+        with self._lock:
+            cursor = self._db.execute(
+                f"UPDATE units SET {assignments}, updated_at = ? "
+                f"WHERE unit_id = ? AND worker_id = ? AND status = ?",
+                (*params, time.time(), unit_id, worker_id, UNIT_CLAIMED),
+            )
+        return cursor.rowcount == 1
+    
+    def heartbeat(self, unit_id: str, worker_id: str) -> bool:
+        """
+        Extend a worker's lease on a unit.
+        
+        Returns:
+            bool: False if the lease was lost, e.g. after it expired
+        """
+        return self._update_claimed(
+            unit_id, worker_id, "lease_expires_at = ?", (time.time() + self.visibility_timeout,)
+        )
+    
+    def complete(
+        self,
+        unit_id: str,
+        worker_id: str,
+        follow_up: Optional[Tuple[str, Dict[str, Any]]] = None,
+    ) -> bool:
+        """
+        Mark a leased unit as done, queueing the job's next unit in the same transaction.
+        
+        Args:
+            unit_id: Completed unit
+            worker_id: Worker holding its lease
+            follow_up: Kind and payload of the unit to queue next, if any
+        
+        Returns:
+            bool: False if the lease was lost, in which case another worker
+            may process the unit again and the follow-up is not queued
+        """
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                cursor = self._db.execute(
+                    """
+                    UPDATE units SET status = ?, lease_expires_at = NULL, error = NULL,
+                        updated_at = ?
+                    WHERE unit_id = ? AND worker_id = ? AND status = ?
+                    """,
+                    (UNIT_DONE, now, unit_id, worker_id, UNIT_CLAIMED),
+                )
+                completed = cursor.rowcount == 1
+                if completed and follow_up is not None:
+                    job_id = self._db.execute(
+                        "SELECT job_id FROM units WHERE unit_id = ?", (unit_id,)
+                    ).fetchone()['job_id']
+                    self._insert(job_id, *follow_up, now)
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return completed
+    
+    def fail(self, unit: Dict[str, Any], worker_id: str, error: str) -> Optional[str]:
+        """
+        Record a failed attempt: requeue the unit with a delay, or dead-letter it.
+        
+        Args:
+            unit: The claimed unit, as returned by :meth:`claim`
+            worker_id: Worker that processed it
+            error: Failure description
+        
+        Returns:
+            str: The unit's new status, or None if the lease was lost
+        """
+        if unit['attempts'] >= self.max_attempts:
+            status, available_at = UNIT_DEAD, time.time()
+        else:
+            status, available_at = UNIT_QUEUED, time.time() + self.retry_delay * unit['attempts']
+        updated = self._update_claimed(
+            unit['unit_id'],
+            worker_id,
+            "status = ?, error = ?, available_at = ?, lease_expires_at = NULL",
+            (status, error, available_at),
+        )
+        return status if updated else None
+    
+    def cancel_job(self, job_id: str) -> int:
+        """Cancel a job's queued units. Returns the number cancelled."""
+        with self._lock:
+            cursor = self._db.execute(
+                "UPDATE units SET status = ?, updated_at = ? WHERE job_id = ? AND status = ?",
+                (UNIT_CANCELLED, time.time(), job_id, UNIT_QUEUED),
+            )
+        return cursor.rowcount
+    
+    def dead_letters(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Return dead-lettered units, most recent first."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT * FROM units WHERE status = ? ORDER BY updated_at DESC LIMIT ?",
+                (UNIT_DEAD, limit),
+            ).fetchall()
+        return [self._to_dict(row) for row in rows]
+    
+    def retry_dead(self, unit_id: Optional[str] = None) -> List[str]:
+        """
+        Requeue dead-lettered units with fresh attempts.
+        
+        Args:
+            unit_id: Unit to retry; None for every dead-lettered unit
+        
+        Returns:
+            List[str]: IDs of the jobs whose units were requeued
+        """
+        query = "SELECT DISTINCT job_id FROM units WHERE status = ?"
+        update = (
+            "UPDATE units SET status = ?, attempts = 0, available_at = ?, updated_at = ? "
+            "WHERE status = ?"
+        )
+        params: List[Any] = [UNIT_DEAD]
+        if unit_id:
+            query += " AND unit_id = ?"
+            update += " AND unit_id = ?"
+            params.append(unit_id)
+        
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                job_ids = [row['job_id'] for row in self._db.execute(query, params)]
+                self._db.execute(update, (UNIT_QUEUED, now, now, *params))
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return job_ids
+    
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Return unit counts by kind and status."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT kind, status, COUNT(*) AS count FROM units GROUP BY kind, status"
+            ).fetchall()
+        stats: Dict[str, Dict[str, int]] = {}
+        for row in rows:
+            stats.setdefault(row['kind'], {})[row['status']] = row['count']
+        return stats
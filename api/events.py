@@ -0,0 +1,94 @@
+"""
+CrewSight-AI Job Events
+
+In-memory progress event bus for streaming crew runs to clients.
+
+© 2025 Utilyst Inc. All rights reserved.
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, Iterable, List, Tuple
+
+
+TERMINAL_EVENTS = frozenset({"job_completed", "job_failed", "job_cancelled"})
+
+# Superseded by the next event of their kind, so only live subscribers get them
+TRANSIENT_EVENTS = frozenset({"download_progress"})
+
+
+class EventBus:
+    """
+    Per-job progress events published from worker threads.
+    
+    Events are kept in a bounded history per job so that late subscribers
+    can replay what already happened, and are pushed to live subscribers'
+    asyncio queues on their own event loops. Transient events, such as
+    per-chunk download progress, are only pushed, so a large folder cannot
+    crowd the listing and task events out of the history.
+    
+    © 2025 Utilyst Inc. All rights reserved.
+    """
+    
+    def __init__(
+        self,
+        max_jobs: int = 200,
+        max_events_per_job: int = 1000,
+        transient_events: Iterable[str] = TRANSIENT_EVENTS,
+    ):
+        """
+        Initialize the bus.
+        
+        Args:
+            max_jobs: Number of jobs whose event history is retained
+            max_events_per_job: Number of events retained per job
+            transient_events: Event types delivered live but not retained
+        """
+        self.max_jobs = max_jobs
+        self.max_events_per_job = max_events_per_job
+        self.transient_events = frozenset(transient_events)
+        self._lock = threading.Lock()
+        self._history: "OrderedDict[str, Deque[Dict[str, Any]]]" = OrderedDict()
+        self._subscribers: Dict[str, List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+    
+    def publish(self, job_id: str, event_type: str, data: Dict[str, Any]) -> None:
+        """Record an event for a job and push it to its subscribers. Thread-safe."""
+        event = {"type": event_type, "timestamp": time.time(), "data": data}
+        
+        with self._lock:
+            history = self._history.get(job_id)
+            if history is None:
+                history = deque(maxlen=self.max_events_per_job)
+                self._history[job_id] = history
+                while len(self._history) > self.max_jobs:
+                    self._history.popitem(last=False)
+            if event_type not in self.transient_events:
+                history.append(event)
+            subscribers = list(self._subscribers.get(job_id, []))
+        
+        for loop, queue in subscribers:
+            loop.call_soon_threadsafe(queue.put_nowait, event)
+    
+    def subscribe(self, job_id: str) -> Tuple[List[Dict[str, Any]], asyncio.Queue]:
+        """
+        Subscribe to a job's events from the running event loop.
+        
+        Returns:
+            Tuple: The events published so far, and a queue receiving every
+            later event
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        with self._lock:
+            history = list(self._history.get(job_id, []))
+            self._subscribers.setdefault(job_id, []).append((asyncio.get_running_loop(), queue))
+        return history, queue
+    
+    def unsubscribe(self, job_id: str, queue: asyncio.Queue) -> None:
+        """Stop delivering a job's events to a queue."""
+        with self._lock:
+            subscribers = self._subscribers.get(job_id, [])
+            self._subscribers[job_id] = [s for s in subscribers if s[1] is not queue]
+            if not self._subscribers[job_id]:
+                del self._subscribers[job_id]
@@ -0,0 +1,274 @@
+"""
+CrewSight-AI Background Jobs
+
+SQLite-backed job store and bounded worker pool for long-running crew runs,
+with progress events and cooperative cancellation.
+
+© 2025 Utilyst Inc. All rights reserved.
+"""
+
+import json
+import sqlite3
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from api.events import EventBus
+from src.crewsight.telemetry import span
+
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+JOB_FINISHED = frozenset({JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED})
+
+
+def _now() -> str:
+    """Current UTC time as an ISO 8601 string."""
+    return datetime.now(timezone.utc).isoformat()
+
+
+class JobStore:
+    """
+    Persistent job records kept in a local SQLite database.
+    
+    © 2025 Utilyst Inc. All rights reserved.
+    """
+    
+    def __init__(self, db_path: str = "./output/jobs.db"):
+        """Open (and create if needed) the job database."""
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                status TEXT NOT NULL,
+                inputs TEXT NOT NULL,
+                result TEXT,
+                error TEXT,
+                created_at TEXT NOT NULL,
+                started_at TEXT,
+                finished_at TEXT
+            )
+            """
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS jobs_created_at ON jobs (created_at)")
+        self._db.commit()
+    
+    def create(self, kind: str, inputs: Dict[str, Any]) -> str:
+        """Insert a queued job and return its ID."""
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._db.execute(
+                """
+                INSERT INTO jobs (job_id, kind, status, inputs, created_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (job_id, kind, JOB_QUEUED, json.dumps(inputs), _now()),
+            )
+            self._db.commit()
+        return job_id
+    
+    def update(self, job_id: str, **fields: Any) -> None:
+        """Update columns of a job; ``result`` is stored as JSON."""
+        if 'result' in fields:
+            fields['result'] = json.dumps(fields['result'])
+        assignments = ", ".join(f"{column} = ?" for column in fields)
+        with self._lock:
+            self._db.execute(
+                f"UPDATE jobs SET {assignments} WHERE job_id = ?",
+                (*fields.values(), job_id),
+            )
+            self._db.commit()
+    
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        """Convert a database row to a job dictionary."""
+        job = dict(row)
+        job['inputs'] = json.loads(job['inputs'])
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        return job
+    
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return a job by ID, or None if it does not exist."""
+        with self._lock:
+            row = self._db.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return self._to_dict(row) if row else None
+    
+    def recent(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Return the most recently created jobs, newest first."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [self._to_dict(row) for row in rows]
+    
+    def fail_unfinished(self, reason: str, exclude_kinds: Sequence[str] = ()) -> int:
+        """
+        Mark queued and running jobs as failed, e.g. after a restart. Returns the count.
+        
+        Args:
+            reason: Error recorded on the failed jobs
+            exclude_kinds: Job types left alone because other processes run them
+        """
+        query = "UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE status IN (?, ?)"
+        params: List[Any] = [JOB_FAILED, reason, _now(), JOB_QUEUED, JOB_RUNNING]
+        if exclude_kinds:
+            query += f" AND kind NOT IN ({', '.join('?' for _ in exclude_kinds)})"
+            params.extend(exclude_kinds)
+        with self._lock:
+            cursor = self._db.execute(query, params)
+            self._db.commit()
+        return cursor.rowcount
+
+
+class JobCancelled(Exception):
+    """Raised inside a running job once a client has cancelled it."""
+
+
+class JobContext:
+    """
+    Handle given to a running job for reporting progress.
+    
+    Every call to :meth:`emit` is also a cancellation point: once the job
+    has been cancelled, it raises :class:`JobCancelled` so the crew unwinds
+    at the next progress update.
+    """
+    
+    def __init__(self, job_id: str, events: EventBus):
+        self.job_id = job_id
+        self._events = events
+        self._cancelled = threading.Event()
+    
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+    
+    def cancel(self) -> None:
+        self._cancelled.set()
+    
+    def emit(self, event_type: str, data: Optional[Dict[str, Any]] = None) -> None:
+        """Publish a progress event, raising JobCancelled if the job was cancelled."""
+        if self.cancelled:
+            raise JobCancelled(f"Job {self.job_id} was cancelled")
+        self._events.publish(self.job_id, event_type, data or {})
+
+
+JobFunction = Callable[[Dict[str, Any], JobContext], Dict[str, Any]]
+
+
+class JobManager:
+    """
+    Runs jobs on a bounded thread pool and records their lifecycle.
+    
+    Submitting returns immediately with the job ID; the job moves through
+    queued, running and completed/failed in the store as the worker pool
+    picks it up.
+    
+    © 2025 Utilyst Inc. All rights reserved.
+    """
+    
+    def __init__(
+        self,
+        store: JobStore,
+        max_workers: int = 2,
+        events: Optional[EventBus] = None,
+        external_kinds: Sequence[str] = (),
+    ):
+        """
+        Initialize the manager.
+        
+        Args:
+            store: Job store recording job state and results
+            max_workers: Maximum number of jobs running at the same time
+            events: Event bus receiving job progress events
+            external_kinds: Job types run by worker processes rather than this
+                manager, which survive a server restart
+        """
+        self.store = store
+        self.store.fail_unfinished("Interrupted by server restart", external_kinds)
+        self.events = events or EventBus()
+        self._contexts: Dict[str, JobContext] = {}
+        self._contexts_lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(
+            max_workers=max(1, max_workers), thread_name_prefix="crew-job"
+        )
+    
+    def submit(self, kind: str, inputs: Dict[str, Any], fn: JobFunction) -> str:
+        """
+        Queue a job and return its ID.
+        
+        Args:
+            kind: Job type, e.g. ``"process_documents"``
+            inputs: JSON-serializable job inputs, passed to ``fn``
+            fn: Callable executing the job with its inputs and JobContext and
+                returning a JSON-serializable result
+        """
+        job_id = self.store.create(kind, inputs)
+        context = JobContext(job_id, self.events)
+        with self._contexts_lock:
+            self._contexts[job_id] = context
+        
+        self.events.publish(job_id, "job_queued", {"kind": kind})
+        self._pool.submit(self._execute, context, kind, inputs, fn)
+        return job_id
+    
+    def cancel(self, job_id: str) -> bool:
+        """
+        Request cancellation of a queued or running job.
+        
+        Returns:
+            bool: False if the job is unknown or already finished
+        """
+        with self._contexts_lock:
+            context = self._contexts.get(job_id)
+        if context is None:
+            return False
+        context.cancel()
+        return True
+    
+    def _execute(
+        self,
+        context: JobContext,
+        kind: str,
+        inputs: Dict[str, Any],
+        fn: JobFunction,
+    ) -> None:
+        """Run a job on a worker thread inside a ``job`` span, recording its outcome."""
+        job_id = context.job_id
+        try:
+            if context.cancelled:
+                raise JobCancelled(f"Job {job_id} was cancelled")
+            self.store.update(job_id, status=JOB_RUNNING, started_at=_now())
+            self.events.publish(job_id, "job_started", {})
+            with span('job', job_id=job_id, kind=kind):
+                result = fn(inputs, context)
+        except JobCancelled as e:
+            self.store.update(job_id, status=JOB_CANCELLED, error=str(e), finished_at=_now())
+            self.events.publish(job_id, "job_cancelled", {})
+        except Exception as e:
+            if context.cancelled:
+                self.store.update(job_id, status=JOB_CANCELLED, error=str(e), finished_at=_now())
+                self.events.publish(job_id, "job_cancelled", {})
+            else:
+                self.store.update(job_id, status=JOB_FAILED, error=str(e), finished_at=_now())
+                self.events.publish(job_id, "job_failed", {"error": str(e)})
+        else:
+            self.store.update(job_id, status=JOB_COMPLETED, result=result, finished_at=_now())
+            self.events.publish(job_id, "job_completed", {"result": result})
+        finally:
+            with self._contexts_lock:
+                self._contexts.pop(job_id, None)
+    
+    def shutdown(self) -> None:
+        """Stop accepting jobs and wait for running ones to finish."""
+        self._pool.shutdown(wait=True)
@@ -7,12 +7,28 @@ Connects mobile app to CrewAI agents for document processing.
 © 2025 Utilyst Inc. All rights reserved.
 """
 
-from fastapi import FastAPI, UploadFile, File, HTTPException
-from pydantic import BaseModel
-from typing import Optional, List
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, Field
+from typing import Any, Dict, Literal, Optional, List
 import uvicorn
 
-from src.crewsight.crew import CrewSightCrew
+from api.broker import SQLiteBroker
+from api.events import TERMINAL_EVENTS
+from api.jobs import (
+    JOB_CANCELLED, JOB_FAILED, JOB_FINISHED, JOB_QUEUED, JobContext, JobManager, JobStore
+)
+from api.worker import DISTRIBUTED_JOB, UNIT_RETRIEVE
+from api.uploads import ImageStore, InvalidUpload, UploadTooLarge, stream_upload
+from src.crewsight.factory import get_crew_factory
+from src.crewsight.telemetry import get_tracer
 
 app = FastAPI(
     title="CrewSight-AI API",
@@ -20,6 +36,26 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# With JOB_BACKEND=broker, document runs are queued for `python -m api.worker` processes
+broker = SQLiteBroker.from_env() if os.getenv("JOB_BACKEND", "local") == "broker" else None
+
+# Crew runs take minutes, so they execute on a bounded background worker pool
+jobs = JobManager(
+    JobStore(os.getenv("JOBS_DATABASE", "./output/jobs.db")),
+    max_workers=int(os.getenv("MAX_CONCURRENT_JOBS", "2")),
+    external_kinds=(DISTRIBUTED_JOB,)
+)
+
+# Uploaded images, stored once per content hash; decoding and resizing run off the event loop
+MAX_UPLOAD_BYTES = int(float(os.getenv("MAX_UPLOAD_MB", "20")) * 1024 * 1024)
+images = ImageStore(os.getenv("UPLOAD_DIRECTORY", "./output/uploads"))
+image_pool = ThreadPoolExecutor(
+    max_workers=int(os.getenv("IMAGE_WORKERS", "2")), thread_name_prefix="image"
+)
+
+# Prometheus-style span metrics at /metrics; spans are exported to TRACE_FILE when set
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "false").lower() in ("1", "true", "yes")
+
 # Request/Response Models
 class IssueRequest(BaseModel):
     issue_description: str
@@ -31,6 +67,10 @@ class ProcessingRequest(BaseModel):
     document_type: str = "general"
     analysis_focus: str = "comprehensive_review"
     output_format: str = "structured_summary"
+    incremental: bool = False
+    analysis_mode: Literal["agent", "map_reduce"] = "agent"
+    execution_mode: Literal["sequential", "fan_out"] = "sequential"
+    max_concurrency: int = Field(default=8, ge=1, le=32)
 
 class ProcessingResponse(BaseModel):
     status: str
@@ -39,6 +79,79 @@ class ProcessingResponse(BaseModel):
     result: Optional[dict] = None
 
 
+def run_document_crew(inputs: Dict[str, Any], context: JobContext) -> Dict[str, Any]:
+    """Run the document processing crew for a job and return its result."""
+    crew_inputs = dict(inputs)
+    incremental = crew_inputs.pop('incremental', False)
+    analysis_mode = crew_inputs.pop('analysis_mode', 'agent')
+    execution_mode = crew_inputs.pop('execution_mode', 'sequential')
+    max_concurrency = crew_inputs.pop('max_concurrency', 8)
+    
+    crew_instance = get_crew_factory().create(
+        incremental=incremental,
+        event_callback=context.emit,
+        report_path=f"output/reports/{context.job_id}.md",
+        analysis_mode=analysis_mode,
+        execution_mode=execution_mode,
+        max_concurrency=max_concurrency
+    )
+    result = crew_instance.kickoff(inputs=crew_inputs)
+    
+    return {"output": str(result), "report_path": crew_instance.report_path}
+
+
+def lookup_issue(request: IssueRequest) -> Optional[Dict[str, Any]]:
+    """Look an issue up in the troubleshooting index that crew runs keep up to date."""
+    return get_crew_factory().template.troubleshooting_index.lookup(
+        request.issue_description,
+        request.equipment_type,
+        request.error_code
+    )
+
+
+def run_issue_crew(inputs: Dict[str, Any], context: JobContext) -> Dict[str, Any]:
+    """Answer an issue the troubleshooting index could not, with the analyzer agent."""
+    crew_instance = get_crew_factory().create(event_callback=context.emit)
+    result = crew_instance.troubleshoot(inputs)
+    
+    return {"output": str(result)}
+
+
+def run_image_crew(inputs: Dict[str, Any], context: JobContext) -> Dict[str, Any]:
+    """Analyze an uploaded equipment photo with the analyzer agent."""
+    crew_instance = get_crew_factory().create(event_callback=context.emit)
+    result = crew_instance.analyze_image(inputs['image_path'], inputs.get('issue_description'))
+    
+    return {"output": str(result)}
+
+
+def session_summary(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the session view of a job record."""
+    resolution_time = None
+    if job['started_at'] and job['finished_at']:
+        elapsed = (
+            datetime.fromisoformat(job['finished_at']) - datetime.fromisoformat(job['started_at'])
+        ).total_seconds()
+        resolution_time = f"{round(elapsed / 60, 1)} minutes"
+    
+    return {
+        "session_id": job['job_id'],
+        "kind": job['kind'],
+        "status": job['status'],
+        "created_at": job['created_at'],
+        "started_at": job['started_at'],
+        "finished_at": job['finished_at'],
+        "resolution_time": resolution_time
+    }
+
+
+@app.on_event("shutdown")
+def shutdown_jobs():
+    """Let running crew jobs and image processing finish before the server exits."""
+    jobs.shutdown()
+    image_pool.shutdown(wait=True)
+
+
 # API Endpoints
 
 @app.get("/")
@@ -62,33 +175,57 @@ async def health_check():
     }
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Span durations, transferred bytes and LLM tokens in the Prometheus text format"""
+    if not METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return PlainTextResponse(
+        get_tracer().metrics.render(), media_type="text/plain; version=0.0.4"
+    )
+
+
 @app.post("/api/process/documents")
 async def process_documents(request: ProcessingRequest):
     """
     Process documents from Google Drive
     
     Mobile app sends Google Drive URL and processing parameters.
-    Returns processed insights and reports.
+    Queues a crew run and returns its session ID immediately; poll
+    /api/session/{session_id} for status and results. With the broker
+    backend, retrieval, extraction and analysis run as separate units on
+    worker processes.
     """
+    if broker is not None and (request.incremental or request.execution_mode == "fan_out"):
+        raise HTTPException(
+            status_code=400,
+            detail="Incremental and fan-out runs are not supported by distributed workers"
+        )
+    
     try:
-        crew_instance = CrewSightCrew()
-        
         inputs = {
             'google_drive_url': request.google_drive_url,
             'document_type': request.document_type,
             'analysis_focus': request.analysis_focus,
-            'output_format': request.output_format
+            'output_format': request.output_format,
+            'incremental': request.incremental,
+            'analysis_mode': request.analysis_mode,
+            'execution_mode': request.execution_mode,
+            'max_concurrency': request.max_concurrency
         }
         
-        result = crew_instance.crew().kickoff(inputs=inputs)
+        if broker is not None:
+            job_id = jobs.store.create(DISTRIBUTED_JOB, inputs)
+            broker.enqueue(job_id, UNIT_RETRIEVE, {'inputs': inputs})
+        else:
+            job_id = jobs.submit("process_documents", inputs, run_document_crew)
         
         return ProcessingResponse(
-            status="success",
-            session_id="session_123",  # Generate proper session ID
-            message="Document processing completed",
-            result={"output": str(result)}
+            status=JOB_QUEUED,
+            session_id=job_id,
+            message="Document processing queued"
         )
-        
+    
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -99,48 +236,93 @@ async def analyze_issue(request: IssueRequest):
     Analyze equipment issue
     
     Mobile app sends issue description for AI analysis.
-    Returns troubleshooting guidance.
+    Returns troubleshooting guidance from the index of processed manuals,
+    matched by error code and BM25 keywords. Issues the index cannot answer
+    are queued for the analyzer agent; poll /api/session/{session_id} for
+    its answer.
     """
     try:
-        # Placeholder for issue analysis logic
-        # This would integrate with vision_analyzer agent
+        start = time.perf_counter()
+        answer = await asyncio.to_thread(lookup_issue, request)
+        
+        if answer is not None:
+            return {
+                "status": "success",
+                "source": "index",
+                **answer,
+                "latency_ms": round((time.perf_counter() - start) * 1000, 2)
+            }
+        
+        job_id = jobs.submit("analyze_issue", request.model_dump(), run_issue_crew)
         
         return {
-            "status": "success",
-            "analysis": "Issue analysis completed",
-            "recommendations": [
-                "Check power connections",
-                "Verify network settings",
-                "Inspect for physical damage"
-            ]
+            "status": JOB_QUEUED,
+            "source": "crew",
+            "session_id": job_id,
+            "message": "No indexed answer found; issue analysis queued"
         }
-        
+    
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.post("/api/upload/image")
-async def upload_image(file: UploadFile = File(...)):
+async def upload_image(request: Request, issue_description: Optional[str] = None):
     """
     Upload equipment image for analysis
     
-    Mobile app sends photo for vision-based troubleshooting.
+    Mobile app sends photo for vision-based troubleshooting as the ``file``
+    field of a multipart form. The body is streamed to a spooled temp file
+    with a hard size limit (413 beyond MAX_UPLOAD_MB), the image is
+    downscaled and thumbnailed off the event loop, and an analysis job is
+    queued; poll /api/session/{session_id} for its result. Re-uploading an
+    identical image returns the existing session.
     """
     try:
-        contents = await file.read()
-        
-        # Save file temporarily
-        # Process with vision_analyzer agent
-        
-        return {
-            "status": "success",
-            "message": "Image uploaded and analyzed",
-            "filename": file.filename,
-            "analysis": "Image analysis placeholder"
-        }
-        
+        upload = await stream_upload(request, "file", MAX_UPLOAD_BYTES)
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except InvalidUpload as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    loop = asyncio.get_running_loop()
+    try:
+        meta = images.get(upload.sha256)
+        if meta is None:
+            meta = await loop.run_in_executor(image_pool, images.process, upload)
+    except InvalidUpload as e:
+        raise HTTPException(status_code=415, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        upload.file.close()
+    
+    job = jobs.store.get(meta['job_id']) if meta.get('job_id') else None
+    if job is not None and job['status'] not in (JOB_FAILED, JOB_CANCELLED):
+        return {
+            "status": "duplicate",
+            "session_id": job['job_id'],
+            "sha256": upload.sha256,
+            "message": "Identical image already uploaded"
+        }
+    
+    job_id = jobs.submit("analyze_image", {
+        'image_path': meta['image_path'],
+        'issue_description': issue_description,
+        'sha256': upload.sha256
+    }, run_image_crew)
+    images.set_job(upload.sha256, job_id)
+    
+    return {
+        "status": JOB_QUEUED,
+        "session_id": job_id,
+        "sha256": upload.sha256,
+        "filename": meta['filename'],
+        "width": meta['width'],
+        "height": meta['height'],
+        "thumbnail_path": meta['thumbnail_path'],
+        "message": "Image uploaded; analysis queued"
+    }
 
 
 @app.get("/api/session/{session_id}")
@@ -150,15 +332,93 @@ async def get_session(session_id: str):
     
     Mobile app fetches session history and results.
     """
+    job = jobs.store.get(session_id)
+    
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Session not found: {session_id}")
+    
     return {
-        "session_id": session_id,
-        "status": "completed",
-        "created_at": "2025-10-30T10:00:00Z",
-        "issue_type": "Network Connectivity",
-        "resolution_time": "15 minutes"
+        **session_summary(job),
+        "inputs": job['inputs'],
+        "result": job['result'],
+        "error": job['error']
     }
 
 
+@app.get("/api/session/{session_id}/events")
+async def stream_session_events(session_id: str):
+    """
+    Stream session progress as server-sent events
+    
+    Replays the events published so far, then pushes files listed,
+    download progress, task start/finish (with task output) and the final
+    job outcome as they happen. Comment lines are sent while idle to keep
+    proxies from timing out.
+    """
+    if jobs.store.get(session_id) is None:
+        raise HTTPException(status_code=404, detail=f"Session not found: {session_id}")
+    
+    history, queue = jobs.events.subscribe(session_id)
+    
+    async def event_stream():
+        try:
+            for event in history:
+                yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+                if event['type'] in TERMINAL_EVENTS:
+                    return
+            
+            job = jobs.store.get(session_id)
+            if job and job['status'] in JOB_FINISHED and not history:
+                yield f"event: job_{job['status']}\ndata: {json.dumps(session_summary(job))}\n\n"
+                return
+            
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    # Worker processes cannot publish events; their jobs end in the store
+                    job = jobs.store.get(session_id)
+                    if job and job['status'] in JOB_FINISHED:
+                        summary = json.dumps(session_summary(job))
+                        yield f"event: job_{job['status']}\ndata: {summary}\n\n"
+                        return
+                    yield ": keep-alive\n\n"
+                    continue
+                
+                yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+                if event['type'] in TERMINAL_EVENTS:
+                    return
+        finally:
+            jobs.events.unsubscribe(session_id, queue)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.post("/api/session/{session_id}/cancel")
+async def cancel_session(session_id: str):
+    """
+    Cancel a queued or running session
+    
+    The crew stops at its next progress update. Distributed jobs stop
+    before their next unit; a unit already running finishes.
+    """
+    if not jobs.cancel(session_id):
+        job = jobs.store.get(session_id) if broker is not None else None
+        if job is None or job['kind'] != DISTRIBUTED_JOB or job['status'] in JOB_FINISHED:
+            raise HTTPException(status_code=404, detail=f"No active session: {session_id}")
+        broker.cancel_job(session_id)
+        jobs.store.update(
+            session_id, status=JOB_CANCELLED, error=f"Job {session_id} was cancelled",
+            finished_at=datetime.now(timezone.utc).isoformat()
+        )
+    
+    return {"session_id": session_id, "status": "cancelling"}
+
+
 @app.get("/api/sessions/recent")
 async def get_recent_sessions(limit: int = 10):
     """
@@ -167,14 +427,7 @@ async def get_recent_sessions(limit: int = 10):
     Mobile app displays user's session history.
     """
     return {
-        "sessions": [
-            {
-                "session_id": "session_001",
-                "issue": "Router not responding",
-                "status": "resolved",
-                "timestamp": "2025-10-30T09:00:00Z"
-            }
-        ]
+        "sessions": [session_summary(job) for job in jobs.store.recent(limit)]
     }
 
 
@@ -0,0 +1,263 @@
+"""
+CrewSight-AI Image Uploads
+
+Streaming, size-capped multipart upload handling and off-loop image
+preprocessing with content-hash deduplication.
+
+© 2025 Utilyst Inc. All rights reserved.
+"""
+
+import hashlib
+import json
+import shutil
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from fastapi import Request
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+try:
+    from python_multipart.multipart import MultipartParser, parse_options_header
+except ImportError:  # python-multipart < 0.0.13
+    from multipart.multipart import MultipartParser, parse_options_header
+
+
+ALLOWED_FORMATS = {"JPEG": ".jpg", "PNG": ".png", "WEBP": ".webp", "HEIF": ".heic", "MPO": ".jpg"}
+
+# Uploads are kept in memory up to this size, then rolled over to disk
+SPOOL_MAX_MEMORY = 1024 * 1024
+
+
+class UploadTooLarge(Exception):
+    """Raised while streaming once an upload exceeds its size limit."""
+
+
+class InvalidUpload(Exception):
+    """Raised when a request has no usable file part or the file is not a supported image."""
+
+
+@dataclass
+class SpooledUpload:
+    """A streamed file part, hashed as it was received."""
+    file: Any
+    filename: str
+    content_type: str
+    sha256: str
+    size: int
+
+
+async def stream_upload(
+    request: Request,
+    field_name: str = "file",
+    max_bytes: int = 20 * 1024 * 1024,
+) -> SpooledUpload:
+    """
+    Stream one file field of a multipart request into a spooled temp file.
+    
+    The request body is parsed incrementally as it arrives, so memory use
+    is bounded by the spool size no matter how large the upload is, and the
+    request is rejected as soon as the file part exceeds ``max_bytes``.
+    
+    Raises:
+        UploadTooLarge: The file part, or the declared body, is over the limit
+        InvalidUpload: The request is not multipart or has no such file field
+    """
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > max_bytes + 64 * 1024:
+        raise UploadTooLarge(f"Upload exceeds {max_bytes} bytes")
+    
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    boundary = params.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise InvalidUpload("Expected a multipart/form-data request")
+    
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)
+    digest = hashlib.sha256()
+    state: Dict[str, Any] = {
+        "headers": {}, "field": b"", "value": b"", "in_file": False, "found": None, "size": 0
+    }
+    
+    def on_part_begin() -> None:
+        state["headers"] = {}
+    
+    def on_header_field(data: bytes, start: int, end: int) -> None:
+        state["field"] += data[start:end]
+    
+    def on_header_value(data: bytes, start: int, end: int) -> None:
+        state["value"] += data[start:end]
+    
+    def on_header_end() -> None:
+        state["headers"][state["field"].lower()] = state["value"]
+        state["field"] = state["value"] = b""
+    
+    def on_headers_finished() -> None:
+        _, disposition = parse_options_header(state["headers"].get(b"content-disposition", b""))
+        state["in_file"] = (
+            state["found"] is None
+            and disposition.get(b"name", b"").decode("utf-8", "replace") == field_name
+            and b"filename" in disposition
+        )
+        if state["in_file"]:
+            state["found"] = (
+                disposition[b"filename"].decode("utf-8", "replace"),
+                state["headers"].get(b"content-type", b"application/octet-stream").decode(),
+            )
+    
+    def on_part_data(data: bytes, start: int, end: int) -> None:
+        if not state["in_file"]:
+            return
+        state["size"] += end - start
+        if state["size"] > max_bytes:
+            raise UploadTooLarge(f"Upload exceeds {max_bytes} bytes")
+        chunk = data[start:end]
+        spool.write(chunk)
+        digest.update(chunk)
+    
+    def on_part_end() -> None:
+        state["in_file"] = False
+    
+    parser = MultipartParser(boundary, {
+        "on_part_begin": on_part_begin,
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end": on_header_end,
+        "on_headers_finished": on_headers_finished,
+        "on_part_data": on_part_data,
+        "on_part_end": on_part_end,
+    })
+    
+    try:
+        async for chunk in request.stream():
+            parser.write(chunk)
+        parser.finalize()
+    except BaseException:
+        spool.close()
+        raise
+    
+    if state["found"] is None:
+        spool.close()
+        raise InvalidUpload(f"No file field named '{field_name}'")
+    
+    spool.seek(0)
+    filename, part_type = state["found"]
+    return SpooledUpload(spool, filename, part_type, digest.hexdigest(), state["size"])
+
+
+class ImageStore:
+    """
+    Content-addressed store of uploaded images and their derivatives.
+    
+    Each distinct upload is kept once under ``<root>/<sha256>/`` with the
+    original, a downscaled copy for analysis and a thumbnail, plus a
+    ``meta.json`` recording the dimensions and the analysis job.
+    
+    © 2025 Utilyst Inc. All rights reserved.
+    """
+    
+    def __init__(
+        self,
+        root: str = "./output/uploads",
+        max_side: int = 2048,
+        thumbnail_side: int = 256,
+        max_pixels: int = 64_000_000,
+    ):
+        """
+        Initialize the store.
+        
+        Args:
+            root: Directory holding the stored images
+            max_side: Longest side of the copy handed to analysis
+            thumbnail_side: Longest side of the thumbnail
+            max_pixels: Images with more pixels are rejected as decompression bombs
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_side = max_side
+        self.thumbnail_side = thumbnail_side
+        self.max_pixels = max_pixels
+    
+    def _meta_path(self, sha256: str) -> Path:
+        return self.root / sha256 / "meta.json"
+    
+    def get(self, sha256: str) -> Optional[Dict[str, Any]]:
+        """Return the metadata of a stored image, or None if it is not stored."""
+        meta_path = self._meta_path(sha256)
+        return json.loads(meta_path.read_text()) if meta_path.exists() else None
+    
+    def set_job(self, sha256: str, job_id: str) -> None:
+        """Record the analysis job of a stored image."""
+        meta = self.get(sha256)
+        meta["job_id"] = job_id
+        self._meta_path(sha256).write_text(json.dumps(meta))
+    
+    def process(self, upload: SpooledUpload) -> Dict[str, Any]:
+        """
+        Validate, store, downscale and thumbnail an upload. Blocking; run off the event loop.
+        
+        Raises:
+            InvalidUpload: The file is not a supported, reasonably sized image,
+                or its image data is corrupt
+        """
+        try:
+            image = Image.open(upload.file)
+        except UnidentifiedImageError:
+            raise InvalidUpload("Uploaded file is not an image")
+        except Image.DecompressionBombError as e:
+            raise InvalidUpload(f"Image too large: {e}")
+        except OSError as e:
+            raise InvalidUpload(f"Image could not be decoded: {e}")
+        
+        with image:
+            if image.format not in ALLOWED_FORMATS:
+                raise InvalidUpload(f"Unsupported image format: {image.format}")
+            if image.width * image.height > self.max_pixels:
+                raise InvalidUpload(f"Image too large: {image.width}x{image.height}")
+            width, height, image_format = image.width, image.height, image.format
+            
+            directory = self.root / upload.sha256
+            staging = Path(tempfile.mkdtemp(dir=self.root, prefix=".staging-"))
+            try:
+                upload.file.seek(0)
+                with open(staging / f"original{ALLOWED_FORMATS[image_format]}", "wb") as f:
+                    shutil.copyfileobj(upload.file, f, 1024 * 1024)
+                
+                try:
+                    # Let JPEG decode at a reduced scale instead of full resolution
+                    image.draft("RGB", (self.max_side, self.max_side))
+                    image = ImageOps.exif_transpose(image).convert("RGB")
+                    image.thumbnail((self.max_side, self.max_side), Image.Resampling.LANCZOS)
+                except (OSError, Image.DecompressionBombError) as e:
+                    # Truncated or corrupt image data only fails once decoded
+                    raise InvalidUpload(f"Image could not be decoded: {e}")
+                image.save(staging / "image.jpg", "JPEG", quality=85, optimize=True)
+                
+                image.thumbnail(
+                    (self.thumbnail_side, self.thumbnail_side), Image.Resampling.LANCZOS
+                )
+                image.save(staging / "thumbnail.jpg", "JPEG", quality=80)
+                
+                meta = {
+                    "sha256": upload.sha256,
+                    "filename": upload.filename,
+                    "format": image_format,
+                    "size": upload.size,
+                    "width": width,
+                    "height": height,
+                    "image_path": str(directory / "image.jpg"),
+                    "thumbnail_path": str(directory / "thumbnail.jpg"),
+                    "job_id": None
+                }
+                (staging / "meta.json").write_text(json.dumps(meta))
+                try:
+                    staging.rename(directory)
+                except OSError:
+                    # Stored concurrently by an identical upload
+                    shutil.rmtree(staging, ignore_errors=True)
+                    return self.get(upload.sha256)
+            except BaseException:
+                shutil.rmtree(staging, ignore_errors=True)
+                raise
+        
+        return meta
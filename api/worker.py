@@ -0,0 +1,277 @@
+#!/usr/bin/env python
+"""
+CrewSight-AI Distributed Worker
+
+Stateless worker process that claims retrieval, extraction and analysis units
+of document jobs from the broker.
+
+Usage:
+    python -m api.worker [--kinds=retrieve,extract,analyze] [--once]
+    python -m api.worker --dead-letters
+    python -m api.worker --retry-dead[=<unit_id>]
+
+© 2025 Utilyst Inc. All rights reserved.
+"""
+
+import os
+import socket
+import sys
+import threading
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from api.broker import UNIT_DEAD, SQLiteBroker
+from api.jobs import (
+    JOB_CANCELLED, JOB_COMPLETED, JOB_FAILED, JOB_FINISHED, JOB_QUEUED, JOB_RUNNING, JobStore
+)
+from src.crewsight.batch import RUN_OPTIONS
+from src.crewsight.factory import CrewFactory, get_crew_factory
+from src.crewsight.telemetry import span
+
+
+UNIT_RETRIEVE = "retrieve"
+UNIT_EXTRACT = "extract"
+UNIT_ANALYZE = "analyze"
+UNIT_KINDS = (UNIT_RETRIEVE, UNIT_EXTRACT, UNIT_ANALYZE)
+
+# Job kind of document runs split into broker units
+DISTRIBUTED_JOB = "process_documents_distributed"
+
+
+def _now() -> str:
+    """Current UTC time as an ISO 8601 string."""
+    return datetime.now(timezone.utc).isoformat()
+
+
+class Worker:
+    """
+    Processes broker units of distributed document jobs.
+    
+    A document job is split into three units, each queued when the previous
+    one is completed, in the same broker transaction, so every stage can run
+    on a different node (e.g. retrieval near the network, extraction on CPU
+    nodes):
+    
+    - ``retrieve``: list and download the Drive folder
+    - ``extract``: extract and index the downloaded files
+    - ``analyze``: run the analysis and synthesis agents and write the report
+    
+    Workers hold no state between units; downloads, extractions and
+    reports are exchanged through ``DOWNLOAD_DIRECTORY`` and ``output/``,
+    which must be shared by all nodes, and job state through the job store.
+    While a unit runs, a heartbeat thread extends its lease.
+    
+    © 2025 Utilyst Inc. All rights reserved.
+    """
+    
+    def __init__(
+        self,
+        broker: SQLiteBroker,
+        store: JobStore,
+        factory: CrewFactory,
+        worker_id: Optional[str] = None,
+        kinds: Optional[Sequence[str]] = None,
+        poll_interval: float = 2.0,
+    ):
+        """
+        Initialize the worker.
+        
+        Args:
+            broker: Broker the units are claimed from
+            store: Job store shared with the API
+            factory: Crew factory for the units' crews
+            worker_id: Identifier recorded on claimed units; host and PID by default
+            kinds: Unit types this worker processes; all by default
+            poll_interval: Seconds to wait when no unit is available
+        """
+        self.broker = broker
+        self.store = store
+        self.factory = factory
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.kinds = tuple(kinds) if kinds else UNIT_KINDS
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = max(1.0, broker.visibility_timeout / 3)
+        self.handlers = {
+            UNIT_RETRIEVE: self._retrieve,
+            UNIT_EXTRACT: self._extract,
+            UNIT_ANALYZE: self._analyze,
+        }
+    
+    def _heartbeat(self, unit: Dict[str, Any], done: threading.Event) -> None:
+        """Extend the lease on a unit until it is done or the lease is lost."""
+        while not done.wait(self.heartbeat_interval):
+            if not self.broker.heartbeat(unit['unit_id'], self.worker_id):
+                print(f"Lease lost on {unit['kind']} unit {unit['unit_id']}")
+                return
+    
+    def _crew(self, job_id: str, inputs: Dict[str, Any]):
+        """Create the crew for a job's unit."""
+        return self.factory.create(
+            report_path=f"output/reports/{job_id}.md",
+            analysis_mode=inputs.get('analysis_mode', 'agent'),
+            max_concurrency=inputs.get('max_concurrency', 8),
+        )
+    
+    def _retrieve(self, unit: Dict[str, Any]) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """List and download the job's Drive folder; returns the extraction unit."""
+        inputs = unit['payload']['inputs']
+        crew_instance = self._crew(unit['job_id'], inputs)
+        tool = crew_instance.google_drive_tool
+        summary = tool._run(inputs['google_drive_url'])
+        if tool.last_results is None:
+            # Bad URL or empty folder: retrying cannot help
+            self._finish_job(unit['job_id'], JOB_FAILED, error=summary)
+            return None
+        
+        return UNIT_EXTRACT, {
+            'inputs': inputs,
+            'retrieval_summary': summary,
+            'retrieval': tool.last_results,
+            'catalog_path': str(tool.last_catalog.path)
+        }
+    
+    def _extract(self, unit: Dict[str, Any]) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Extract and index the downloaded files; returns the analysis unit."""
+        payload = unit['payload']
+        crew_instance = self._crew(unit['job_id'], payload['inputs'])
+        extraction_results = crew_instance.extract_retrieved(payload['retrieval'])
+        
+        return UNIT_ANALYZE, {
+            'inputs': payload['inputs'],
+            'retrieval_summary': payload['retrieval_summary'],
+            'extraction_results': extraction_results,
+            'catalog_path': payload.get('catalog_path')
+        }
+    
+    def _analyze(self, unit: Dict[str, Any]) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Analyze the extracted documents, write the report and complete the job."""
+        payload = unit['payload']
+        crew_instance = self._crew(unit['job_id'], payload['inputs'])
+        crew_inputs = {
+            key: value for key, value in payload['inputs'].items() if key not in RUN_OPTIONS
+        }
+        result = crew_instance.analyze_extracted(
+            crew_inputs,
+            payload['retrieval_summary'],
+            payload['extraction_results'],
+            payload.get('catalog_path')
+        )
+        self._finish_job(unit['job_id'], JOB_COMPLETED, result={
+            "output": str(result), "report_path": crew_instance.report_path
+        })
+        return None
+    
+    def _finish_job(self, job_id: str, status: str, **fields: Any) -> None:
+        """Record a job's final status in the job store, unless it was cancelled meanwhile."""
+        job = self.store.get(job_id)
+        if job is not None and job['status'] != JOB_CANCELLED:
+            self.store.update(job_id, status=status, finished_at=_now(), **fields)
+    
+    def _fail_dead_letters(self) -> None:
+        """Fail the jobs of units dead-lettered because their workers stopped heartbeating."""
+        for unit in self.broker.expire_leases():
+            self._finish_job(unit['job_id'], JOB_FAILED, error=unit['error'])
+    
+    def process(self, unit: Dict[str, Any]) -> None:
+        """Process one claimed unit, completing or failing it on the broker."""
+        job = self.store.get(unit['job_id'])
+        if job is None or job['status'] in JOB_FINISHED:
+            # Cancelled or finished while the unit was queued
+            self.broker.complete(unit['unit_id'], self.worker_id)
+            return
+        if job['status'] == JOB_QUEUED:
+            self.store.update(unit['job_id'], status=JOB_RUNNING, started_at=_now())
+        
+        print(
+            f"Processing {unit['kind']} unit of job {unit['job_id']} "
+            f"(attempt {unit['attempts']})"
+        )
+        done = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(unit, done), daemon=True)
+        heartbeat.start()
+        try:
+            with span(f"worker.{unit['kind']}", job_id=unit['job_id'], attempt=unit['attempts']):
+                follow_up = self.handlers[unit['kind']](unit)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            status = self.broker.fail(unit, self.worker_id, error)
+            print(f"{unit['kind']} unit of job {unit['job_id']} failed: {error}")
+            if status == UNIT_DEAD:
+                self._finish_job(unit['job_id'], JOB_FAILED, error=error)
+        else:
+            # The next unit is only queued if this worker still held the lease
+            if not self.broker.complete(unit['unit_id'], self.worker_id, follow_up):
+                print(f"Lease lost before completing {unit['kind']} unit {unit['unit_id']}")
+        finally:
+            done.set()
+            heartbeat.join()
+    
+    def run_once(self) -> bool:
+        """
+        Claim and process one unit.
+        
+        Returns:
+            bool: False if no unit was available
+        """
+        self._fail_dead_letters()
+        unit = self.broker.claim(self.worker_id, self.kinds)
+        if unit is None:
+            return False
+        self.process(unit)
+        return True
+    
+    def run(self, stop: Optional[threading.Event] = None) -> None:
+        """Process units until ``stop`` is set."""
+        stop = stop or threading.Event()
+        print(f"Worker {self.worker_id} processing {', '.join(self.kinds)} units")
+        while not stop.is_set():
+            if not self.run_once():
+                stop.wait(self.poll_interval)
+
+
+def _option(name: str, default=None):
+    """Return the value of a ``--name=value`` command-line option."""
+    prefix = f"--{name}="
+    for arg in sys.argv:
+        if arg.startswith(prefix):
+            return arg[len(prefix):]
+    return default
+
+
+def main() -> None:
+    """Run a worker, or inspect and retry dead-lettered units."""
+    broker = SQLiteBroker.from_env()
+    store = JobStore(os.getenv("JOBS_DATABASE", "./output/jobs.db"))
+    
+    if "--dead-letters" in sys.argv:
+        for unit in broker.dead_letters():
+            print(f"{unit['unit_id']}  {unit['kind']:<8}  job {unit['job_id']}  {unit['error']}")
+        return
+    
+    if "--retry-dead" in sys.argv or _option("retry-dead"):
+        job_ids = broker.retry_dead(_option("retry-dead"))
+        for job_id in job_ids:
+            store.update(job_id, status=JOB_RUNNING, error=None, finished_at=None)
+        print(f"Requeued dead-lettered units of {len(job_ids)} jobs")
+        return
+    
+    kinds = _option("kinds")
+    worker = Worker(
+        broker,
+        store,
+        get_crew_factory(),
+        kinds=kinds.split(",") if kinds else None,
+    )
+    if "--once" in sys.argv:
+        worker.run_once()
+        return
+    
+    try:
+        worker.run()
+    except KeyboardInterrupt:
+        print(f"Worker {worker.worker_id} stopped")
+
+
+if __name__ == "__main__":
+    main()
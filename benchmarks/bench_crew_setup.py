@@ -0,0 +1,50 @@
+"""
+Crew Setup Benchmark
+
+Compares per-request crew setup latency when building a new CrewSightCrew
+for every request against handing out crews from a warm CrewFactory. No
+LLM calls are made; only crew construction is timed.
+
+Usage:
+    python -m benchmarks.bench_crew_setup [iterations]
+
+© 2025 Utilyst Inc. All rights reserved.
+"""
+
+import statistics
+import sys
+import time
+from typing import Callable, List
+
+from src.crewsight.crew import CrewSightCrew
+from src.crewsight.factory import CrewFactory
+
+
+def time_setup(build: Callable[[], CrewSightCrew], iterations: int) -> List[float]:
+    """Build and assemble ``iterations`` crews, returning each setup time in milliseconds."""
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        build().crew()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def report(label: str, timings: List[float]) -> None:
+    ordered = sorted(timings)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(f"  {label:<22} p50 {statistics.median(ordered):8.2f} ms   p99 {p99:8.2f} ms")
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    
+    print(f"Crew setup latency over {iterations} runs")
+    report("new CrewSightCrew()", time_setup(CrewSightCrew, iterations))
+    
+    factory = CrewFactory()
+    report("CrewFactory.create()", time_setup(factory.create, iterations))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Folder Download Benchmark
+
+Compares sequential and concurrent folder downloads in
+PublicGoogleDriveProcessorTool against a local fake Drive server.
+
+Usage:
+    python -m benchmarks.bench_downloads [file_count] [file_size] [latency]
+
+© 2025 Utilyst Inc. All rights reserved.
+"""
+
+import sys
+import tempfile
+import time
+
+from benchmarks.fake_drive import FakeDriveServer, synthetic_folder
+from src.crewsight.tools.public_google_drive_processor import PublicGoogleDriveProcessorTool
+
+
+def bench(
+    server: FakeDriveServer,
+    max_workers: int,
+    max_connections_per_host: int,
+    passes: int = 1,
+) -> float:
+    """Download the whole fake folder ``passes`` times and return the seconds of the last pass."""
+    with tempfile.TemporaryDirectory() as download_dir:
+        tool = PublicGoogleDriveProcessorTool(
+            download_dir=download_dir,
+            max_workers=max_workers,
+            max_connections_per_host=max_connections_per_host,
+        )
+        tool.direct_download_url = server.direct_download_url
+        
+        for _ in range(passes):
+            start = time.perf_counter()
+            download_results = tool._download_files(server.file_listing())
+            elapsed = time.perf_counter() - start
+            
+            failed = [r for r in download_results if r['status'] != 'success']
+            if failed:
+                raise RuntimeError(f"{len(failed)} downloads failed: {failed[0]}")
+        return elapsed
+
+
+def main():
+    file_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    file_size = int(sys.argv[2]) if len(sys.argv) > 2 else 64 * 1024
+    latency = float(sys.argv[3]) if len(sys.argv) > 3 else 0.05
+    
+    print(f"Folder: {file_count} files x {file_size} bytes, {latency * 1000:.0f} ms latency")
+    
+    with FakeDriveServer(synthetic_folder(file_count, file_size), latency=latency) as server:
+        baseline = bench(server, max_workers=1, max_connections_per_host=1)
+        print(f"  sequential             {baseline:7.2f}s")
+        
+        for workers in (4, 8, 16):
+            elapsed = bench(server, max_workers=workers, max_connections_per_host=workers)
+            speedup = baseline / elapsed
+            print(f"  {workers:2d} workers             {elapsed:7.2f}s  ({speedup:.1f}x)")
+        
+        elapsed = bench(server, max_workers=8, max_connections_per_host=8, passes=2)
+        print(f"   8 workers, warm cache {elapsed:7.2f}s  ({baseline / elapsed:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
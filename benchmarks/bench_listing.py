@@ -0,0 +1,65 @@
+"""
+Folder Listing Benchmark
+
+Lists a nested fake Drive folder through the Drive v3 API route with
+DriveLister, one folder at a time versus concurrently, and checks the
+listing is complete.
+
+Usage:
+    python -m benchmarks.bench_listing [folder_count] [files_per_folder] [latency]
+
+© 2025 Utilyst Inc. All rights reserved.
+"""
+
+import sys
+import time
+
+from benchmarks.fake_drive import FakeDriveServer, synthetic_tree
+from src.crewsight.tools.drive_listing import DriveLister
+from src.crewsight.tools.drive_session import DriveSession
+
+
+def bench(server: FakeDriveServer, max_workers: int) -> float:
+    """List the whole fake folder tree and return the elapsed seconds."""
+    lister = DriveLister(
+        DriveSession(pool_maxsize=max_workers),
+        server.list_api_url,
+        max_workers=max_workers,
+    )
+    
+    start = time.perf_counter()
+    files = lister.list("root")
+    elapsed = time.perf_counter() - start
+    
+    if len(files) != len(server.files):
+        raise RuntimeError(f"Listed {len(files)} of {len(server.files)} files")
+    if len({f['id'] for f in files}) != len(files):
+        raise RuntimeError("Listing returned duplicate files")
+    if not all(f.get('size') and f.get('modifiedTime') for f in files):
+        raise RuntimeError("Listing is missing size or modifiedTime metadata")
+    return elapsed
+
+
+def main():
+    folder_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    files_per_folder = int(sys.argv[2]) if len(sys.argv) > 2 else 250
+    latency = float(sys.argv[3]) if len(sys.argv) > 3 else 0.05
+    
+    files, tree = synthetic_tree(folder_count, files_per_folder, 64)
+    print(
+        f"Tree: {folder_count} subfolders x {files_per_folder} files "
+        f"({len(files)} files), {latency * 1000:.0f} ms latency, 100 items per page"
+    )
+    
+    with FakeDriveServer(files, latency=latency, tree=tree) as server:
+        baseline = bench(server, max_workers=1)
+        print(f"  one folder at a time   {baseline:7.2f}s")
+        
+        for workers in (4, 8, 16):
+            elapsed = bench(server, max_workers=workers)
+            speedup = baseline / elapsed
+            print(f"  {workers:2d} folders at a time   {elapsed:7.2f}s  ({speedup:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
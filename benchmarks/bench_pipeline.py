@@ -0,0 +1,355 @@
+"""
+End-to-End Pipeline Benchmark
+
+Runs PublicGoogleDriveProcessorTool, CrewSightCrew and the FastAPI
+endpoints end to end against the local fake Drive server and stub LLMs, and
+records throughput, p50/p99 latency, peak RSS and bytes transferred per
+scenario into a JSON results file that later runs can be compared with.
+No network access or API keys are needed; the crew and API scenarios still
+need crewai installed.
+
+Usage:
+    python -m benchmarks.bench_pipeline [--files=200] [--file-size=65536]
+        [--drive-latency=0.02] [--llm-latency=0.2] [--requests=500] [--jobs=4]
+        [--output=output/benchmark_results.json] [--baseline=previous.json]
+        [--scenarios=drive,crew,api]
+
+© 2025 Utilyst Inc. All rights reserved.
+"""
+
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.fake_drive import FakeDriveServer, synthetic_mixed_folder
+from src.crewsight.telemetry import configure_tracing
+
+
+FOLDER_URL = "https://drive.google.com/drive/folders/root"
+SCENARIOS = ("drive", "crew", "api")
+
+
+def _option(name: str, default=None):
+    """Return the value of a ``--name=value`` command-line option."""
+    prefix = f"--{name}="
+    for arg in sys.argv:
+        if arg.startswith(prefix):
+            return arg[len(prefix):]
+    return default
+
+
+def percentiles(seconds: List[float]) -> Dict[str, float]:
+    """Return the count and p50/p99 in milliseconds of a list of durations in seconds."""
+    if not seconds:
+        return {'count': 0, 'p50_ms': 0.0, 'p99_ms': 0.0}
+    ordered = sorted(seconds)
+    return {
+        'count': len(ordered),
+        'p50_ms': round(ordered[len(ordered) // 2] * 1000, 2),
+        'p99_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000, 2),
+    }
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of the process so far, in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+class Measurement:
+    """
+    Collects one scenario's spans, fake Drive traffic and peak RSS.
+    
+    Spans are exported to a scenario-specific JSON-lines file while the
+    measurement is open and summarized per span name when it closes.
+    
+    © 2025 Utilyst Inc. All rights reserved.
+    """
+    
+    def __init__(self, name: str, server: FakeDriveServer, workdir: Path):
+        """
+        Initialize the measurement.
+        
+        Args:
+            name: Scenario name
+            server: Fake Drive server whose traffic is counted
+            workdir: Directory receiving the span export
+        """
+        self.name = name
+        self.server = server
+        self.trace_path = workdir / f"spans-{name}.jsonl"
+        self.metrics: Dict[str, Any] = {}
+    
+    def __enter__(self) -> "Measurement":
+        configure_tracing(str(self.trace_path))
+        self.bytes_before = self.server.bytes_sent
+        self.requests_before = self.server.request_count
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.metrics['seconds'] = round(time.perf_counter() - self.start, 3)
+        configure_tracing(None)
+        self.metrics['drive_bytes'] = self.server.bytes_sent - self.bytes_before
+        self.metrics['drive_requests'] = self.server.request_count - self.requests_before
+        self.metrics['peak_rss_mb'] = peak_rss_mb()
+        self.metrics['spans'] = self.span_latencies()
+    
+    def span_latencies(self) -> Dict[str, Dict[str, float]]:
+        """Return the count and p50/p99 of every span name exported during the measurement."""
+        durations = defaultdict(list)
+        if self.trace_path.exists():
+            with open(self.trace_path, encoding='utf-8') as f:
+                for line in f:
+                    record = json.loads(line)
+                    durations[record['name']].append(record['duration_ms'] / 1000)
+        return {name: percentiles(seconds) for name, seconds in sorted(durations.items())}
+
+
+def bench_drive(server: FakeDriveServer, workdir: Path) -> Dict[str, Dict[str, Any]]:
+    """Retrieve the fake folder with the Drive tool, cold and then with a warm cache."""
+    from src.crewsight.tools.public_google_drive_processor import PublicGoogleDriveProcessorTool
+    
+    tool = PublicGoogleDriveProcessorTool(download_dir=str(workdir / "drive"))
+    server.configure(tool)
+    file_count = len(server.file_listing())
+    
+    results = {}
+    for name in ("drive_cold", "drive_warm"):
+        with Measurement(name, server, workdir) as measurement:
+            tool._run(FOLDER_URL)
+        failed = [f for f in tool.last_results['files'] if f['status'] == 'failed']
+        if failed:
+            raise RuntimeError(f"{len(failed)} downloads failed: {failed[0].get('error')}")
+        
+        metrics = measurement.metrics
+        metrics['files_per_second'] = round(file_count / metrics['seconds'], 1)
+        megabytes = metrics['drive_bytes'] / (1024 * 1024)
+        metrics['mb_per_second'] = round(megabytes / metrics['seconds'], 2)
+        results[name] = metrics
+    return results
+
+
+def bench_crew(factory, server: FakeDriveServer, workdir: Path) -> Dict[str, Dict[str, Any]]:
+    """Kick off one full crew run with stub LLMs."""
+    with Measurement("crew", server, workdir) as measurement:
+        crew_instance = factory.create(report_path=str(workdir / "output" / "crew_report.md"))
+        crew_instance.kickoff(inputs={
+            'google_drive_url': FOLDER_URL,
+            'document_type': "general",
+            'analysis_focus': "comprehensive_review",
+            'output_format': "structured_summary",
+        })
+    
+    measurement.metrics['llm_calls'] = sum(llm.calls for llm in factory.template.llms.values())
+    return {'crew': measurement.metrics}
+
+
+def _timed(call: Callable[[], Any]) -> float:
+    """Return the seconds a call takes."""
+    start = time.perf_counter()
+    call()
+    return time.perf_counter() - start
+
+
+def bench_api(
+    server: FakeDriveServer,
+    workdir: Path,
+    request_count: int,
+    job_count: int,
+) -> Dict[str, Dict[str, Any]]:
+    """Serve the API on a local port and load its health, session and document endpoints."""
+    import httpx
+    import uvicorn
+    
+    from api.server import app
+    
+    config = uvicorn.Config(app, host="127.0.0.1", port=0, log_level="warning")
+    api_server = uvicorn.Server(config)
+    thread = threading.Thread(target=api_server.run, daemon=True)
+    thread.start()
+    while not api_server.started:
+        time.sleep(0.05)
+    port = api_server.servers[0].sockets[0].getsockname()[1]
+    
+    results = {}
+    response_bytes = []
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=60) as client:
+            def get(path: str) -> httpx.Response:
+                response = client.get(path)
+                response.raise_for_status()
+                response_bytes.append(len(response.content))
+                return response
+            
+            # Document jobs: submit concurrently, then wait for every session to finish
+            with Measurement("api_documents", server, workdir) as measurement:
+                submitted = {}
+                
+                def submit(_) -> None:
+                    start = time.perf_counter()
+                    response = client.post(
+                        "/api/process/documents", json={'google_drive_url': FOLDER_URL}
+                    )
+                    response.raise_for_status()
+                    submitted[response.json()['session_id']] = (start, time.perf_counter() - start)
+                
+                with ThreadPoolExecutor(max_workers=job_count) as pool:
+                    list(pool.map(submit, range(job_count)))
+                
+                job_seconds = {}
+                while len(job_seconds) < len(submitted):
+                    for session_id, (start, _) in submitted.items():
+                        if session_id not in job_seconds:
+                            session = get(f"/api/session/{session_id}").json()
+                            if session['status'] == "failed":
+                                raise RuntimeError(f"Job {session_id} failed: {session['error']}")
+                            if session['status'] in ("completed", "cancelled"):
+                                job_seconds[session_id] = time.perf_counter() - start
+                    time.sleep(0.1)
+            
+            metrics = measurement.metrics
+            metrics['submit'] = percentiles(
+                [submit_seconds for _, submit_seconds in submitted.values()]
+            )
+            metrics['job'] = percentiles(list(job_seconds.values()))
+            metrics['jobs_per_minute'] = round(job_count * 60 / metrics['seconds'], 2)
+            results['api_documents'] = metrics
+            
+            # Read-only endpoints under concurrent load
+            for name, path in (
+                ("api_health", "/health"),
+                ("api_session", f"/api/session/{next(iter(submitted))}"),
+            ):
+                response_bytes.clear()
+                with Measurement(name, server, workdir) as measurement:
+                    with ThreadPoolExecutor(max_workers=8) as pool:
+                        latencies = list(pool.map(
+                            lambda _: _timed(lambda: get(path)), range(request_count)
+                        ))
+                
+                metrics = measurement.metrics
+                metrics['requests'] = percentiles(latencies)
+                metrics['requests_per_second'] = round(request_count / metrics['seconds'], 1)
+                metrics['response_bytes'] = sum(response_bytes)
+                results[name] = metrics
+    finally:
+        api_server.should_exit = True
+        thread.join(timeout=10)
+    return results
+
+
+def git_commit() -> Optional[str]:
+    """Return the current git commit of the repository, if any."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parent,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _headline(metrics: Dict[str, Any]) -> Dict[str, float]:
+    """The comparable top-level numbers of a scenario's metrics."""
+    headline = {k: v for k, v in metrics.items() if isinstance(v, (int, float))}
+    for key in ('submit', 'job', 'requests'):
+        if key in metrics:
+            headline[f"{key}_p50_ms"] = metrics[key]['p50_ms']
+            headline[f"{key}_p99_ms"] = metrics[key]['p99_ms']
+    return headline
+
+
+def print_results(results: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None) -> None:
+    """Print each scenario's headline numbers, with the change against a baseline run."""
+    for scenario, metrics in results['scenarios'].items():
+        previous = _headline((baseline or {}).get('scenarios', {}).get(scenario, {}))
+        print(f"  {scenario}")
+        for key, value in _headline(metrics).items():
+            line = f"    {key:<22} {value:>12}"
+            if previous.get(key):
+                line += f"   {(value - previous[key]) / previous[key] * 100:+7.1f}%"
+            print(line)
+
+
+def main():
+    file_count = int(_option("files", 200))
+    file_size = int(_option("file-size", 64 * 1024))
+    drive_latency = float(_option("drive-latency", 0.02))
+    llm_latency = float(_option("llm-latency", 0.2))
+    request_count = int(_option("requests", 500))
+    job_count = int(_option("jobs", 4))
+    scenarios = _option("scenarios", ",".join(SCENARIOS)).split(",")
+    output_path = Path(_option("output", "output/benchmark_results.json")).resolve()
+    baseline_path = _option("baseline")
+    baseline = json.loads(Path(baseline_path).read_text()) if baseline_path else None
+    
+    # Every relative path of the crew and API (downloads, jobs database,
+    # index, reports) lands in a scratch directory
+    workdir = Path(tempfile.mkdtemp(prefix="crewsight-bench-"))
+    os.chdir(workdir)
+    os.environ.update({
+        'CREW_MEMORY': "false",
+        'CREW_PLANNING': "false",
+        'LLM_CACHE': "false",
+        'OPENAI_API_KEY': os.getenv("OPENAI_API_KEY", "benchmark"),
+    })
+    
+    print(
+        f"Folder: {file_count} files x {file_size} bytes, {drive_latency * 1000:.0f} ms Drive "
+        f"latency, {llm_latency * 1000:.0f} ms LLM latency"
+    )
+    results = {
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'git_commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'parameters': {
+            'files': file_count, 'file_size': file_size, 'drive_latency': drive_latency,
+            'llm_latency': llm_latency, 'requests': request_count, 'jobs': job_count,
+        },
+        'scenarios': {},
+    }
+    
+    files, native, confirm_threshold = synthetic_mixed_folder(file_count, file_size)
+    with FakeDriveServer(
+        files, latency=drive_latency, native=native, confirm_threshold=confirm_threshold
+    ) as server:
+        if "drive" in scenarios:
+            results['scenarios'].update(bench_drive(server, workdir))
+        
+        if "crew" in scenarios or "api" in scenarios:
+            from benchmarks.stub_llm import stub_llm_factory
+            from src.crewsight.factory import CrewFactory, configure_crew_factory
+            
+            factory = CrewFactory(llm_factory=stub_llm_factory(latency=llm_latency))
+            server.configure(factory.template.google_drive_tool)
+            configure_crew_factory(factory)
+            
+            if "crew" in scenarios:
+                results['scenarios'].update(bench_crew(factory, server, workdir))
+            if "api" in scenarios:
+                results['scenarios'].update(bench_api(server, workdir, request_count, job_count))
+    
+    print_results(results, baseline)
+    
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(json.dumps(results, indent=2))
+    print(f"Results written to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
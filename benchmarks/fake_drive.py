@@ -0,0 +1,300 @@
+"""
+Fake Google Drive Server
+
+Local HTTP stand-in for the Google Drive endpoints used by
+PublicGoogleDriveProcessorTool, for benchmarking without network access.
+
+© 2025 Utilyst Inc. All rights reserved.
+"""
+
+import hashlib
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+
+def synthetic_folder(file_count: int, file_size: int) -> Dict[str, bytes]:
+    """Build a synthetic folder mapping file IDs to deterministic contents."""
+    files = {}
+    for index in range(file_count):
+        line = f"document {index}\n".encode()
+        files[f"file{index:05d}"] = (line * (file_size // len(line) + 1))[:file_size]
+    return files
+
+
+def synthetic_tree(
+    folder_count: int,
+    files_per_folder: int,
+    file_size: int,
+) -> Tuple[Dict[str, bytes], Dict[str, List[str]]]:
+    """
+    Build a synthetic folder tree: a root folder holding ``folder_count``
+    subfolders, every folder holding ``files_per_folder`` files.
+    
+    Returns:
+        Tuple: File contents keyed by file ID, and the children of each
+        folder keyed by folder ID (the root is ``"root"``)
+    """
+    files = synthetic_folder((folder_count + 1) * files_per_folder, file_size)
+    file_ids = list(files)
+    tree = {"root": file_ids[:files_per_folder]}
+    for index in range(folder_count):
+        folder_id = f"folder{index:03d}"
+        tree["root"].append(folder_id)
+        start = (index + 1) * files_per_folder
+        tree[folder_id] = file_ids[start:start + files_per_folder]
+    return files, tree
+
+
+def synthetic_mixed_folder(
+    file_count: int,
+    file_size: int,
+    native_every: int = 10,
+    large_every: int = 25,
+) -> Tuple[Dict[str, bytes], Dict[str, str], int]:
+    """
+    Build a synthetic folder exercising every download route: every
+    ``native_every``-th file is a native Google Doc served by the export
+    route, and every ``large_every``-th file is four times larger and only
+    downloaded after the virus-scan confirmation page.
+    
+    Returns:
+        Tuple: File contents keyed by file ID, the native files' MIME types,
+        and the ``confirm_threshold`` in bytes to serve the folder with
+    """
+    files = synthetic_folder(file_count, file_size)
+    native = {}
+    for index, file_id in enumerate(files, start=1):
+        if native_every and index % native_every == 0:
+            native[file_id] = "application/vnd.google-apps.document"
+        elif large_every and index % large_every == 0:
+            files[file_id] = files[file_id] * 4
+    return files, native, file_size * 2
+
+
+class FakeDriveServer:
+    """
+    Threaded HTTP server serving the ``uc?export=download`` route and the
+    Drive v3 ``files`` listing route.
+    
+    Download responses carry an ``ETag`` derived from the file contents, honor
+    ``If-None-Match`` with ``304 Not Modified`` and serve ``Range`` requests
+    with ``206 Partial Content``.
+    
+    Files listed in ``native`` are served as native Google Workspace files
+    of the given MIME type: they are listed without a size, their direct
+    download returns an HTML page, and ``/drive/v3/files/<id>/export``
+    returns their contents.
+    
+    Direct downloads of files larger than ``confirm_threshold`` bytes return
+    Drive's virus-scan warning page, whose ``download-form`` points back at
+    ``/download`` with a ``confirm`` token, until that token is presented.
+    
+    Listings of ``q="'<folder>' in parents"`` return at most
+    ``max_page_size`` items per page with a ``nextPageToken``, following the
+    folder ``tree`` (by default a single root folder holding every file).
+    
+    Every response is delayed by ``latency`` seconds to approximate the
+    round trip to Google Drive.
+    """
+    
+    def __init__(
+        self,
+        files: Dict[str, bytes],
+        latency: float = 0.05,
+        tree: Optional[Dict[str, List[str]]] = None,
+        max_page_size: int = 100,
+        native: Optional[Dict[str, str]] = None,
+        confirm_threshold: Optional[int] = None,
+    ):
+        self.files = files
+        self.latency = latency
+        self.tree = tree if tree is not None else {"root": list(files)}
+        self.max_page_size = max_page_size
+        self.native = native or {}
+        self.confirm_threshold = confirm_threshold
+        self.bytes_sent = 0
+        self.request_count = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+    
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    @property
+    def direct_download_url(self) -> str:
+        return self.base_url + "/uc?export=download&id={file_id}"
+    
+    @property
+    def list_api_url(self) -> str:
+        return self.base_url + "/drive/v3/files"
+    
+    def configure(self, tool) -> None:
+        """Point a PublicGoogleDriveProcessorTool's listing, export and download URLs here."""
+        tool.list_api_url = self.list_api_url
+        tool.download_url = self.list_api_url + "/{file_id}/export"
+        tool.direct_download_url = self.direct_download_url
+        tool.api_key = "benchmark"
+    
+    def _resource(self, item_id: str) -> Dict[str, str]:
+        """Return the Drive file resource of a file or folder."""
+        if item_id in self.tree:
+            return {
+                'id': item_id,
+                'name': item_id,
+                'mimeType': "application/vnd.google-apps.folder",
+                'modifiedTime': "2025-01-01T00:00:00.000Z"
+            }
+        body = self.files[item_id]
+        if item_id in self.native:
+            return {
+                'id': item_id,
+                'name': item_id,
+                'mimeType': self.native[item_id],
+                'modifiedTime': "2025-01-01T00:00:00.000Z"
+            }
+        return {
+            'id': item_id,
+            'name': f"{item_id}.txt",
+            'mimeType': "text/plain",
+            'size': str(len(body)),
+            'modifiedTime': "2025-01-01T00:00:00.000Z",
+            'md5Checksum': hashlib.md5(body).hexdigest()
+        }
+    
+    def _list_page(self, query: Dict[str, List[str]]) -> Optional[Dict]:
+        """Return one page of a folder listing, or None for an unknown folder."""
+        parent = re.match(r"'([^']+)' in parents", query.get('q', [''])[0])
+        if not parent or parent.group(1) not in self.tree:
+            return None
+        
+        children = self.tree[parent.group(1)]
+        offset = int(query.get('pageToken', ['0'])[0])
+        page_size = min(int(query.get('pageSize', ['100'])[0]), self.max_page_size)
+        page = {'files': [self._resource(i) for i in children[offset:offset + page_size]]}
+        if offset + page_size < len(children):
+            page['nextPageToken'] = str(offset + page_size)
+        return page
+    
+    def file_listing(self) -> List[Dict[str, str]]:
+        """Return the folder contents in the shape produced by ``_list_files_in_folder``."""
+        return [
+            {'id': file_id, 'name': f"{file_id}.txt", 'type': 'Text File', 'url': ''}
+            for file_id in self.files
+        ]
+    
+    def _handler_class(self):
+        server = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            
+            def log_message(self, format, *args):
+                pass
+            
+            def do_GET(self):
+                with server._lock:
+                    server.request_count += 1
+                time.sleep(server.latency)
+                
+                parsed = urlparse(self.path)
+                if parsed.path == "/drive/v3/files":
+                    page = server._list_page(parse_qs(parsed.query))
+                    if page is None:
+                        self.send_error(404)
+                        return
+                    self._send_body(json.dumps(page).encode(), "application/json")
+                    return
+                
+                export_match = re.fullmatch(r"/drive/v3/files/([^/]+)/export", parsed.path)
+                if export_match:
+                    file_id = export_match.group(1)
+                    if file_id not in server.native:
+                        self.send_error(403)
+                        return
+                    self._send_body(server.files[file_id], "text/plain")
+                    return
+                
+                query = parse_qs(parsed.query)
+                file_id = query.get('id', [''])[0]
+                if parsed.path not in ("/uc", "/download") or file_id not in server.files:
+                    self.send_error(404)
+                    return
+                
+                if file_id in server.native:
+                    # Drive answers direct downloads of native files with a web page
+                    self._send_body(b"<html><body>Google Docs</body></html>", "text/html")
+                    return
+                
+                body = server.files[file_id]
+                if (
+                    server.confirm_threshold is not None
+                    and len(body) > server.confirm_threshold
+                    and query.get('confirm', [''])[0] != "t"
+                ):
+                    # Drive cannot virus-scan large files and asks for confirmation
+                    warning = (
+                        f'<html><body><p>Google Drive can\'t scan this file for viruses.</p>'
+                        f'<form id="download-form" action="{server.base_url}/download" '
+                        f'method="get">'
+                        f'<input type="submit" value="Download anyway"/>'
+                        f'<input type="hidden" name="id" value="{file_id}">'
+                        f'<input type="hidden" name="export" value="download">'
+                        f'<input type="hidden" name="confirm" value="t">'
+                        f'<input type="hidden" name="uuid" value="{file_id}-uuid">'
+                        f'</form></body></html>'
+                    )
+                    self._send_body(warning.encode(), "text/html; charset=utf-8")
+                    return
+                
+                etag = '"' + hashlib.md5(body).hexdigest() + '"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                
+                range_match = re.match(r"bytes=(\d+)-$", self.headers.get("Range", ""))
+                if_range = self.headers.get("If-Range")
+                if range_match and (if_range is None or if_range == etag):
+                    start = int(range_match.group(1))
+                    if start >= len(body):
+                        self.send_error(416)
+                        return
+                    self.send_response(206)
+                    self.send_header("Content-Range", f"bytes {start}-{len(body) - 1}/{len(body)}")
+                    body = body[start:]
+                else:
+                    self.send_response(200)
+                
+                self.send_header("ETag", etag)
+                self._send_body(body, "application/octet-stream", status=None)
+            
+            def _send_body(self, body: bytes, content_type: str, status: Optional[int] = 200):
+                if status is not None:
+                    self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                with server._lock:
+                    server.bytes_sent += len(body)
+        
+        return Handler
+    
+    def __enter__(self) -> "FakeDriveServer":
+        self._thread.start()
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,108 @@
+"""
+Stub LLM
+
+Offline stand-in for the agents' model clients, with configurable latency,
+for benchmarking the crew without API keys or network access.
+
+© 2025 Utilyst Inc. All rights reserved.
+"""
+
+import json
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from crewai import LLM
+
+from src.crewsight.llm import TracedLLM
+from src.crewsight.llm.traced_llm import _message_text
+
+
+FOLDER_URL_PATTERN = re.compile(r"https?://\S+?/folders/[\w-]+")
+
+
+def _folder_url(prompt: str) -> Dict[str, Any]:
+    """Drive tool arguments: the first folder URL of the prompt."""
+    match = FOLDER_URL_PATTERN.search(prompt)
+    return {'url': match.group(0) if match else ""}
+
+
+# Tools an agent is scripted to call once each, in order, before answering
+TOOL_SCRIPT: List[Tuple[str, Callable[[str], Dict[str, Any]]]] = [
+    ("Public Google Drive Processor", _folder_url),
+    ("Extracted Document Reader", lambda prompt: {'file_name': ""}),
+]
+
+
+class _StubCompletion(LLM):
+    """Answers in place of LiteLLM; sits below TracedLLM so calls are still traced."""
+    
+    def call(self, messages: Any, callbacks: Optional[List[Any]] = None) -> str:
+        """Sleep for the configured latency, then return a scripted response."""
+        prompt = _message_text(messages)
+        time.sleep(self.latency + self.seconds_per_1k_tokens * len(prompt) / 4000)
+        with self._lock:
+            self.calls += 1
+        
+        # Agents call the scripted tools they have, one per step, then answer;
+        # crewai returns each step with its observation as an assistant message
+        steps_done = 0 if isinstance(messages, str) else sum(
+            1 for message in messages if message.get('role') == 'assistant'
+        )
+        planned = [(name, args) for name, args in TOOL_SCRIPT if f"Tool Name: {name}" in prompt]
+        if steps_done < len(planned):
+            name, args = planned[steps_done]
+            return (
+                f"Thought: I should use the {name} tool.\n"
+                f"Action: {name}\n"
+                f"Action Input: {json.dumps(args(prompt))}"
+            )
+        
+        words = " ".join(f"finding{i}" for i in range(max(1, self.output_tokens // 2)))
+        return f"Thought: I now know the final answer\nFinal Answer: Stub analysis. {words}"
+
+
+class StubLLM(TracedLLM, _StubCompletion):
+    """
+    Model client that never leaves the process.
+    
+    Every call sleeps ``latency`` seconds plus ``seconds_per_1k_tokens`` per
+    thousand estimated prompt tokens, then answers in the ReAct format
+    crewai agents parse: agents are scripted to call the Drive and
+    extracted-document tools once when they have them, then give a final
+    answer of about ``output_tokens`` tokens. Calls are traced as
+    ``llm.call`` spans like those of the real clients.
+    
+    © 2025 Utilyst Inc. All rights reserved.
+    """
+    
+    def __init__(
+        self,
+        model: str,
+        latency: float = 0.2,
+        seconds_per_1k_tokens: float = 0.0,
+        output_tokens: int = 200,
+        **kwargs: Any,
+    ):
+        """
+        Initialize the stub.
+        
+        Args:
+            model: Model name it stands in for
+            latency: Fixed seconds per call
+            seconds_per_1k_tokens: Additional seconds per 1,000 prompt tokens
+            output_tokens: Approximate size of final answers
+            **kwargs: Further TracedLLM settings
+        """
+        super().__init__(model=model, **kwargs)
+        self.latency = latency
+        self.seconds_per_1k_tokens = seconds_per_1k_tokens
+        self.output_tokens = output_tokens
+        self.calls = 0
+        self._lock = threading.Lock()
+
+
+def stub_llm_factory(**settings: Any) -> Callable[[str], StubLLM]:
+    """Return an ``llm_factory`` for CrewFactory creating StubLLMs with ``settings``."""
+    return lambda model: StubLLM(model=model, **settings)
@@ -0,0 +1,15 @@
+"""
+CrewSight-AI Document Analysis
+
+© 2025 Utilyst Inc. All rights reserved.
+"""
+
+from src.crewsight.analysis.chunking import chunk_text, estimate_tokens
+from src.crewsight.analysis.map_reduce import MapReduceAnalyzer, RequestPacer
+
+__all__ = [
+    "MapReduceAnalyzer",
+    "RequestPacer",
+    "chunk_text",
+    "estimate_tokens",
+]
@@ -0,0 +1,88 @@
+"""
+Token-Budgeted Chunking
+
+Splits extracted document text into chunks that fit a model's token budget.
+
+© 2025 Utilyst Inc. All rights reserved.
+"""
+
+import re
+from typing import List
+
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+except Exception:  # tiktoken is optional; fall back to a character heuristic
+    _ENCODING = None
+
+# Average characters per token for English prose, used without tiktoken
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens in a text."""
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text, disallowed_special=()))
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _split_oversized(block: str, max_tokens: int) -> List[str]:
+    """Split a single block that exceeds the budget on sentence, then character, boundaries."""
+    pieces = []
+    current = ""
+    for sentence in re.split(r'(?<=[.!?])\s+', block):
+        candidate = f"{current} {sentence}".strip()
+        if estimate_tokens(candidate) <= max_tokens:
+            current = candidate
+            continue
+        if current:
+            pieces.append(current)
+        if estimate_tokens(sentence) <= max_tokens:
+            current = sentence
+        else:
+            width = max_tokens * CHARS_PER_TOKEN
+            pieces.extend(sentence[i:i + width] for i in range(0, len(sentence), width))
+            current = ""
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def chunk_text(text: str, max_tokens: int, overlap_tokens: int = 0) -> List[str]:
+    """
+    Split text into chunks of at most ``max_tokens`` tokens.
+    
+    Chunks are built from whole paragraphs where possible; paragraphs larger
+    than the budget are split on sentences. Each chunk after the first
+    starts with up to ``overlap_tokens`` tokens of trailing context from the
+    previous chunk.
+    
+    Returns:
+        List[str]: The chunks, in document order
+    """
+    blocks: List[str] = []
+    for paragraph in re.split(r'\n\s*\n', text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if estimate_tokens(paragraph) > max_tokens:
+            blocks.extend(_split_oversized(paragraph, max_tokens))
+        else:
+            blocks.append(paragraph)
+    
+    chunks: List[str] = []
+    current: List[str] = []
+    current_tokens = 0
+    for block in blocks:
+        block_tokens = estimate_tokens(block)
+        if current and current_tokens + block_tokens > max_tokens:
+            chunks.append("\n\n".join(current))
+            tail = current[-1][-overlap_tokens * CHARS_PER_TOKEN:] if overlap_tokens else ""
+            current = [tail] if tail and estimate_tokens(tail) + block_tokens <= max_tokens else []
+            current_tokens = sum(estimate_tokens(part) for part in current)
+        current.append(block)
+        current_tokens += block_tokens
+    if current:
+        chunks.append("\n\n".join(current))
+    
+    return chunks
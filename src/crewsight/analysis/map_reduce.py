@@ -0,0 +1,307 @@
+"""
+Map-Reduce Analysis
+
+Chunked, concurrent document analysis for folders too large for one context.
+
+© 2025 Utilyst Inc. All rights reserved.
+"""
+
+import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from src.crewsight.analysis.chunking import chunk_text, estimate_tokens
+from src.crewsight.telemetry import inherit_span, span
+
+
+MAP_PROMPT = """You are analyzing part {part} of {parts} of the document "{document}".
+Focus: {focus}
+
+Summarize the main topics, key findings, important data points and any tables
+in this excerpt. Be concise and factual; do not speculate beyond the text.
+
+Excerpt:
+{text}"""
+
+REDUCE_DOCUMENT_PROMPT = """Combine these partial analyses of the document "{document}"
+into one analysis focused on: {focus}
+
+Cover content (topics, findings, data points), structure (sections, tables,
+references) and anything notable. Remove repetition.
+
+Partial analyses:
+{text}"""
+
+REDUCE_FOLDER_PROMPT = """Combine these per-document analyses into a cross-document analysis
+focused on: {focus}
+
+Identify common themes and patterns, cross-references and dependencies
+between documents, and the most important data points. Keep a short
+paragraph per document.
+
+Document analyses:
+{text}"""
+
+
+class RequestPacer:
+    """Spaces out LLM requests to stay within a requests-per-minute budget."""
+    
+    def __init__(self, max_rpm: int):
+        self.interval = 60.0 / max_rpm if max_rpm else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+    
+    def wait(self) -> None:
+        """Block until the next request slot is available."""
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class MapReduceAnalyzer:
+    """
+    Analyzes documents with a map-reduce over token-budgeted chunks.
+    
+    Map: every document is split into chunks of at most ``chunk_tokens``
+    and each chunk is analyzed independently, concurrently, within the
+    requests-per-minute budget. Reduce: chunk analyses are combined per
+    document, then document analyses are combined across the folder. Any
+    reduce input larger than ``reduce_tokens`` is reduced hierarchically in
+    groups; each level of the document reduce runs for all documents at once.
+    Token and latency statistics are collected per stage, and the
+    run is traced as an ``analysis.map_reduce`` span.
+    
+    With a ``memo``, per-document analyses are kept by content and focus, so
+    a document seen before (e.g. the same manual in another folder of a
+    batch) skips the map and document-reduce stages. With an ``llm_router``,
+    each call may go to a different model, e.g. short chunks to a fast one.
+    
+    © 2025 Utilyst Inc. All rights reserved.
+    """
+    
+    def __init__(
+        self,
+        llm: Any,
+        max_rpm: int = 30,
+        max_concurrency: int = 4,
+        chunk_tokens: int = 6000,
+        overlap_tokens: int = 200,
+        reduce_tokens: int = 12000,
+        memo: Optional[Dict[str, str]] = None,
+        llm_router: Optional[Callable[[str, int], Any]] = None,
+    ):
+        """
+        Initialize the analyzer.
+        
+        Args:
+            llm: Model client with a ``call(messages)`` method returning text,
+                such as ``crewai.LLM``
+            max_rpm: Requests-per-minute budget shared by all stages
+            max_concurrency: Maximum number of LLM calls in flight
+            chunk_tokens: Token budget per map chunk
+            overlap_tokens: Tokens of context repeated between chunks
+            reduce_tokens: Token budget for the input of a single reduce call
+            memo: Mapping shared between analyzers that stores per-document
+                analyses by content hash and focus; None to always analyze
+            llm_router: Returns the model client for a stage name and prompt
+                size in tokens, e.g. a fast model for short map chunks; None
+                to use ``llm`` for every call
+        """
+        self.llm = llm
+        self.max_concurrency = max(1, max_concurrency)
+        self.chunk_tokens = chunk_tokens
+        self.overlap_tokens = overlap_tokens
+        self.reduce_tokens = reduce_tokens
+        self.pacer = RequestPacer(max_rpm)
+        self.memo = memo
+        self.llm_router = llm_router
+        
+        self._stats_lock = threading.Lock()
+        self.stats: Dict[str, Dict[str, float]] = {}
+    
+    def _record(
+        self,
+        stage: str,
+        prompt_tokens: int,
+        response: str,
+        seconds: float,
+        routed: bool,
+    ) -> None:
+        """Add one LLM call to a stage's statistics."""
+        with self._stats_lock:
+            stage_stats = self.stats.setdefault(stage, {
+                'calls': 0, 'routed_calls': 0, 'input_tokens': 0, 'output_tokens': 0, 'seconds': 0.0
+            })
+            stage_stats['calls'] += 1
+            stage_stats['routed_calls'] += int(routed)
+            stage_stats['input_tokens'] += prompt_tokens
+            stage_stats['output_tokens'] += estimate_tokens(response)
+            stage_stats['seconds'] += seconds
+    
+    def _call(self, stage: str, prompt: str) -> str:
+        """Make one paced LLM call on the stage's routed model and record its statistics."""
+        prompt_tokens = estimate_tokens(prompt)
+        llm = self.llm_router(stage, prompt_tokens) if self.llm_router else self.llm
+        self.pacer.wait()
+        start = time.perf_counter()
+        response = str(llm.call([{"role": "user", "content": prompt}]))
+        self._record(
+            stage, prompt_tokens, response, time.perf_counter() - start, llm is not self.llm
+        )
+        return response
+    
+    def _groups(self, parts: List[str]) -> List[List[str]]:
+        """Split partial analyses into groups that fit ``reduce_tokens``."""
+        groups: List[List[str]] = [[]]
+        group_tokens = 0
+        for part in parts:
+            part_tokens = estimate_tokens(part)
+            if groups[-1] and group_tokens + part_tokens > self.reduce_tokens:
+                groups.append([])
+                group_tokens = 0
+            groups[-1].append(part)
+            group_tokens += part_tokens
+        
+        if len(groups) == len(parts):
+            # Every part already fills the budget on its own; reduce pairwise
+            groups = [parts[i:i + 2] for i in range(0, len(parts), 2)]
+        return groups
+    
+    def _reduce(
+        self,
+        stage: str,
+        template: str,
+        parts: Dict[str, List[str]],
+        focus: str,
+        pool,
+    ) -> Dict[str, str]:
+        """
+        Reduce the partial analyses of several documents, hierarchically when needed.
+        
+        Each round reduces every document that still has more than one part
+        with a single ``pool.map``, so the calls of all documents share the
+        pool instead of running one document after another.
+        """
+        parts = dict(parts)
+        while True:
+            jobs = [
+                (name, group)
+                for name, document_parts in parts.items() if len(document_parts) > 1
+                for group in self._groups(document_parts)
+            ]
+            if not jobs:
+                break
+            results = list(pool.map(
+                lambda job: self._call(stage, template.format(
+                    document=job[0], focus=focus, text="\n\n---\n\n".join(job[1])
+                )),
+                jobs,
+            ))
+            for name in {name for name, _ in jobs}:
+                parts[name] = []
+            for (name, _), result in zip(jobs, results):
+                parts[name].append(result)
+        return {
+            name: document_parts[0] if document_parts else ""
+            for name, document_parts in parts.items()
+        }
+    
+    @staticmethod
+    def _memo_key(text: str, focus: str) -> str:
+        """Return the memo key of a document's analysis."""
+        return hashlib.sha256(f"{focus}\0{text}".encode('utf-8')).hexdigest()
+    
+    def analyze(self, documents: Dict[str, str], focus: str) -> Dict[str, Any]:
+        """
+        Analyze a set of documents.
+        
+        Args:
+            documents: Extracted document text keyed by document name
+            focus: Analysis focus, e.g. the crew's ``analysis_focus`` input
+        
+        Returns:
+            Dict: ``documents`` (analysis per document), ``summary``
+            (cross-document analysis), and per-stage ``stats``
+        """
+        self.stats = {}
+        start = time.perf_counter()
+        
+        memo_keys = {name: self._memo_key(text, focus) for name, text in documents.items()}
+        memoized = {
+            name: self.memo[key] for name, key in memo_keys.items()
+            if self.memo is not None and key in self.memo
+        }
+        
+        with span('analysis.map_reduce', documents=len(documents)) as current, ThreadPoolExecutor(
+            max_workers=self.max_concurrency, **inherit_span()
+        ) as pool:
+            stage_start = time.perf_counter()
+            chunks = {
+                name: chunk_text(text, self.chunk_tokens, self.overlap_tokens) or [""]
+                for name, text in documents.items() if name not in memoized
+            }
+            map_jobs = [
+                (name, index, len(parts), part)
+                for name, parts in chunks.items()
+                for index, part in enumerate(parts, start=1)
+            ]
+            map_results = list(pool.map(
+                lambda job: self._call('map', MAP_PROMPT.format(
+                    document=job[0], part=job[1], parts=job[2], focus=focus, text=job[3]
+                )),
+                map_jobs,
+            ))
+            self.stats.setdefault('map', {})['wall_seconds'] = time.perf_counter() - stage_start
+            
+            per_document: Dict[str, List[str]] = {name: [] for name in chunks}
+            for (name, _, _, _), result in zip(map_jobs, map_results):
+                per_document[name].append(result)
+            
+            stage_start = time.perf_counter()
+            reduced = self._reduce(
+                'reduce_document', REDUCE_DOCUMENT_PROMPT, per_document, focus, pool
+            )
+            if self.memo is not None:
+                for name, analysis in reduced.items():
+                    self.memo[memo_keys[name]] = analysis
+            document_analyses = {
+                name: memoized[name] if name in memoized else reduced[name] for name in documents
+            }
+            self.stats.setdefault('reduce_document', {})['wall_seconds'] = (
+                time.perf_counter() - stage_start
+            )
+            
+            stage_start = time.perf_counter()
+            summary = self._reduce(
+                'reduce_folder',
+                REDUCE_FOLDER_PROMPT,
+                {"": [
+                    f"## {name}\n\n{analysis}" for name, analysis in document_analyses.items()
+                ]},
+                focus,
+                pool,
+            )[""] if len(document_analyses) > 1 else next(iter(document_analyses.values()), "")
+            self.stats.setdefault('reduce_folder', {})['wall_seconds'] = (
+                time.perf_counter() - stage_start
+            )
+            current.set(chunks=len(map_jobs), memoized=len(memoized))
+        
+        self.stats['total'] = {
+            'chunks': len(map_jobs),
+            'documents': len(documents),
+            'memoized_documents': len(memoized),
+            'wall_seconds': time.perf_counter() - start
+        }
+        
+        return {
+            'documents': document_analyses,
+            'summary': summary,
+            'stats': self.stats
+        }
@@ -0,0 +1,283 @@
+"""
+CrewSight-AI Batch Processing
+
+Processes many Google Drive folders from a manifest with a bounded worker pool,
+cross-folder deduplication and a resumable checkpoint.
+
+© 2025 Utilyst Inc. All rights reserved.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from src.crewsight.crew import (
+    ANALYSIS_AGENT,
+    ANALYSIS_MAP_REDUCE,
+    EXECUTION_FAN_OUT,
+    EXECUTION_SEQUENTIAL,
+)
+from src.crewsight.factory import CrewFactory
+from src.crewsight.telemetry import inherit_span, span
+
+
+BATCH_COMPLETED = "completed"
+BATCH_FAILED = "failed"
+
+# Crew inputs used when a manifest entry does not set them, as in main.run
+DEFAULT_INPUTS = {
+    'document_type': 'general',
+    'analysis_focus': 'comprehensive_review',
+    'output_format': 'structured_summary'
+}
+
+# Manifest keys that configure a folder's run instead of being crew inputs
+RUN_OPTIONS = ('incremental', 'analysis_mode', 'execution_mode', 'max_concurrency')
+
+
+def load_batch_manifest(path: str) -> List[Dict[str, Any]]:
+    """
+    Read a batch manifest.
+    
+    Every line is a folder URL or a JSON object with ``google_drive_url``,
+    crew inputs (``document_type``, ``analysis_focus``, ``output_format``)
+    and run options (``incremental``, ``analysis_mode``, ``execution_mode``,
+    ``max_concurrency``). Blank lines and ``#`` comments are ignored, and a
+    folder listed twice is processed once.
+    
+    Args:
+        path: Manifest file path
+    
+    Returns:
+        List[Dict]: One entry per folder, with default inputs filled in
+    
+    Raises:
+        ValueError: If a line is neither a URL nor an object with ``google_drive_url``
+    """
+    entries = []
+    seen = set()
+    for number, line in enumerate(Path(path).read_text(encoding='utf-8').splitlines(), start=1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        try:
+            entry = json.loads(line) if line.startswith('{') else {'google_drive_url': line}
+        except json.JSONDecodeError as e:
+            raise ValueError(f"{path}:{number}: invalid JSON: {e}") from e
+        if not entry.get('google_drive_url'):
+            raise ValueError(f"{path}:{number}: missing google_drive_url")
+        
+        if entry['google_drive_url'] in seen:
+            continue
+        seen.add(entry['google_drive_url'])
+        entries.append({**DEFAULT_INPUTS, **entry})
+    return entries
+
+
+def folder_key(url: str) -> str:
+    """Return a file-name-safe key for a folder URL: its folder ID, or a hash of the URL."""
+    match = re.search(r'/folders/([\w-]+)', url) or re.search(r'[?&]id=([\w-]+)', url)
+    return match.group(1) if match else hashlib.sha256(url.encode('utf-8')).hexdigest()[:16]
+
+
+class BatchCheckpoint:
+    """
+    Outcome of every processed folder of a batch, keyed by folder URL.
+    
+    Rewritten atomically after each folder, so an interrupted batch resumes
+    with the folders that have not completed; failed folders are retried.
+    
+    © 2025 Utilyst Inc. All rights reserved.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Load the checkpoint, or start an empty one.
+        
+        Args:
+            path: Checkpoint JSON file
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.folders: Dict[str, Dict[str, Any]] = {}
+        if self.path.exists():
+            self.folders = json.loads(self.path.read_text(encoding='utf-8')).get('folders', {})
+    
+    def completed(self, url: str) -> bool:
+        """Return whether a folder completed in an earlier or the current run."""
+        with self._lock:
+            return self.folders.get(url, {}).get('status') == BATCH_COMPLETED
+    
+    def record(self, url: str, outcome: Dict[str, Any]) -> None:
+        """Store a folder's outcome and write the checkpoint."""
+        with self._lock:
+            self.folders[url] = outcome
+            data = {
+                'updated_at': datetime.now(timezone.utc).isoformat(),
+                'folders': self.folders
+            }
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".json.tmp")
+            tmp_path.write_text(json.dumps(data, indent=2), encoding='utf-8')
+            os.replace(tmp_path, self.path)
+
+
+class BatchRunner:
+    """
+    Runs the crew over the folders of a batch manifest.
+    
+    Folders run concurrently on ``max_workers`` threads, each with a crew
+    from a shared CrewFactory, so every run shares its LLM clients (and the
+    factory's requests-per-minute budget), HTTP session and caches. Content
+    that appears in several folders is processed once:
+    
+    - downloads: a file whose Drive MD5 checksum matches content already in
+      the download cache is linked from it (needs Drive API listing, i.e.
+      ``GOOGLE_API_KEY``)
+    - extraction: the extraction memo is keyed by content hash
+    - analysis: folders run in map-reduce mode unless they set another
+      ``analysis_mode`` (or fan-out execution), and per-document analyses
+      are shared across the batch's folders by content and analysis focus.
+      In agent mode each folder's agent analyzes all of its documents, and
+      those seen in earlier folders are only counted as ``duplicate_documents``
+    
+    Outcomes are written to the checkpoint as folders finish.
+    
+    © 2025 Utilyst Inc. All rights reserved.
+    """
+    
+    def __init__(
+        self,
+        factory: CrewFactory,
+        checkpoint: BatchCheckpoint,
+        max_workers: int = 2,
+        report_dir: str = "output/reports/batch",
+        event_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+    ):
+        """
+        Initialize the runner.
+        
+        Args:
+            factory: Crew factory shared by the batch's runs
+            checkpoint: Checkpoint recording finished folders
+            max_workers: Maximum number of folders processed at the same time
+            report_dir: Directory receiving one report per folder
+            event_callback: Receives ``folder_started`` and ``folder_finished``
+                events as an event type and event data
+        """
+        self.factory = factory
+        self.checkpoint = checkpoint
+        self.max_workers = max(1, max_workers)
+        self.report_dir = Path(report_dir)
+        self.event_callback = event_callback
+        
+        self.analysis_memo: Dict[str, str] = {}
+        self._seen_lock = threading.Lock()
+        self._seen_documents: Dict[str, str] = {}
+    
+    def _emit(self, event_type: str, data: Dict[str, Any]) -> None:
+        """Report a progress event to the event callback, if one is set."""
+        if self.event_callback:
+            self.event_callback(event_type, data)
+    
+    def _process_folder(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the crew for one folder and return its outcome."""
+        url = entry['google_drive_url']
+        inputs = {key: value for key, value in entry.items() if key not in RUN_OPTIONS}
+        report_path = str(self.report_dir / f"{folder_key(url)}.md")
+        self._emit('folder_started', {'url': url})
+        
+        execution_mode = entry.get('execution_mode', EXECUTION_SEQUENTIAL)
+        # Only map-reduce analyses can be shared across folders; fan-out needs agents
+        default_analysis_mode = (
+            ANALYSIS_AGENT if execution_mode == EXECUTION_FAN_OUT else ANALYSIS_MAP_REDUCE
+        )
+        
+        start = time.perf_counter()
+        try:
+            with span('batch.folder', url=url):
+                crew_instance = self.factory.create(
+                    incremental=entry.get('incremental', False),
+                    report_path=report_path,
+                    analysis_mode=entry.get('analysis_mode', default_analysis_mode),
+                    execution_mode=execution_mode,
+                    max_concurrency=entry.get('max_concurrency', 8),
+                    analysis_memo=self.analysis_memo
+                )
+                crew_instance.kickoff(inputs=inputs)
+        except Exception as e:
+            return {
+                'status': BATCH_FAILED,
+                'error': str(e),
+                'seconds': round(time.perf_counter() - start, 1),
+                'finished_at': datetime.now(timezone.utc).isoformat()
+            }
+        
+        # Counted after the run: agent-mode analysis cannot skip shared documents
+        files = (crew_instance.google_drive_tool.last_results or {}).get('files', [])
+        hashes = [f['sha256'] for f in files if f['status'] == 'success' and f.get('sha256')]
+        with self._seen_lock:
+            duplicates = sum(1 for sha256 in hashes if sha256 in self._seen_documents)
+            for sha256 in hashes:
+                self._seen_documents.setdefault(sha256, url)
+        
+        return {
+            'status': BATCH_COMPLETED,
+            'report_path': report_path,
+            'documents': len(hashes),
+            'duplicate_documents': duplicates,
+            'downloaded': sum(1 for f in files if f['status'] == 'success' and not f.get('cached')),
+            'seconds': round(time.perf_counter() - start, 1),
+            'finished_at': datetime.now(timezone.utc).isoformat()
+        }
+    
+    def run(self, entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Process every folder not yet completed according to the checkpoint.
+        
+        Args:
+            entries: Manifest entries, as returned by :func:`load_batch_manifest`
+        
+        Returns:
+            Dict: Folder and document counts of this run, ``failures`` by
+            URL, and throughput in ``folders_per_hour`` and ``documents_per_minute``
+        """
+        pending = [e for e in entries if not self.checkpoint.completed(e['google_drive_url'])]
+        outcomes: Dict[str, Dict[str, Any]] = {}
+        start = time.perf_counter()
+        
+        with span('batch', folders=len(pending)), ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="batch", **inherit_span()
+        ) as pool:
+            futures = {pool.submit(self._process_folder, entry): entry for entry in pending}
+            for future in as_completed(futures):
+                url = futures[future]['google_drive_url']
+                outcomes[url] = future.result()
+                self.checkpoint.record(url, outcomes[url])
+                self._emit('folder_finished', {'url': url, **outcomes[url]})
+        
+        elapsed = time.perf_counter() - start
+        completed = [o for o in outcomes.values() if o['status'] == BATCH_COMPLETED]
+        documents = sum(o['documents'] for o in completed)
+        return {
+            'folders': len(entries),
+            'resumed': len(entries) - len(pending),
+            'completed': len(completed),
+            'failed': len(outcomes) - len(completed),
+            'failures': {
+                url: o['error'] for url, o in outcomes.items() if o['status'] == BATCH_FAILED
+            },
+            'documents': documents,
+            'duplicate_documents': sum(o['duplicate_documents'] for o in completed),
+            'downloaded': sum(o['downloaded'] for o in completed),
+            'elapsed_seconds': round(elapsed, 1),
+            'folders_per_hour': round(len(completed) / elapsed * 3600, 1) if elapsed else 0.0,
+            'documents_per_minute': round(documents / elapsed * 60, 1) if elapsed else 0.0
+        }
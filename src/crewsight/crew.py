@@ -6,11 +6,77 @@ Multi-agent orchestration for document processing from public Google Drive folde
 © 2025 Utilyst Inc. All rights reserved.
 """
 
-from crewai import Agent, Crew, Process, Task
+import math
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from crewai import LLM, Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
 from crewai_tools import FileReadTool, SerperDevTool
 
+from src.crewsight.analysis import MapReduceAnalyzer, RequestPacer
+from src.crewsight.extraction import ExtractionPipeline
+from src.crewsight.llm import (
+    CachedLLM,
+    LLMResponseCache,
+    ModelRouter,
+    ProviderRateLimiter,
+    TracedLLM,
+    get_rate_limiter,
+)
+from src.crewsight.retrieval import TroubleshootingIndex, VectorIndex, default_embedder
+from src.crewsight.telemetry import get_tracer, span
+from src.crewsight.tools.document_catalog import DocumentCatalog, DocumentCatalogTool
+from src.crewsight.tools.document_search import DocumentSearchTool
+from src.crewsight.tools.extracted_documents import ExtractedDocumentsTool
+from src.crewsight.tools.map_reduce_analysis import MapReduceAnalysisTool
+from src.crewsight.tools.previous_analyses import PreviousAnalysesTool
 from src.crewsight.tools.public_google_drive_processor import PublicGoogleDriveProcessorTool
+from src.crewsight.tools.sync_manifest import SYNC_UNCHANGED
+
+
+ANALYSIS_AGENT = "agent"
+ANALYSIS_MAP_REDUCE = "map_reduce"
+
+EXECUTION_SEQUENTIAL = "sequential"
+EXECUTION_FAN_OUT = "fan_out"
+
+# Default requests-per-minute budget of batch runs (main.py batch --rpm)
+MAX_RPM = 30
+
+INCREMENTAL_ANALYSIS_NOTE = """
+
+Incremental mode: the flags of the retrieval catalog mark every file as new,
+modified or unchanged. Analyze only the new and modified files; unchanged files were
+analyzed on an earlier run and their analyses are reused during synthesis. Head
+each file's analysis with its file name as a Markdown heading (for example
+"## manuals/pump.pdf"): each section is stored and reused for that file alone.
+If no file is new or modified, reply that there are no changed documents.
+"""
+
+INCREMENTAL_SYNTHESIS_NOTE = """
+
+Incremental mode: use the Previous Analyses Reader tool to retrieve the
+analyses of unchanged documents and integrate them with this run's analysis of
+new and modified documents, preferring this run's findings where they overlap.
+"""
+
+RETRIEVAL_SUMMARY_NOTE = """
+
+The documents were retrieved and extracted in an earlier stage. Retrieval report:
+
+{summary}
+"""
+
+MAP_REDUCE_ANALYSIS_NOTE = """
+
+Map-reduce mode: call the Map-Reduce Document Analyzer tool once with the
+analysis focus. It analyzes every extracted document in token-budgeted chunks
+and returns the cross-document analysis; build the report from it, reading a
+document's own analysis with the tool's document_name argument only where you
+need its details, instead of reading documents one by one.
+"""
 
 
 @CrewBase
@@ -27,11 +93,340 @@ class CrewSightCrew:
     agents_config = 'config/agents.yaml'
     tasks_config = 'config/tasks.yaml'
     
-    def __init__(self):
-        """Initialize the crew with necessary tools and configurations."""
+    def __init__(
+        self,
+        incremental: bool = False,
+        event_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+        report_path: str = 'output/final_report.md',
+        analysis_mode: str = ANALYSIS_AGENT,
+        execution_mode: str = EXECUTION_SEQUENTIAL,
+        max_concurrency: int = 8,
+        llm_cache: Optional[LLMResponseCache] = None,
+        llm_rpm: Optional[int] = None,
+        rate_limiter: Optional[ProviderRateLimiter] = None,
+        router: Optional[ModelRouter] = None,
+        llm_factory: Optional[Callable[[str], LLM]] = None,
+    ):
+        """
+        Initialize the crew with necessary tools and configurations.
+        
+        Args:
+            incremental: Only analyze files that are new or modified since the
+                folder's previous run and reuse the earlier analyses of the rest
+            event_callback: Receives progress events (files listed, download
+                progress, task start/finish with task output) as an event
+                type and event data while the crew runs
+            report_path: Where the synthesized final report is written
+            analysis_mode: ``"agent"`` to let the analyzer read each document
+                itself, or ``"map_reduce"`` to analyze token-budgeted chunks
+                concurrently and reduce them per document and across the
+                folder, for folders too large for one context
+            execution_mode: ``"sequential"`` to run retrieval, analysis and
+                synthesis as single tasks, or ``"fan_out"`` to analyze the
+                retrieved documents in concurrent per-document (or per-batch)
+                tasks that only the synthesis waits for; see :meth:`kickoff`
+            max_concurrency: Maximum number of concurrent analysis tasks in
+                fan-out mode; larger folders are split into this many batches
+            llm_cache: Persistent response cache for the agents' LLM calls;
+                identical requests (model, prompt, temperature) are
+                answered from it, e.g. across test and replay iterations
+            llm_rpm: Requests-per-minute budget shared by every LLM call of
+                this crew and the run crews created from it, e.g. by
+                concurrent batch runs, on top of the provider rate limits
+            rate_limiter: Per-provider limiter adapting to rate-limit errors and
+                headers; the process-wide one (see ``LLM_RATE_LIMITS``) by default
+            router: Chooses the model of each agent and map-reduce stage;
+                configured from ``LLM_FAST_MODEL`` and ``LLM_STRONG_MODEL`` by default
+            llm_factory: Creates the client for a model name instead of the
+                traced (or cached) LiteLLM client, e.g. a stub for benchmarks
+        
+        Downloads, extractions and the search indexes are kept under
+        ``DOWNLOAD_DIRECTORY`` (default ``./downloads``).
+        """
+        # Shared across runs (see CrewFactory): stateless tools and LLM clients
         self.file_read_tool = FileReadTool()
         self.serper_tool = SerperDevTool()
-        self.google_drive_tool = PublicGoogleDriveProcessorTool()
+        self.llms: Dict[str, LLM] = {}
+        self.llm_cache = llm_cache
+        self.llm_pacer = RequestPacer(llm_rpm) if llm_rpm else None
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.router = router or ModelRouter.from_env()
+        self.llm_factory = llm_factory
+        self.google_drive_tool = PublicGoogleDriveProcessorTool(
+            download_dir=os.getenv("DOWNLOAD_DIRECTORY", "./downloads")
+        )
+        self.extraction_pipeline = ExtractionPipeline(
+            output_dir=str(self.google_drive_tool.download_dir / ".extracted")
+        )
+        self.vector_index = VectorIndex(
+            str(self.google_drive_tool.download_dir / ".index"), default_embedder()
+        )
+        self.troubleshooting_index = TroubleshootingIndex(
+            str(self.google_drive_tool.download_dir / ".index" / "troubleshooting.db")
+        )
+        
+        self.configure_run(
+            incremental, event_callback, report_path, analysis_mode, execution_mode, max_concurrency
+        )
+    
+    def configure_run(
+        self,
+        incremental: bool = False,
+        event_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+        report_path: str = 'output/final_report.md',
+        analysis_mode: str = ANALYSIS_AGENT,
+        execution_mode: str = EXECUTION_SEQUENTIAL,
+        max_concurrency: int = 8,
+        analysis_memo: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """
+        Set up the per-run state of the crew.
+        
+        The Drive tool is replaced by a per-run copy that shares the HTTP
+        session and download cache, so runs never see each other's manifest
+        or progress callback. ``analysis_memo`` is shared by the map-reduce
+        analyzers of runs that should analyze identical documents only once,
+        such as the folders of a batch.
+        """
+        if analysis_mode not in (ANALYSIS_AGENT, ANALYSIS_MAP_REDUCE):
+            raise ValueError(f"Unknown analysis mode: {analysis_mode}")
+        if execution_mode not in (EXECUTION_SEQUENTIAL, EXECUTION_FAN_OUT):
+            raise ValueError(f"Unknown execution mode: {execution_mode}")
+        if execution_mode == EXECUTION_FAN_OUT and analysis_mode == ANALYSIS_MAP_REDUCE:
+            raise ValueError(
+                "Map-reduce analysis already runs concurrently; use sequential execution"
+            )
+        
+        self.incremental = incremental
+        self.analysis_mode = analysis_mode
+        self.execution_mode = execution_mode
+        self.max_concurrency = max(1, max_concurrency)
+        self.event_callback = event_callback
+        self.report_path = report_path
+        self.analysis_memo = analysis_memo
+        self._tasks_finished = 0
+        self._tasks_started = 0
+        # Tasks of the crew being run, and how many tasks finished before it
+        self._crew_tasks: List[Task] = []
+        self._crew_task_offset = 0
+        
+        self.google_drive_tool = self.google_drive_tool.for_run(
+            incremental=incremental,
+            progress_callback=event_callback
+        )
+        self.previous_analyses_tool = PreviousAnalysesTool(self.google_drive_tool)
+        self.extracted_documents_tool = ExtractedDocumentsTool()
+        self.document_catalog_tool = DocumentCatalogTool()
+        self.document_search_tool = DocumentSearchTool(self.vector_index)
+        self.map_reduce_tool: Optional[MapReduceAnalysisTool] = None
+    
+    def _client(self, model: str) -> LLM:
+        """Return the shared LLM client for a model."""
+        if model not in self.llms:
+            settings = {'pacer': self.llm_pacer, 'rate_limiter': self.rate_limiter}
+            if self.llm_factory:
+                self.llms[model] = self.llm_factory(model)
+            elif self.llm_cache:
+                self.llms[model] = CachedLLM(model=model, cache=self.llm_cache, **settings)
+            else:
+                self.llms[model] = TracedLLM(model=model, **settings)
+        return self.llms[model]
+    
+    def _llm(self, agent_name: str) -> LLM:
+        """Return the shared LLM client for an agent's routed model."""
+        model = self.agents_config[agent_name]['llm']
+        if isinstance(model, LLM):
+            return model
+        return self._client(self.router.model_for(agent_name, model))
+    
+    def _route_analysis_call(self, stage: str, prompt_tokens: int) -> LLM:
+        """Return the client for a map-reduce stage call; see :class:`ModelRouter`."""
+        analyzer = self._llm('document_analyzer')
+        model = self.router.model_for(stage, analyzer.model, prompt_tokens)
+        return analyzer if model == analyzer.model else self._client(model)
+    
+    def _task_config(self, name: str, incremental_note: str, map_reduce_note: str = "") -> dict:
+        """Return a task's configuration, extended for the enabled run modes."""
+        config = dict(self.tasks_config[name])
+        if self.incremental:
+            config['description'] = config['description'] + incremental_note
+        if self.analysis_mode == ANALYSIS_MAP_REDUCE:
+            config['description'] = config['description'] + map_reduce_note
+        return config
+    
+    def _emit(self, event_type: str, data: Dict[str, Any]) -> None:
+        """Report a progress event to the event callback, if one is set."""
+        if self.event_callback:
+            self.event_callback(event_type, data)
+    
+    @staticmethod
+    def _task_label(name: Optional[str], description: str) -> str:
+        """Return a task's name, or the start of its description for unnamed tasks."""
+        return name or description.strip().split("\n")[0][:80]
+    
+    def _task_name(self, index: int) -> Optional[str]:
+        """Return the name of the running crew's task at run-wide ``index``."""
+        index -= self._crew_task_offset
+        if not 0 <= index < len(self._crew_tasks):
+            return None
+        task = self._crew_tasks[index]
+        return self._task_label(task.name, task.description)
+    
+    def _document_batches(self) -> List[List[str]]:
+        """Split the extracted documents into at most ``max_concurrency`` batches."""
+        documents = [
+            name for name, result in self.extracted_documents_tool.documents.items()
+            if result['status'] == 'success'
+        ]
+        if not documents:
+            return []
+        batch_size = math.ceil(len(documents) / self.max_concurrency)
+        return [documents[i:i + batch_size] for i in range(0, len(documents), batch_size)]
+    
+    def _analysis_branch(self, documents: List[str]) -> Task:
+        """Create an asynchronous analysis task, with its own agent, for a batch of documents."""
+        # Escape braces so document names survive input interpolation
+        listing = "\n".join(
+            "- " + name.replace("{", "{{").replace("}", "}}") for name in documents
+        )
+        config = dict(self.tasks_config['analyze_document_batch'])
+        config['description'] = config['description'].replace("{documents}", listing)
+        return Task(
+            config=config,
+            agent=self._build_document_analyzer(),
+            async_execution=True
+        )
+    
+    def _on_agent_step(self, step) -> None:
+        """Crew step callback: report task starts and intermediate agent output."""
+        if self._tasks_started == self._tasks_finished:
+            self._tasks_started += 1
+            self._emit('task_started', {
+                'task': self._task_name(self._tasks_finished),
+                'index': self._tasks_finished
+            })
+        
+        text = getattr(step, 'output', None) or getattr(step, 'text', None)
+        if text:
+            self._emit('agent_step', {'index': self._tasks_finished, 'text': str(text)})
+    
+    def _on_task_finished(self, output) -> None:
+        """Crew task callback: report the finished task and its output."""
+        self._emit('task_finished', {
+            # Concurrent tasks finish out of order, so name the output itself
+            'task': self._task_label(output.name, output.description),
+            'index': self._tasks_finished,
+            'output': output.raw
+        })
+        self._tasks_finished += 1
+        self._tasks_started = self._tasks_finished
+    
+    def _reporting(self, callback: Callable[[Any], None]) -> Callable[[Any], None]:
+        """
+        Wrap a task's own callback so the task is still reported as finished.
+        
+        crewai only gives tasks without a callback the crew's ``task_callback``.
+        """
+        def task_finished(output) -> None:
+            if self.event_callback:
+                self._on_task_finished(output)
+            callback(output)
+        return task_finished
+    
+    def _extract_documents(self, output) -> None:
+        """
+        Extraction stage between retrieval and analysis.
+        
+        Runs as the retrieval task's callback: parses every downloaded file
+        locally, hands the extracted text to the analyzer's Extracted
+        Document Reader tool and adds it to the vector index behind the
+        Document Search tool and the troubleshooting index answering
+        /api/analyze/issue. In incremental mode unchanged files are skipped.
+        """
+        results = self.google_drive_tool.last_results
+        if results:
+            self.extract_retrieved(results)
+    
+    def extract_retrieved(self, results: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Extract and index the files of a retrieval; see :meth:`_extract_documents`.
+        
+        Args:
+            results: Results of the Drive tool (``last_results``), possibly
+                from another process sharing the download directory
+        
+        Returns:
+            List[Dict]: Extraction results, as from ExtractionPipeline
+        """
+        self._set_catalog(
+            self.google_drive_tool.last_catalog or DocumentCatalog.from_results(results)
+        )
+        files = [
+            f for f in results['files']
+            if f['status'] == 'success' and f.get('sync_status') != SYNC_UNCHANGED
+        ]
+        extraction_results = self.extraction_pipeline.extract_all(
+            files, namespace=results['folder_id']
+        )
+        self.extracted_documents_tool.set_documents(extraction_results)
+        
+        self._emit('documents_extracted', {
+            'total_files': len(extraction_results),
+            'extracted': sum(1 for r in extraction_results if r['status'] == 'success'),
+            'memoized': sum(1 for r in extraction_results if r.get('memoized')),
+            'chars': sum(r.get('chars', 0) for r in extraction_results)
+        })
+        self._index_documents(results['folder_id'], files, extraction_results)
+        return extraction_results
+    
+    def _set_catalog(self, catalog: DocumentCatalog) -> None:
+        """Give the catalog to the agents and limit document search to its files."""
+        self.document_catalog_tool.set_catalog(catalog)
+        # Names as indexed by _index_documents, unchanged files included
+        self.document_search_tool.set_documents(
+            f"{catalog.folder_id}/{record.name}"
+            for record in catalog.records if record.status == 'success'
+        )
+    
+    def _index_documents(self, folder_id: str, files, extraction_results) -> None:
+        """Add extracted documents to the search indexes; already indexed content is skipped."""
+        hashes = {f['name']: f.get('sha256') for f in files}
+        indexed = 0
+        passages = 0
+        with span('indexing', folder_id=folder_id) as current:
+            try:
+                for result in extraction_results:
+                    sha256 = hashes.get(result['file_name'])
+                    if result['status'] != 'success' or not sha256:
+                        continue
+                    document = f"{folder_id}/{result['file_name']}"
+                    text = Path(result['text_path']).read_text(encoding='utf-8')
+                    passages += self.troubleshooting_index.add_document(document, sha256, text)
+                    indexed += self.vector_index.add_document(document, sha256, text)
+            except Exception as e:
+                # Search is an aid to analysis; the run continues without a fresh index
+                current.set(error=str(e))
+                self._emit('indexing_failed', {'error': str(e)})
+                return
+            current.set(chunks_added=indexed, passages_added=passages)
+        
+        self._emit('documents_indexed', {
+            'chunks_added': indexed,
+            'passages_added': passages,
+            **self.vector_index.stats()
+        })
+    
+    def _record_incremental_analysis(self, output) -> None:
+        """Store the analyses of this run's changed files in the folder manifest."""
+        manifest = self.google_drive_tool.last_manifest
+        if manifest is not None:
+            # Map-reduce analyses are per document already
+            if self.map_reduce_tool is not None:
+                for result in self.map_reduce_tool.results.values():
+                    for name, analysis in result['documents'].items():
+                        manifest.record_analysis(analysis, file_name=name)
+            manifest.record_analysis(output.raw)
+            manifest.save()
     
     @agent
     def document_retriever(self) -> Agent:
@@ -45,10 +440,44 @@ class CrewSightCrew:
         """
         return Agent(
             config=self.agents_config['document_retriever'],
+            llm=self._llm('document_retriever'),
             tools=[self.google_drive_tool],
             verbose=True
         )
     
+    def _build_document_analyzer(self) -> Agent:
+        """Create a document analyzer agent; fan-out branches each get their own."""
+        tools = [
+            self.extracted_documents_tool,
+            self.document_catalog_tool,
+            self.document_search_tool,
+            self.file_read_tool,
+            self.serper_tool,
+        ]
+        if self.analysis_mode == ANALYSIS_MAP_REDUCE:
+            analyzer = MapReduceAnalyzer(
+                self._llm('document_analyzer'),
+                # Rate limits are enforced by the LLM clients themselves
+                max_rpm=0,
+                max_concurrency=self.max_concurrency,
+                memo=self.analysis_memo,
+                llm_router=self._route_analysis_call
+            )
+            self.map_reduce_tool = MapReduceAnalysisTool(
+                self.extracted_documents_tool,
+                analyzer,
+                stats_callback=lambda stats: self._emit('analysis_stats', stats),
+                output_dir=str(self.google_drive_tool.download_dir / ".analyses")
+            )
+            tools.insert(0, self.map_reduce_tool)
+        
+        return Agent(
+            config=self.agents_config['document_analyzer'],
+            llm=self._llm('document_analyzer'),
+            tools=tools,
+            verbose=True
+        )
+    
     @agent
     def document_analyzer(self) -> Agent:
         """
@@ -59,11 +488,7 @@ class CrewSightCrew:
         Returns:
             Agent: Configured document analyzer agent
         """
-        return Agent(
-            config=self.agents_config['document_analyzer'],
-            tools=[self.file_read_tool, self.serper_tool],
-            verbose=True
-        )
+        return self._build_document_analyzer()
     
     @agent
     def content_synthesizer(self) -> Agent:
@@ -75,9 +500,14 @@ class CrewSightCrew:
         Returns:
             Agent: Configured content synthesizer agent
         """
+        tools = [self.file_read_tool]
+        if self.incremental:
+            tools.append(self.previous_analyses_tool)
+        
         return Agent(
             config=self.agents_config['content_synthesizer'],
-            tools=[self.file_read_tool],
+            llm=self._llm('content_synthesizer'),
+            tools=tools,
             verbose=True
         )
     
@@ -87,14 +517,16 @@ class CrewSightCrew:
         Retrieve Documents Task
         
         Task for retrieving all accessible documents from the specified
-        Google Drive folder.
+        Google Drive folder. Once it finishes, the downloaded files are
+        extracted to text locally before analysis starts.
         
         Returns:
             Task: Configured document retrieval task
         """
         return Task(
             config=self.tasks_config['retrieve_documents'],
-            agent=self.document_retriever()
+            agent=self.document_retriever(),
+            callback=self._reporting(self._extract_documents)
         )
     
     @task
@@ -103,13 +535,21 @@ class CrewSightCrew:
         Analyze Documents Task
         
         Task for analyzing the content and structure of retrieved documents.
+        In incremental mode only new or modified documents are analyzed; in
+        map-reduce mode the analysis is done by the Map-Reduce Document
+        Analyzer tool.
         
         Returns:
             Task: Configured document analysis task
         """
         return Task(
-            config=self.tasks_config['analyze_documents'],
-            agent=self.document_analyzer()
+            config=self._task_config(
+                'analyze_documents', INCREMENTAL_ANALYSIS_NOTE, MAP_REDUCE_ANALYSIS_NOTE
+            ),
+            agent=self.document_analyzer(),
+            callback=(
+                self._reporting(self._record_incremental_analysis) if self.incremental else None
+            )
         )
     
     @task
@@ -118,15 +558,16 @@ class CrewSightCrew:
         Synthesize Content Task
         
         Task for synthesizing information from multiple documents into
-        a cohesive report.
+        a cohesive report. In incremental mode the analyses of unchanged
+        documents from earlier runs are folded in.
         
         Returns:
             Task: Configured content synthesis task
         """
         return Task(
-            config=self.tasks_config['synthesize_content'],
+            config=self._task_config('synthesize_content', INCREMENTAL_SYNTHESIS_NOTE),
             agent=self.content_synthesizer(),
-            output_file='output/final_report.md'
+            output_file=self.report_path
         )
     
     @crew
@@ -140,15 +581,202 @@ class CrewSightCrew:
         Returns:
             Crew: Fully configured crew ready for execution
         """
-        return Crew(
+        return self._build_crew(
             agents=self.agents,  # Automatically created by the @agent decorator
             tasks=self.tasks,    # Automatically created by the @task decorator
+        )
+    
+    def _build_crew(self, agents: List[Agent], tasks: List[Task]) -> Crew:
+        """Create a crew with this run's shared settings and callbacks."""
+        return Crew(
+            agents=agents,
+            tasks=tasks,
             process=Process.sequential,
             verbose=True,
-            # Optional: Configure memory and planning
-            memory=True,
-            planning=True,
-            # Optional: Add custom configurations
-            manager_llm="gpt-4",  # For hierarchical process
-            max_rpm=30,  # Rate limiting
+            # Optional: Configure memory and planning (both make their own OpenAI calls)
+            memory=os.getenv("CREW_MEMORY", "true").lower() in ("1", "true", "yes"),
+            planning=os.getenv("CREW_PLANNING", "true").lower() in ("1", "true", "yes"),
+            # Rate limits are enforced per provider by the agents' LLM clients
+            # Progress events for streaming clients
+            step_callback=self._on_agent_step if self.event_callback else None,
+            task_callback=self._on_task_finished if self.event_callback else None,
         )
+    
+    def _run_crew(self, crew_instance: Crew, inputs: Dict[str, Any]) -> Any:
+        """Kick off a crew in a ``crew.kickoff`` span, recording its tasks as ``crew.task``."""
+        self._crew_tasks = list(crew_instance.tasks)
+        self._crew_task_offset = self._tasks_finished
+        with span('crew.kickoff', tasks=len(crew_instance.tasks)):
+            try:
+                return crew_instance.kickoff(inputs=inputs)
+            finally:
+                for crew_task in crew_instance.tasks:
+                    start = getattr(crew_task, 'start_time', None)
+                    end = getattr(crew_task, 'end_time', None)
+                    if start and end:
+                        get_tracer().record(
+                            'crew.task',
+                            (end - start).total_seconds(),
+                            start=start.timestamp(),
+                            task=crew_task.name,
+                            agent=crew_task.agent.role if crew_task.agent else None
+                        )
+    
+    def kickoff(self, inputs: Dict[str, Any]) -> Any:
+        """
+        Run the crew in the configured execution mode.
+        
+        Sequential mode kicks off :meth:`crew` as is. Fan-out mode first
+        runs retrieval (and extraction) on its own, then creates one
+        asynchronous analysis task per document, or per batch when there are
+        more documents than ``max_concurrency``, and runs them concurrently
+        with the synthesis task as the only one waiting for all of them.
+        The run is traced as a ``crew.run`` span.
+        
+        Args:
+            inputs: Crew inputs, e.g. ``google_drive_url`` and ``analysis_focus``
+        
+        Returns:
+            CrewOutput: Output of the final task
+        """
+        with span(
+            'crew.run',
+            execution_mode=self.execution_mode,
+            analysis_mode=self.analysis_mode,
+            incremental=self.incremental
+        ):
+            if self.execution_mode == EXECUTION_SEQUENTIAL:
+                result = self._run_crew(self.crew(), inputs)
+            else:
+                result = self._kickoff_fan_out(inputs)
+        
+        if self.llm_cache:
+            self._emit('llm_cache', self.llm_cache.stats())
+        return result
+    
+    def troubleshoot(self, issue: Dict[str, Any]) -> Any:
+        """
+        Answer an equipment issue with a single analyzer agent.
+        
+        The fallback for issues the troubleshooting index cannot answer; the
+        agent searches the indexed manuals with the Document Search tool.
+        
+        Args:
+            issue: ``issue_description``, ``equipment_type`` and ``error_code``
+        
+        Returns:
+            CrewOutput: The troubleshooting answer
+        """
+        inputs = {
+            'issue_description': issue['issue_description'],
+            'equipment_type': issue.get('equipment_type') or "unspecified",
+            'error_code': issue.get('error_code') or "none reported"
+        }
+        analyzer = self._build_document_analyzer()
+        task = Task(config=dict(self.tasks_config['troubleshoot_issue']), agent=analyzer)
+        return self._run_crew(self._build_crew([analyzer], [task]), inputs)
+    
+    def analyze_image(self, image_path: str, issue_description: Optional[str] = None) -> Any:
+        """
+        Analyze an uploaded equipment photo with a multimodal analyzer agent.
+        
+        Args:
+            image_path: Path of the downscaled image
+            issue_description: What the technician reports, if anything
+        
+        Returns:
+            CrewOutput: The image analysis
+        """
+        analyzer = Agent(
+            config=self.agents_config['document_analyzer'],
+            llm=self._llm('document_analyzer'),
+            tools=[self.document_search_tool],
+            multimodal=True,
+            verbose=True
+        )
+        task = Task(config=dict(self.tasks_config['analyze_equipment_image']), agent=analyzer)
+        return self._run_crew(self._build_crew([analyzer], [task]), {
+            'image_path': image_path,
+            'issue_description': issue_description or "not provided"
+        })
+    
+    def analyze_extracted(
+        self,
+        inputs: Dict[str, Any],
+        retrieval_summary: str,
+        extraction_results: List[Dict[str, Any]],
+        catalog_path: Optional[str] = None,
+    ) -> Any:
+        """
+        Run analysis and synthesis on documents retrieved and extracted earlier.
+        
+        The last stage of a run split across distributed workers: the
+        retrieval report replaces the retrieval task's output as context.
+        
+        Args:
+            inputs: Crew inputs, e.g. ``google_drive_url`` and ``analysis_focus``
+            retrieval_summary: Report returned by the Drive tool
+            extraction_results: Results of :meth:`extract_retrieved`
+            catalog_path: Catalog written by the retrieval, for the Document
+                Catalog tool
+        
+        Returns:
+            CrewOutput: Output of the synthesis task
+        """
+        self.extracted_documents_tool.set_documents(extraction_results)
+        if catalog_path:
+            self._set_catalog(DocumentCatalog.load(catalog_path))
+        config = self._task_config(
+            'analyze_documents', INCREMENTAL_ANALYSIS_NOTE, MAP_REDUCE_ANALYSIS_NOTE
+        )
+        # Escape braces so the report survives input interpolation
+        config['description'] += RETRIEVAL_SUMMARY_NOTE.format(
+            summary=retrieval_summary.replace("{", "{{").replace("}", "}}")
+        )
+        analysis = Task(config=config, agent=self.document_analyzer())
+        synthesis = Task(
+            config=self._task_config('synthesize_content', INCREMENTAL_SYNTHESIS_NOTE),
+            agent=self.content_synthesizer(),
+            context=[analysis],
+            output_file=self.report_path
+        )
+        with span('crew.run', execution_mode='distributed', analysis_mode=self.analysis_mode):
+            return self._run_crew(
+                self._build_crew([analysis.agent, synthesis.agent], [analysis, synthesis]), inputs
+            )
+    
+    def _kickoff_fan_out(self, inputs: Dict[str, Any]) -> Any:
+        """Run retrieval, then the concurrent analysis branches and the synthesis."""
+        retrieval = self.retrieve_documents_task()
+        self._run_crew(self._build_crew([self.document_retriever()], [retrieval]), inputs)
+        
+        batches = self._document_batches()
+        branches = [self._analysis_branch(batch) for batch in batches]
+        self._emit('analysis_fan_out', {
+            'branches': len(branches),
+            'documents': sum(
+                1 for r in self.extracted_documents_tool.documents.values()
+                if r['status'] == 'success'
+            )
+        })
+        
+        synthesis = Task(
+            config=self._task_config('synthesize_content', INCREMENTAL_SYNTHESIS_NOTE),
+            agent=self.content_synthesizer(),
+            context=[retrieval, *branches],
+            output_file=self.report_path
+        )
+        result = self._run_crew(self._build_crew(
+            [*(branch.agent for branch in branches), self.content_synthesizer()],
+            [*branches, synthesis],
+        ), inputs)
+        
+        manifest = self.google_drive_tool.last_manifest
+        if self.incremental and manifest is not None and branches:
+            for batch, branch in zip(batches, branches):
+                manifest.record_analysis(
+                    branch.output.raw, file_name=batch[0] if len(batch) == 1 else None
+                )
+            manifest.save()
+        
+        return result
@@ -0,0 +1,19 @@
+"""
+CrewSight-AI Document Extraction
+
+© 2025 Utilyst Inc. All rights reserved.
+"""
+
+from src.crewsight.extraction.memo import ExtractionMemo
+from src.crewsight.extraction.parsers import PARSER_VERSION, PARSERS, normalize_text
+from src.crewsight.extraction.pipeline import ExtractionPipeline, extract_document, render_document
+
+__all__ = [
+    "PARSERS",
+    "PARSER_VERSION",
+    "ExtractionMemo",
+    "ExtractionPipeline",
+    "extract_document",
+    "normalize_text",
+    "render_document",
+]
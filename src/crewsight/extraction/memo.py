@@ -0,0 +1,106 @@
+"""
+Extraction Memo
+
+Persistent memo of extraction results keyed by document content hash.
+
+© 2025 Utilyst Inc. All rights reserved.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from src.crewsight.extraction.parsers import PARSER_VERSION
+
+
+class ExtractionMemo:
+    """
+    SQLite-backed memo of parsed documents.
+    
+    Entries are keyed by the SHA-256 of the file contents together with the
+    parser version, file type and extraction limits, so the same file is
+    parsed once no matter how many runs or folders it appears in. The total
+    stored size is bounded with least-recently-used eviction.
+    
+    © 2025 Utilyst Inc. All rights reserved.
+    """
+    
+    def __init__(self, db_path: str, max_bytes: int = 512 * 1024 ** 2):
+        """
+        Open (and create if needed) the memo database.
+        
+        Args:
+            db_path: Path of the SQLite database
+            max_bytes: Upper bound on the total size of memoized results
+        """
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS memo (
+                key TEXT PRIMARY KEY,
+                extracted TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS memo_last_used ON memo (last_used)")
+        self._db.commit()
+        
+        self._hits = 0
+        self._misses = 0
+    
+    @staticmethod
+    def key(sha256: str, file_type: str, max_pages: int, max_rows: int) -> str:
+        """Build the memo key for a document and its extraction settings."""
+        return f"{sha256}:{file_type}:{PARSER_VERSION}:{max_pages}:{max_rows}"
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the memoized extraction for a key, or None on a miss."""
+        with self._lock:
+            row = self._db.execute("SELECT extracted FROM memo WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self._misses += 1
+                return None
+            
+            self._db.execute("UPDATE memo SET last_used = ? WHERE key = ?", (time.time(), key))
+            self._db.commit()
+            self._hits += 1
+        return json.loads(row[0])
+    
+    def put(self, key: str, extracted: Dict[str, Any]) -> None:
+        """Memoize a successful extraction and evict old entries if over budget."""
+        payload = json.dumps(extracted)
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO memo (key, extracted, size, last_used) VALUES (?, ?, ?, ?)",
+                (key, payload, len(payload), time.time()),
+            )
+            self._evict()
+            self._db.commit()
+    
+    def _evict(self) -> None:
+        """Delete least recently used entries until the memo fits ``max_bytes``."""
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM memo").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        
+        for key, size in self._db.execute(
+            "SELECT key, size FROM memo ORDER BY last_used ASC"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            self._db.execute("DELETE FROM memo WHERE key = ?", (key,))
+            total -= size
+    
+    def stats(self) -> Dict[str, int]:
+        """Return hit and miss counters."""
+        with self._lock:
+            return {'hits': self._hits, 'misses': self._misses}
@@ -0,0 +1,153 @@
+"""
+Document Parsers
+
+Local text and table extraction for the document types retrieved from Google Drive.
+
+© 2025 Utilyst Inc. All rights reserved.
+"""
+
+import csv
+import re
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+
+Table = List[List[str]]
+
+# Bump whenever parser output changes so memoized extractions are not reused
+PARSER_VERSION = "1"
+
+
+def normalize_text(text: str) -> str:
+    """Collapse runs of spaces and blank lines and strip each line."""
+    lines = [re.sub(r'[ \t\u00a0]+', ' ', line).strip() for line in text.splitlines()]
+    return re.sub(r'\n{3,}', '\n\n', '\n'.join(lines)).strip()
+
+
+def _cell(value: Any) -> str:
+    """Render a table cell value as normalized text."""
+    return '' if value is None else normalize_text(str(value)).replace('\n', ' ')
+
+
+def parse_pdf(path: Path, max_pages: int, max_rows: int) -> Dict[str, Any]:
+    """Extract text from the first ``max_pages`` pages of a PDF."""
+    from PyPDF2 import PdfReader
+    
+    reader = PdfReader(str(path))
+    pages = reader.pages[:max_pages]
+    text = '\n\n'.join(page.extract_text() or '' for page in pages)
+    
+    return {
+        'text': normalize_text(text),
+        'tables': [],
+        'metadata': {'pages': len(reader.pages), 'pages_extracted': len(pages)}
+    }
+
+
+def parse_docx(path: Path, max_pages: int, max_rows: int) -> Dict[str, Any]:
+    """Extract paragraphs and tables from a Word document."""
+    import docx
+    
+    document = docx.Document(str(path))
+    text = '\n'.join(paragraph.text for paragraph in document.paragraphs)
+    tables = [
+        [[_cell(cell.text) for cell in row.cells] for row in table.rows[:max_rows]]
+        for table in document.tables
+    ]
+    
+    return {
+        'text': normalize_text(text),
+        'tables': tables,
+        'metadata': {'paragraphs': len(document.paragraphs), 'tables': len(tables)}
+    }
+
+
+def parse_xlsx(path: Path, max_pages: int, max_rows: int) -> Dict[str, Any]:
+    """Extract every sheet of a workbook as a table of cell values."""
+    import openpyxl
+    
+    workbook = openpyxl.load_workbook(str(path), read_only=True, data_only=True)
+    try:
+        tables = []
+        for sheet in workbook.worksheets[:max_pages]:
+            rows = []
+            for row in sheet.iter_rows(values_only=True):
+                if len(rows) >= max_rows:
+                    break
+                if any(value is not None for value in row):
+                    rows.append([_cell(value) for value in row])
+            tables.append(rows)
+        sheet_names = workbook.sheetnames
+    finally:
+        workbook.close()
+    
+    return {
+        'text': '\n'.join(f"Sheet: {name}" for name in sheet_names[:max_pages]),
+        'tables': tables,
+        'metadata': {'sheets': len(sheet_names), 'sheets_extracted': len(tables)}
+    }
+
+
+def parse_pptx(path: Path, max_pages: int, max_rows: int) -> Dict[str, Any]:
+    """Extract the text and tables of the first ``max_pages`` slides."""
+    from pptx import Presentation
+    
+    presentation = Presentation(str(path))
+    slides = list(presentation.slides)
+    sections = []
+    tables = []
+    for number, slide in enumerate(slides[:max_pages], start=1):
+        texts = []
+        for shape in slide.shapes:
+            if shape.has_text_frame:
+                texts.append(shape.text_frame.text)
+            if getattr(shape, 'has_table', False) and shape.has_table:
+                tables.append([
+                    [_cell(cell.text) for cell in row.cells]
+                    for row in list(shape.table.rows)[:max_rows]
+                ])
+        sections.append(f"Slide {number}\n" + '\n'.join(texts))
+    
+    return {
+        'text': normalize_text('\n\n'.join(sections)),
+        'tables': tables,
+        'metadata': {'slides': len(slides), 'slides_extracted': min(len(slides), max_pages)}
+    }
+
+
+def parse_csv(path: Path, max_pages: int, max_rows: int) -> Dict[str, Any]:
+    """Read up to ``max_rows`` rows of a CSV file as a table."""
+    rows = []
+    with open(path, newline='', encoding='utf-8', errors='replace') as f:
+        for row in csv.reader(f):
+            if len(rows) >= max_rows:
+                break
+            rows.append([_cell(value) for value in row])
+    
+    return {
+        'text': '',
+        'tables': [rows],
+        'metadata': {'rows_extracted': len(rows)}
+    }
+
+
+def parse_text(path: Path, max_pages: int, max_rows: int) -> Dict[str, Any]:
+    """Read a plain text file."""
+    text = path.read_text(encoding='utf-8', errors='replace')
+    
+    return {
+        'text': normalize_text(text),
+        'tables': [],
+        'metadata': {'lines': text.count('\n') + 1}
+    }
+
+
+# Keyed by the file type names of PublicGoogleDriveProcessorTool._get_file_type
+PARSERS: Dict[str, Callable[[Path, int, int], Dict[str, Any]]] = {
+    'PDF': parse_pdf,
+    'Word Document': parse_docx,
+    'Excel Spreadsheet': parse_xlsx,
+    'PowerPoint': parse_pptx,
+    'CSV File': parse_csv,
+    'Text File': parse_text,
+}
@@ -0,0 +1,264 @@
+"""
+Extraction Pipeline
+
+Parallel local extraction of downloaded documents into normalized text and tables.
+
+© 2025 Utilyst Inc. All rights reserved.
+"""
+
+import hashlib
+import os
+import re
+import signal
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.crewsight.extraction.memo import ExtractionMemo
+from src.crewsight.extraction.parsers import PARSERS
+from src.crewsight.telemetry import get_tracer, span
+
+
+class ExtractionTimeout(Exception):
+    """Raised inside a worker when a document takes longer than its time budget."""
+
+
+def _raise_timeout(signum, frame):
+    raise ExtractionTimeout()
+
+
+def extract_document(
+    file_path: str,
+    file_type: str,
+    max_pages: int,
+    max_rows: int,
+    timeout: float,
+) -> Dict[str, Any]:
+    """
+    Extract one document. Runs inside a worker process.
+    
+    The time budget is enforced with ``SIGALRM`` where available so that a
+    pathological file cannot occupy a worker indefinitely.
+    
+    Returns:
+        Dict: ``status`` plus ``text``, ``tables`` and ``metadata`` on
+        success, or ``error`` on failure
+    """
+    parser = PARSERS.get(file_type)
+    if parser is None:
+        return {'status': 'skipped', 'error': f"No parser for file type: {file_type}"}
+    
+    use_alarm = (
+        hasattr(signal, 'setitimer')
+        and threading.current_thread() is threading.main_thread()
+    )
+    if use_alarm:
+        previous_handler = signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    
+    start = time.perf_counter()
+    try:
+        extracted = parser(Path(file_path), max_pages, max_rows)
+    except ExtractionTimeout:
+        return {'status': 'failed', 'error': f"Extraction timed out after {timeout}s"}
+    except Exception as e:
+        return {'status': 'failed', 'error': f"{type(e).__name__}: {e}"}
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous_handler)
+    
+    extracted['status'] = 'success'
+    extracted['seconds'] = round(time.perf_counter() - start, 3)
+    return extracted
+
+
+def render_document(extracted: Dict[str, Any]) -> str:
+    """Render extracted text and tables as a single plain-text document."""
+    parts = [extracted['text']] if extracted.get('text') else []
+    for number, table in enumerate(extracted.get('tables', []), start=1):
+        rows = '\n'.join(' | '.join(row) for row in table)
+        parts.append(f"[Table {number}]\n{rows}")
+    return '\n\n'.join(parts)
+
+
+class ExtractionPipeline:
+    """
+    Converts downloaded files to normalized text on a process pool.
+    
+    Each supported file (PDF, DOCX, XLSX, PPTX, CSV, TXT) is parsed in a
+    worker process with a per-file timeout and page/row limits, and the
+    result is written as plain text under ``output_dir`` for the analysis
+    stage to read. Files with a known ``sha256`` are looked up in the
+    extraction memo first and only parsed on a miss. Batches are traced as
+    ``extraction.batch`` spans and every parsed file as ``extraction.document``.
+    
+    © 2025 Utilyst Inc. All rights reserved.
+    """
+    
+    def __init__(
+        self,
+        output_dir: str = "./downloads/.extracted",
+        max_workers: Optional[int] = None,
+        timeout: float = 60.0,
+        max_pages: int = 200,
+        max_rows: int = 2000,
+        use_memo: bool = True,
+        memo_max_bytes: int = 512 * 1024 ** 2,
+    ):
+        """
+        Initialize the pipeline.
+        
+        Args:
+            output_dir: Directory where extracted text files are written
+            max_workers: Worker processes; defaults to the number of CPUs
+            timeout: Seconds allowed per document
+            max_pages: Maximum PDF pages, slides or sheets parsed per document
+            max_rows: Maximum table rows kept per table or sheet
+            use_memo: Memoize extractions by content hash in
+                ``output_dir/memo.db``
+            memo_max_bytes: Maximum total size of memoized extractions
+        """
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.max_pages = max_pages
+        self.max_rows = max_rows
+        self.memo = (
+            ExtractionMemo(str(self.output_dir / "memo.db"), max_bytes=memo_max_bytes)
+            if use_memo else None
+        )
+        
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+    
+    def _executor(self) -> ProcessPoolExecutor:
+        """Return the worker pool, starting it on first use."""
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._pool
+    
+    def _output_path(self, file_info: Dict[str, Any], namespace: str) -> Path:
+        """
+        Return the path of the extracted text for a downloaded file.
+        
+        Sanitizing maps different names to one ("a/b.pdf", "a b.pdf" and
+        "a_b.pdf"), so the file's Drive ID, or a digest of its name when it
+        has none, is added to keep every file's text apart.
+        """
+        output_dir = self.output_dir / namespace if namespace else self.output_dir
+        output_dir.mkdir(parents=True, exist_ok=True)
+        name = re.sub(r'[^\w.-]', '_', file_info['name'])
+        key = file_info.get('id') or hashlib.sha256(file_info['name'].encode('utf-8')).hexdigest()
+        key = re.sub(r'[^\w-]', '_', key)[:32]
+        return output_dir / f"{name}-{key}.txt"
+    
+    def extract_all(
+        self,
+        files: List[Dict[str, Any]],
+        namespace: str = "",
+    ) -> List[Dict[str, Any]]:
+        """
+        Extract a batch of downloaded files.
+        
+        Args:
+            files: File records with ``name``, ``type`` and ``file_path``, as
+                produced by PublicGoogleDriveProcessorTool
+            namespace: Subdirectory of ``output_dir`` for this batch, e.g.
+                the Drive folder ID
+        
+        Returns:
+            List[Dict]: One result per file, in input order, with ``status``,
+            ``file_name`` and, on success, ``text_path``, ``chars``,
+            ``tables`` and ``metadata``
+        """
+        with span('extraction.batch', files=len(files)) as current:
+            results = self._extract_all(files, namespace)
+            current.set(
+                extracted=sum(1 for r in results if r['status'] == 'success'),
+                memoized=sum(1 for r in results if r.get('memoized'))
+            )
+            return results
+    
+    def _extract_all(self, files: List[Dict[str, Any]], namespace: str) -> List[Dict[str, Any]]:
+        """Extract a batch of files; see :meth:`extract_all`."""
+        memo_keys: List[Optional[str]] = []
+        memoized: List[Optional[Dict[str, Any]]] = []
+        futures = []
+        for file_info in files:
+            file_type = file_info.get('type', 'Unknown')
+            memo_key = (
+                ExtractionMemo.key(file_info['sha256'], file_type, self.max_pages, self.max_rows)
+                if self.memo and file_info.get('sha256') else None
+            )
+            memo_keys.append(memo_key)
+            memoized.append(self.memo.get(memo_key) if memo_key else None)
+            
+            futures.append(
+                None if memoized[-1] is not None else self._executor().submit(
+                    extract_document,
+                    file_info['file_path'],
+                    file_type,
+                    self.max_pages,
+                    self.max_rows,
+                    self.timeout,
+                )
+            )
+        
+        results = []
+        for file_info, memo_key, extracted, future in zip(files, memo_keys, memoized, futures):
+            if future is not None:
+                try:
+                    # Workers enforce the timeout themselves; this is a backstop
+                    extracted = future.result(timeout=self.timeout + 5)
+                except FutureTimeoutError:
+                    future.cancel()
+                    extracted = {
+                        'status': 'failed',
+                        'error': f"Extraction timed out after {self.timeout}s"
+                    }
+                except Exception as e:
+                    extracted = {'status': 'failed', 'error': f"{type(e).__name__}: {e}"}
+                
+                if memo_key and extracted['status'] == 'success':
+                    self.memo.put(memo_key, extracted)
+                get_tracer().record(
+                    'extraction.document',
+                    extracted.get('seconds', 0.0),
+                    file_type=file_info.get('type', 'Unknown'),
+                    status=extracted['status'],
+                    error=extracted.get('error')
+                )
+            
+            result = {
+                'file_name': file_info['name'],
+                'status': extracted['status'],
+                'memoized': future is None
+            }
+            if extracted['status'] == 'success':
+                text_path = self._output_path(file_info, namespace)
+                text = render_document(extracted)
+                text_path.write_text(text, encoding='utf-8')
+                result.update({
+                    'text_path': str(text_path),
+                    'chars': len(text),
+                    'tables': len(extracted['tables']),
+                    'metadata': extracted['metadata'],
+                    'seconds': extracted['seconds']
+                })
+            else:
+                result['error'] = extracted['error']
+            results.append(result)
+        
+        return results
+    
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
+                self._pool = None
@@ -0,0 +1,110 @@
+"""
+CrewSight-AI Crew Factory
+
+Hands out per-run CrewSightCrew instances built from a warm template.
+
+© 2025 Utilyst Inc. All rights reserved.
+"""
+
+import copy
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from crewai import LLM
+
+from src.crewsight.crew import ANALYSIS_AGENT, EXECUTION_SEQUENTIAL, CrewSightCrew
+from src.crewsight.llm import LLMResponseCache
+
+
+class CrewFactory:
+    """
+    Factory for cheap, isolated per-run crews.
+    
+    Building a CrewSightCrew parses the agent and task YAML configurations
+    and instantiates every tool. The factory does this once for a template
+    crew; each run then gets a shallow copy that shares the parsed configs,
+    stateless tools, LLM clients, HTTP session and download cache, with
+    only the per-run state (Drive tool copy, callbacks, report path) rebuilt.
+    
+    © 2025 Utilyst Inc. All rights reserved.
+    """
+    
+    def __init__(
+        self,
+        llm_cache: Optional[LLMResponseCache] = None,
+        llm_rpm: Optional[int] = None,
+        llm_factory: Optional[Callable[[str], LLM]] = None,
+    ):
+        """
+        Build the template crew.
+        
+        Args:
+            llm_cache: Response cache shared by every crew's LLM clients
+            llm_rpm: Requests-per-minute budget shared by every crew's LLM calls
+            llm_factory: Creates the LLM client for a model name, e.g. a stub
+        """
+        self._template = CrewSightCrew(
+            llm_cache=llm_cache, llm_rpm=llm_rpm, llm_factory=llm_factory
+        )
+    
+    @property
+    def template(self) -> CrewSightCrew:
+        """The template crew, whose shared tools and clients every run's crew uses."""
+        return self._template
+    
+    def create(
+        self,
+        incremental: bool = False,
+        event_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+        report_path: str = 'output/final_report.md',
+        analysis_mode: str = ANALYSIS_AGENT,
+        execution_mode: str = EXECUTION_SEQUENTIAL,
+        max_concurrency: int = 8,
+        analysis_memo: Optional[Dict[str, str]] = None,
+    ) -> CrewSightCrew:
+        """
+        Return a crew for a single run.
+        
+        Accepts the same arguments as CrewSightCrew.
+        """
+        crew_instance = copy.copy(self._template)
+        crew_instance.configure_run(
+            incremental,
+            event_callback,
+            report_path,
+            analysis_mode,
+            execution_mode,
+            max_concurrency,
+            analysis_memo,
+        )
+        return crew_instance
+
+
+_default_factory: Optional[CrewFactory] = None
+_default_factory_lock = threading.Lock()
+
+
+def get_crew_factory() -> CrewFactory:
+    """
+    Return the process-wide crew factory, creating it on first use.
+    
+    The LLM response cache is enabled with the ``LLM_CACHE`` environment variable.
+    """
+    global _default_factory
+    with _default_factory_lock:
+        if _default_factory is None:
+            _default_factory = CrewFactory(llm_cache=LLMResponseCache.from_env())
+        return _default_factory
+
+
+def configure_crew_factory(factory: Optional[CrewFactory]) -> None:
+    """
+    Replace the process-wide crew factory, e.g. with one using stub LLMs.
+    
+    Args:
+        factory: Factory returned by :func:`get_crew_factory` from now on;
+            None to create the default one again on next use
+    """
+    global _default_factory
+    with _default_factory_lock:
+        _default_factory = factory
@@ -0,0 +1,21 @@
+"""
+CrewSight-AI LLM Clients
+
+© 2025 Utilyst Inc. All rights reserved.
+"""
+
+from src.crewsight.llm.cached_llm import CachedLLM
+from src.crewsight.llm.rate_limiter import ProviderRateLimiter, TokenBucket, get_rate_limiter
+from src.crewsight.llm.response_cache import LLMResponseCache
+from src.crewsight.llm.router import ModelRouter
+from src.crewsight.llm.traced_llm import TracedLLM
+
+__all__ = [
+    "CachedLLM",
+    "LLMResponseCache",
+    "ModelRouter",
+    "ProviderRateLimiter",
+    "TokenBucket",
+    "TracedLLM",
+    "get_rate_limiter",
+]
@@ -0,0 +1,51 @@
+"""
+Cached LLM
+
+crewai LLM client that serves repeated requests from an LLMResponseCache.
+
+© 2025 Utilyst Inc. All rights reserved.
+"""
+
+from typing import Any, List, Optional
+
+from src.crewsight.llm.response_cache import LLMResponseCache
+from src.crewsight.llm.traced_llm import TracedLLM
+
+
+class CachedLLM(TracedLLM):
+    """
+    LLM client backed by a persistent response cache.
+    
+    Requests are looked up by model, messages, temperature and stop words;
+    crewai describes an agent's tools in the prompt itself. Only calls that
+    reach the model are paced, rate-limited and traced.
+    
+    © 2025 Utilyst Inc. All rights reserved.
+    """
+    
+    def __init__(self, model: str, cache: LLMResponseCache, **kwargs: Any):
+        """
+        Initialize the client.
+        
+        Args:
+            model: Model name, as for ``crewai.LLM``
+            cache: Response cache shared by the crew's clients
+            **kwargs: Further TracedLLM and ``crewai.LLM`` settings, e.g.
+                ``rate_limiter`` or ``temperature``
+        """
+        super().__init__(model=model, **kwargs)
+        self.cache = cache
+    
+    def call(self, messages: Any, callbacks: Optional[List[Any]] = None) -> Any:
+        """Return the cached response for a request, calling the model on a miss."""
+        key = LLMResponseCache.key(
+            self.model, messages, getattr(self, 'temperature', None), getattr(self, 'stop', None)
+        )
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        
+        response = super().call(messages, callbacks=callbacks)
+        if isinstance(response, str) and response:
+            self.cache.put(key, self.model, response)
+        return response
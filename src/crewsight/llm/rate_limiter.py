@@ -0,0 +1,379 @@
+"""
+Provider Rate Limiter
+
+Process-wide, per-provider token buckets for LLM requests and tokens that
+adapt to rate-limit errors and rate-limit response headers.
+
+© 2025 Utilyst Inc. All rights reserved.
+"""
+
+import os
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+
+# Requests and tokens per minute per provider, overridable with LLM_RATE_LIMITS
+DEFAULT_PROVIDER_LIMITS: Dict[str, Tuple[int, Optional[int]]] = {
+    'openai': (500, 200_000),
+    'anthropic': (50, 40_000),
+}
+DEFAULT_LIMIT: Tuple[int, Optional[int]] = (60, None)
+
+# Response headers reporting limits, remaining quota and reset times
+LIMIT_HEADERS = {
+    'requests': (
+        ('x-ratelimit-limit-requests', 'anthropic-ratelimit-requests-limit'),
+        ('x-ratelimit-remaining-requests', 'anthropic-ratelimit-requests-remaining'),
+        ('x-ratelimit-reset-requests', 'anthropic-ratelimit-requests-reset'),
+    ),
+    'tokens': (
+        ('x-ratelimit-limit-tokens', 'anthropic-ratelimit-tokens-limit'),
+        ('x-ratelimit-remaining-tokens', 'anthropic-ratelimit-tokens-remaining'),
+        ('x-ratelimit-reset-tokens', 'anthropic-ratelimit-tokens-reset'),
+    ),
+}
+
+
+def _seconds(value: Any) -> Optional[float]:
+    """
+    Parse a reset or retry delay: seconds, a duration such as ``6m0s`` or
+    ``20ms``, or an ISO 8601 or HTTP date.
+    """
+    if value is None:
+        return None
+    text = str(value).strip()
+    try:
+        return max(0.0, float(text))
+    except ValueError:
+        pass
+    
+    units = {'ms': 0.001, 's': 1.0, 'm': 60.0, 'h': 3600.0}
+    parts = re.findall(r'(\d+(?:\.\d+)?)(ms|h|m|s)', text)
+    if parts and ''.join(number + unit for number, unit in parts) == text:
+        return sum(float(number) * units[unit] for number, unit in parts)
+    
+    try:
+        moment = datetime.fromisoformat(text.replace('Z', '+00:00'))
+    except ValueError:
+        try:
+            moment = parsedate_to_datetime(text)
+        except (TypeError, ValueError):
+            return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return max(0.0, (moment - datetime.now(timezone.utc)).total_seconds())
+
+
+def _number(value: Any) -> Optional[float]:
+    """Parse a numeric header value, or return None."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """Return whether an LLM client error is an HTTP 429 rate-limit response."""
+    return getattr(error, 'status_code', None) == 429 or type(error).__name__ == 'RateLimitError'
+
+
+def error_headers(error: BaseException) -> Dict[str, str]:
+    """Return the lowercased response headers attached to an LLM client error."""
+    headers = getattr(error, 'litellm_response_headers', None)
+    if headers is None:
+        headers = getattr(getattr(error, 'response', None), 'headers', None)
+    return {str(name).lower(): value for name, value in dict(headers or {}).items()}
+
+
+class TokenBucket:
+    """
+    Request and token buckets for one provider.
+    
+    Both buckets refill continuously at the configured per-minute rates,
+    scaled by an adaptive factor: a rate-limit error halves it (down to
+    ``min_scale``) and every successful call restores ``recovery`` of it, so
+    the request rate settles just below the provider's actual limit. A
+    request larger than the token bucket waits for a full bucket and leaves
+    it in debt. Rate-limit headers replace the configured limits with the
+    provider's, and exhausted quotas or ``retry-after`` block the bucket
+    until they reset.
+    
+    © 2025 Utilyst Inc. All rights reserved.
+    """
+    
+    def __init__(
+        self,
+        rpm: int,
+        tpm: Optional[int] = None,
+        burst_seconds: float = 6.0,
+        min_scale: float = 0.1,
+        recovery: float = 0.05,
+    ):
+        """
+        Initialize the buckets, full.
+        
+        Args:
+            rpm: Requests per minute
+            tpm: Tokens per minute; None for no token limit
+            burst_seconds: Seconds of quota that may be spent at once
+            min_scale: Lowest fraction of the limits that throttling may reach
+            recovery: Fraction of the limits restored after each successful call
+        """
+        self.rpm = max(1, rpm)
+        self.tpm = tpm
+        self.burst_seconds = burst_seconds
+        self.min_scale = min_scale
+        self.recovery = recovery
+        self.scale = 1.0
+        self.throttled = 0
+        
+        self._lock = threading.Lock()
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._requests = self._capacity(self.rpm)
+        self._tokens = self._capacity(self.tpm) if self.tpm else 0.0
+    
+    def _capacity(self, per_minute: float) -> float:
+        """Burst capacity of a bucket refilled at ``per_minute``."""
+        return max(1.0, per_minute * self.scale * self.burst_seconds / 60.0)
+    
+    def _refill(self, now: float) -> None:
+        """Add the quota accrued since the last update."""
+        elapsed = now - self._updated
+        self._updated = now
+        self._requests = min(
+            self._capacity(self.rpm), self._requests + elapsed * self.rpm * self.scale / 60.0
+        )
+        if self.tpm:
+            self._tokens = min(
+                self._capacity(self.tpm), self._tokens + elapsed * self.tpm * self.scale / 60.0
+            )
+    
+    def acquire(self, tokens: int = 0) -> float:
+        """
+        Block until a request of ``tokens`` input tokens fits the quota, then take it.
+        
+        Returns:
+            float: Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                wait = self._blocked_until - now
+                if wait <= 0:
+                    wait = (1.0 - self._requests) * 60.0 / (self.rpm * self.scale)
+                    if self.tpm and tokens:
+                        needed = min(tokens, self._capacity(self.tpm)) - self._tokens
+                        wait = max(wait, needed * 60.0 / (self.tpm * self.scale))
+                    if wait <= 0:
+                        self._requests -= 1.0
+                        self._tokens -= tokens if self.tpm else 0
+                        return waited
+            time.sleep(wait)
+            waited += wait
+    
+    def consume(self, tokens: int) -> None:
+        """Charge tokens known only after the call, e.g. the response's."""
+        if not self.tpm:
+            return
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= tokens
+    
+    def succeeded(self) -> None:
+        """Restore part of the rate after a successful call."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.scale = min(1.0, self.scale + self.recovery)
+    
+    def throttle(self, retry_after: Optional[float] = None) -> None:
+        """
+        Slow down after a rate-limit error.
+        
+        Args:
+            retry_after: Seconds the provider asked to wait, if it did
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.throttled += 1
+            self.scale = max(self.min_scale, self.scale / 2)
+            self._requests = min(self._requests, 0.0)
+            if retry_after is not None:
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+    
+    def observe_headers(self, headers: Mapping[str, Any]) -> None:
+        """Adopt the limits of rate-limit response headers and block on exhausted quotas."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            for kind, (limit_names, remaining_names, reset_names) in LIMIT_HEADERS.items():
+                limit = next((_number(headers[n]) for n in limit_names if n in headers), None)
+                remaining = next(
+                    (_number(headers[n]) for n in remaining_names if n in headers), None
+                )
+                reset = next((_seconds(headers[n]) for n in reset_names if n in headers), None)
+                
+                if limit:
+                    if kind == 'requests':
+                        self.rpm = int(limit)
+                    else:
+                        self.tpm = int(limit)
+                if remaining is not None and remaining <= 0 and reset:
+                    self._blocked_until = max(self._blocked_until, now + reset)
+            
+            retry_after = _seconds(headers.get('retry-after'))
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return the current limits, adaptive scale and throttle count."""
+        with self._lock:
+            return {
+                'rpm': self.rpm,
+                'tpm': self.tpm,
+                'scale': round(self.scale, 3),
+                'throttled': self.throttled
+            }
+
+
+class ProviderRateLimiter:
+    """
+    Shares one TokenBucket per LLM provider between every client of the process.
+    
+    Agents on different providers (e.g. OpenAI and Anthropic models) are
+    limited by their own provider's quota instead of one crew-wide cap.
+    Rate-limit headers of successful responses are read through a LiteLLM
+    success callback, and those of 429 errors from the error itself.
+    
+    © 2025 Utilyst Inc. All rights reserved.
+    """
+    
+    def __init__(self, limits: Optional[Dict[str, Tuple[int, Optional[int]]]] = None):
+        """
+        Initialize the limiter.
+        
+        Args:
+            limits: Requests and tokens (None for unlimited) per minute by
+                provider, in addition to DEFAULT_PROVIDER_LIMITS
+        """
+        self.limits = {**DEFAULT_PROVIDER_LIMITS, **(limits or {})}
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._callback_installed = False
+    
+    @classmethod
+    def from_env(cls) -> "ProviderRateLimiter":
+        """
+        Create a limiter with the limits of ``LLM_RATE_LIMITS``.
+        
+        The variable lists ``provider=rpm[:tpm]`` entries separated by commas,
+        e.g. ``openai=500:200000,anthropic=50:40000``.
+        """
+        limits: Dict[str, Tuple[int, Optional[int]]] = {}
+        for entry in os.getenv("LLM_RATE_LIMITS", "").split(","):
+            if "=" not in entry:
+                continue
+            provider, _, values = entry.partition("=")
+            rpm, _, tpm = values.partition(":")
+            limits[provider.strip().lower()] = (int(rpm), int(tpm) if tpm else None)
+        return cls(limits)
+    
+    @staticmethod
+    def provider(model: str) -> str:
+        """Return the provider of a LiteLLM model name, e.g. ``anthropic`` for Claude models."""
+        model = model.lower()
+        if "/" in model:
+            return model.split("/", 1)[0]
+        if model.startswith("claude"):
+            return "anthropic"
+        if model.startswith(("gpt", "o1", "o3", "o4", "text-embedding")):
+            return "openai"
+        if model.startswith("gemini"):
+            return "gemini"
+        return "default"
+    
+    def bucket(self, model: str) -> TokenBucket:
+        """Return the bucket of a model's provider, creating it on first use."""
+        provider = self.provider(model)
+        with self._lock:
+            if provider not in self._buckets:
+                rpm, tpm = self.limits.get(provider, DEFAULT_LIMIT)
+                self._buckets[provider] = TokenBucket(rpm, tpm)
+            return self._buckets[provider]
+    
+    def _install_callback(self) -> None:
+        """Register the LiteLLM success callback reading rate-limit headers, once."""
+        if self._callback_installed:
+            return
+        try:
+            import litellm
+        except ImportError:
+            return
+        if self._on_success not in litellm.success_callback:
+            litellm.success_callback.append(self._on_success)
+        self._callback_installed = True
+    
+    def _on_success(
+        self,
+        kwargs: Dict[str, Any],
+        response: Any,
+        start_time: Any,
+        end_time: Any,
+    ) -> None:
+        """LiteLLM success callback: feed response headers to the provider's bucket."""
+        hidden = getattr(response, '_hidden_params', None) or {}
+        headers = hidden.get('additional_headers') or {}
+        if headers and kwargs.get('model'):
+            self.bucket(kwargs['model']).observe_headers({
+                str(name).lower().replace('llm_provider-', '', 1): value
+                for name, value in headers.items()
+            })
+    
+    def acquire(self, model: str, tokens: int = 0) -> float:
+        """
+        Wait for quota for a call to ``model`` with ``tokens`` input tokens.
+        
+        Returns:
+            float: Seconds spent waiting
+        """
+        self._install_callback()
+        return self.bucket(model).acquire(tokens)
+    
+    def record_success(self, model: str, output_tokens: int = 0) -> None:
+        """Record a successful call and charge its output tokens."""
+        bucket = self.bucket(model)
+        bucket.consume(output_tokens)
+        bucket.succeeded()
+    
+    def record_rate_limit(self, model: str, error: BaseException) -> None:
+        """Record a rate-limit error, slowing down the provider's bucket."""
+        headers = error_headers(error)
+        bucket = self.bucket(model)
+        bucket.observe_headers(headers)
+        bucket.throttle(_seconds(headers.get('retry-after')))
+    
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return the limits, adaptive scale and throttle count per provider."""
+        with self._lock:
+            buckets = dict(self._buckets)
+        return {provider: bucket.stats() for provider, bucket in buckets.items()}
+
+
+_rate_limiter: Optional[ProviderRateLimiter] = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> ProviderRateLimiter:
+    """Return the process-wide rate limiter, created from the environment on first use."""
+    global _rate_limiter
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = ProviderRateLimiter.from_env()
+        return _rate_limiter
@@ -0,0 +1,168 @@
+"""
+LLM Response Cache
+
+Persistent cache of LLM completions keyed by model, prompt and temperature.
+
+© 2025 Utilyst Inc. All rights reserved.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+class LLMResponseCache:
+    """
+    SQLite-backed cache of LLM responses.
+    
+    Entries expire ``ttl_seconds`` after they were stored, and the total
+    stored size is bounded with least-recently-used eviction. Hit and miss
+    counters cover the lifetime of the cache object.
+    
+    © 2025 Utilyst Inc. All rights reserved.
+    """
+    
+    def __init__(
+        self,
+        db_path: str = "./output/llm_cache.db",
+        ttl_seconds: float = 7 * 24 * 3600,
+        max_bytes: int = 256 * 1024 ** 2,
+    ):
+        """
+        Open (and create if needed) the cache database.
+        
+        Args:
+            db_path: Path of the SQLite database
+            ttl_seconds: Age after which an entry is no longer served
+            max_bytes: Upper bound on the total size of cached responses
+        """
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                response TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)"
+        )
+        self._db.commit()
+        
+        self._hits = 0
+        self._misses = 0
+        self._expired = 0
+    
+    @classmethod
+    def from_env(cls) -> Optional["LLMResponseCache"]:
+        """
+        Build the cache configured by environment variables.
+        
+        Returns None unless ``LLM_CACHE`` is enabled; ``LLM_CACHE_PATH``,
+        ``LLM_CACHE_TTL_SECONDS`` and ``LLM_CACHE_MAX_MB`` override the defaults.
+        """
+        if os.getenv("LLM_CACHE", "false").lower() not in ("1", "true", "yes"):
+            return None
+        return cls(
+            db_path=os.getenv("LLM_CACHE_PATH", "./output/llm_cache.db"),
+            ttl_seconds=float(os.getenv("LLM_CACHE_TTL_SECONDS", 7 * 24 * 3600)),
+            max_bytes=int(float(os.getenv("LLM_CACHE_MAX_MB", 256)) * 1024 ** 2),
+        )
+    
+    @staticmethod
+    def key(
+        model: str,
+        messages: Any,
+        temperature: Optional[float] = None,
+        stop: Any = None,
+    ) -> str:
+        """Build the cache key for a request."""
+        request = {
+            'model': model,
+            'messages': messages,
+            'temperature': temperature,
+            'stop': stop,
+        }
+        payload = json.dumps(request, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for a key, or None on a miss or expired entry."""
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl_seconds:
+                if row is not None:
+                    self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._db.commit()
+                    self._expired += 1
+                self._misses += 1
+                return None
+            
+            self._db.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            self._hits += 1
+        return row[0]
+    
+    def put(self, key: str, model: str, response: str) -> None:
+        """Cache a response and evict expired and old entries if over budget."""
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                """
+                INSERT OR REPLACE INTO responses (key, model, response, size, created_at, last_used)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (key, model, response, len(response.encode('utf-8')), now, now),
+            )
+            self._evict(now)
+            self._db.commit()
+    
+    def _evict(self, now: float) -> None:
+        """Delete expired entries, then least recently used ones until under ``max_bytes``."""
+        self._db.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,))
+        
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        
+        for key, size in self._db.execute(
+            "SELECT key, size FROM responses ORDER BY last_used ASC"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return hit, miss and expiry counters, the hit rate and the stored size."""
+        with self._lock:
+            entries, size = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+            lookups = self._hits + self._misses
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'expired': self._expired,
+                'hit_rate': round(self._hits / lookups, 3) if lookups else 0.0,
+                'entries': entries,
+                'bytes': size,
+            }
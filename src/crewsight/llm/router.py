@@ -0,0 +1,91 @@
+"""
+Model Router
+
+Chooses the model for each step of a run: fast models for cheap or short
+steps, the strong model for heavy analysis.
+
+© 2025 Utilyst Inc. All rights reserved.
+"""
+
+import os
+from typing import Dict, Optional
+
+
+ROUTE_FAST = "fast"
+ROUTE_STRONG = "strong"
+ROUTE_SHORT = "short"
+
+# Tier per step: agents by name, map-reduce stages by stage name. Steps not
+# listed keep their configured model.
+DEFAULT_ROUTES: Dict[str, str] = {
+    'document_retriever': ROUTE_FAST,    # cataloging and retrieval summaries
+    'document_analyzer': ROUTE_STRONG,
+    'map': ROUTE_SHORT,                  # fast for short chunks only
+    'reduce_document': ROUTE_STRONG,
+    'reduce_folder': ROUTE_STRONG,
+}
+
+
+class ModelRouter:
+    """
+    Maps the steps of a run to models.
+    
+    ``fast`` steps use ``fast_model``; ``strong`` steps use ``strong_model``,
+    or their configured model when it is not set; ``short`` steps use the
+    fast model only for prompts of at most ``short_prompt_tokens``, so
+    small map chunks are analyzed quickly while long ones stay on the
+    strong model.
+    
+    © 2025 Utilyst Inc. All rights reserved.
+    """
+    
+    def __init__(
+        self,
+        fast_model: Optional[str] = "gpt-4o-mini",
+        strong_model: Optional[str] = None,
+        short_prompt_tokens: int = 1500,
+        routes: Optional[Dict[str, str]] = None,
+    ):
+        """
+        Initialize the router.
+        
+        Args:
+            fast_model: Model for cheap and short steps; None to disable routing to it
+            strong_model: Model for heavy steps; None to keep their configured model
+            short_prompt_tokens: Largest prompt a ``short`` step sends to the fast model
+            routes: Tier per step, replacing DEFAULT_ROUTES
+        """
+        self.fast_model = fast_model
+        self.strong_model = strong_model
+        self.short_prompt_tokens = short_prompt_tokens
+        self.routes = dict(DEFAULT_ROUTES if routes is None else routes)
+    
+    @classmethod
+    def from_env(cls) -> "ModelRouter":
+        """Create a router configured by ``LLM_*_MODEL`` and ``LLM_SHORT_PROMPT_TOKENS``."""
+        return cls(
+            fast_model=os.getenv("LLM_FAST_MODEL", "gpt-4o-mini") or None,
+            strong_model=os.getenv("LLM_STRONG_MODEL") or None,
+            short_prompt_tokens=int(os.getenv("LLM_SHORT_PROMPT_TOKENS", 1500)),
+        )
+    
+    def model_for(self, step: str, configured: str, prompt_tokens: Optional[int] = None) -> str:
+        """
+        Return the model for a step.
+        
+        Args:
+            step: Agent name or map-reduce stage
+            configured: Model the step is configured with
+            prompt_tokens: Prompt size, for ``short`` steps
+        """
+        tier = self.routes.get(step)
+        if tier == ROUTE_FAST and self.fast_model:
+            return self.fast_model
+        if tier == ROUTE_STRONG and self.strong_model:
+            return self.strong_model
+        if (
+            tier == ROUTE_SHORT and self.fast_model and prompt_tokens is not None
+            and prompt_tokens <= self.short_prompt_tokens
+        ):
+            return self.fast_model
+        return configured
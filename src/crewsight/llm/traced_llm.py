@@ -0,0 +1,96 @@
+"""
+Traced LLM
+
+crewai LLM client that records every model call as a tracing span.
+
+© 2025 Utilyst Inc. All rights reserved.
+"""
+
+from typing import Any, List, Optional
+
+from crewai import LLM
+
+from src.crewsight.analysis.chunking import estimate_tokens
+from src.crewsight.analysis.map_reduce import RequestPacer
+from src.crewsight.llm.rate_limiter import ProviderRateLimiter, is_rate_limit_error
+from src.crewsight.telemetry import span
+
+
+def _message_text(messages: Any) -> str:
+    """Return the text content of a prompt given as a string or chat messages."""
+    if isinstance(messages, str):
+        return messages
+    return "\n".join(
+        content if isinstance(content, str) else str(content)
+        for content in (message.get('content', '') for message in messages)
+    )
+
+
+class TracedLLM(LLM):
+    """
+    LLM client whose calls are timed as ``llm.call`` spans.
+    
+    Spans carry the model and estimated input and output token counts,
+    which also feed the ``crewsight_llm_tokens_total`` metric. With a
+    ``pacer``, calls are spaced out to a requests-per-minute budget that can
+    be shared between clients. With a ``rate_limiter``, calls wait for their
+    provider's request and token quota, and rate-limit errors slow the
+    provider down and are retried up to ``rate_limit_retries`` times.
+    
+    © 2025 Utilyst Inc. All rights reserved.
+    """
+    
+    def __init__(
+        self,
+        model: str,
+        pacer: Optional[RequestPacer] = None,
+        rate_limiter: Optional[ProviderRateLimiter] = None,
+        rate_limit_retries: int = 3,
+        **kwargs: Any,
+    ):
+        """
+        Initialize the client.
+        
+        Args:
+            model: Model name, as for ``crewai.LLM``
+            pacer: Request pacer shared by the clients of one rate budget
+            rate_limiter: Per-provider rate limiter, usually the process-wide one
+            rate_limit_retries: Retries of a call rejected with a rate-limit error
+            **kwargs: Further ``crewai.LLM`` settings, e.g. ``temperature``
+        """
+        super().__init__(model=model, **kwargs)
+        self.pacer = pacer
+        self.rate_limiter = rate_limiter
+        self.rate_limit_retries = rate_limit_retries
+    
+    def call(self, messages: Any, callbacks: Optional[List[Any]] = None) -> Any:
+        """Call the model inside an ``llm.call`` span, within the provider's rate limits."""
+        prompt_tokens = estimate_tokens(_message_text(messages))
+        attempt = 0
+        while True:
+            if self.pacer:
+                self.pacer.wait()
+            waited = 0.0
+            if self.rate_limiter:
+                waited = self.rate_limiter.acquire(self.model, prompt_tokens)
+            try:
+                with span(
+                    'llm.call', model=self.model, input_tokens=prompt_tokens,
+                    rate_limit_wait=round(waited, 3), attempt=attempt + 1
+                ) as current:
+                    response = super().call(messages, callbacks=callbacks or [])
+                    output_tokens = estimate_tokens(response) if isinstance(response, str) else 0
+                    current.set(output_tokens=output_tokens)
+            except Exception as e:
+                if (
+                    self.rate_limiter is None or attempt >= self.rate_limit_retries
+                    or not is_rate_limit_error(e)
+                ):
+                    raise
+                self.rate_limiter.record_rate_limit(self.model, e)
+                attempt += 1
+                continue
+            
+            if self.rate_limiter:
+                self.rate_limiter.record_success(self.model, output_tokens)
+            return response
@@ -8,13 +8,86 @@ public Google Drive folders.
 © 2025 Utilyst Inc. All rights reserved.
 """
 
+import os
 import sys
 from pathlib import Path
 
 # Add the src directory to the Python path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from src.crewsight.crew import CrewSightCrew
+from src.crewsight.batch import BatchCheckpoint, BatchRunner, load_batch_manifest
+from src.crewsight.crew import (
+    ANALYSIS_AGENT,
+    ANALYSIS_MAP_REDUCE,
+    EXECUTION_FAN_OUT,
+    EXECUTION_SEQUENTIAL,
+    MAX_RPM,
+    CrewSightCrew,
+)
+from src.crewsight.factory import CrewFactory
+from src.crewsight.llm import LLMResponseCache, get_rate_limiter
+from src.crewsight.telemetry import configure_tracing, get_tracer
+
+
+def _arg(index: int, default=None):
+    """Return the positional command-line argument at ``index``, ignoring --options."""
+    args = [arg for arg in sys.argv if not arg.startswith("--")]
+    return args[index] if len(args) > index else default
+
+
+def _option(name: str, default=None):
+    """Return the value of a ``--name=value`` command-line option."""
+    prefix = f"--{name}="
+    for arg in sys.argv:
+        if arg.startswith(prefix):
+            return arg[len(prefix):]
+    return default
+
+
+def _llm_cache():
+    """Return the LLM response cache when enabled with --llm-cache or LLM_CACHE."""
+    if "--llm-cache" in sys.argv:
+        return LLMResponseCache()
+    return LLMResponseCache.from_env()
+
+
+def _print_llm_cache_stats(llm_cache) -> None:
+    """Print the LLM response cache metrics, if the cache is enabled."""
+    if llm_cache is None:
+        return
+    stats = llm_cache.stats()
+    print(
+        f"🗄️  LLM cache: {stats['hits']} hits, {stats['misses']} misses "
+        f"({stats['hit_rate']:.0%} hit rate), {stats['entries']} entries, "
+        f"{stats['bytes'] / 1024:.0f} KB"
+    )
+
+
+def _print_rate_limit_stats() -> None:
+    """Print the providers whose rate limits slowed the run down."""
+    for provider, stats in get_rate_limiter().stats().items():
+        if stats['throttled']:
+            print(
+                f"🚦 {provider}: {stats['throttled']} rate-limit errors, now at "
+                f"{stats['scale']:.0%} of {stats['rpm']} requests/minute"
+            )
+
+
+def _configure_tracing() -> None:
+    """Export spans to TRACE_FILE (default ./output/traces.jsonl) when run with --trace."""
+    if "--trace" in sys.argv:
+        configure_tracing(os.getenv("TRACE_FILE") or "./output/traces.jsonl")
+
+
+def _print_trace_summary() -> None:
+    """Print where the run's time went, by span name."""
+    tracer = get_tracer()
+    if tracer.path is None:
+        return
+    print(f"⏱️  Time by stage (spans in {tracer.path}):")
+    for total in tracer.metrics.summary():
+        errors = f", {total['errors']} errors" if total['errors'] else ""
+        print(f"   {total['span']}: {total['seconds']:.1f}s over {total['count']} spans{errors}")
 
 
 def run():
@@ -44,17 +117,25 @@ def run():
     print()
     
     try:
-        # Initialize the crew
-        crew_instance = CrewSightCrew()
-        
-        print("🤖 Initializing agents...")
-        crew = crew_instance.crew()
+        # Initialize the crew; --incremental only re-analyzes changed files,
+        # --map-reduce analyzes large folders in token-budgeted chunks,
+        # --fan-out analyzes documents in concurrent per-document tasks,
+        # --llm-cache answers repeated LLM requests from a local cache,
+        # --trace exports timing spans of every stage as JSON lines
+        _configure_tracing()
+        llm_cache = _llm_cache()
+        crew_instance = CrewSightCrew(
+            incremental="--incremental" in sys.argv,
+            analysis_mode=ANALYSIS_MAP_REDUCE if "--map-reduce" in sys.argv else ANALYSIS_AGENT,
+            execution_mode=EXECUTION_FAN_OUT if "--fan-out" in sys.argv else EXECUTION_SEQUENTIAL,
+            llm_cache=llm_cache
+        )
         
         print("⚙️  Starting document processing...")
         print()
         
         # Kick off the crew with inputs
-        result = crew.kickoff(inputs=inputs)
+        result = crew_instance.kickoff(inputs=inputs)
         
         print()
         print("=" * 70)
@@ -64,9 +145,12 @@ def run():
         print("📊 Results:")
         print(result)
         print()
+        _print_llm_cache_stats(llm_cache)
+        _print_rate_limit_stats()
+        _print_trace_summary()
         
         return result
-        
+    
     except Exception as e:
         print()
         print("=" * 70)
@@ -83,6 +167,90 @@ def run():
         sys.exit(1)
 
 
+def _print_batch_event(event_type: str, data) -> None:
+    """Print batch progress as folders start and finish."""
+    if event_type == 'folder_started':
+        print(f"▶️  {data['url']}")
+    elif data['status'] == 'completed':
+        print(
+            f"✅ {data['url']}: {data['documents']} documents "
+            f"({data['duplicate_documents']} seen in other folders) in {data['seconds']}s"
+        )
+    else:
+        print(f"❌ {data['url']}: {data['error']}")
+
+
+def batch():
+    """
+    Process every folder listed in a batch manifest.
+    
+    Usage: batch <manifest> [--workers=N] [--rpm=N] [--checkpoint=PATH]
+    
+    Folders run on ``--workers`` concurrent crews (default 2) sharing one LLM
+    budget of ``--rpm`` requests per minute (default MAX_RPM). Finished
+    folders are recorded in the checkpoint (default ``<manifest>.checkpoint.json``)
+    and skipped when the batch is run again. --incremental, --agent and
+    --fan-out set the defaults for folders that do not set their own options.
+    Folders are analyzed in map-reduce mode, which analyzes a document shared
+    by several folders once, unless --agent or --fan-out is given.
+    """
+    print("=" * 70)
+    print("📦 CrewSight-AI Batch Processing")
+    print("=" * 70)
+    print()
+    
+    manifest_path = _arg(2)
+    try:
+        _configure_tracing()
+        entries = load_batch_manifest(manifest_path)
+        run_options = {
+            'incremental': "--incremental" in sys.argv,
+            'execution_mode': EXECUTION_FAN_OUT if "--fan-out" in sys.argv else EXECUTION_SEQUENTIAL
+        }
+        if "--agent" in sys.argv:
+            run_options['analysis_mode'] = ANALYSIS_AGENT
+        if "--agent" in sys.argv or "--fan-out" in sys.argv:
+            print("⚠️  Agent analysis: documents shared by several folders are analyzed per folder")
+            print()
+        entries = [{**run_options, **entry} for entry in entries]
+        
+        llm_cache = _llm_cache()
+        runner = BatchRunner(
+            CrewFactory(llm_cache=llm_cache, llm_rpm=int(_option("rpm", MAX_RPM))),
+            BatchCheckpoint(_option("checkpoint", f"{manifest_path}.checkpoint.json")),
+            max_workers=int(_option("workers", 2)),
+            event_callback=_print_batch_event
+        )
+        summary = runner.run(entries)
+    
+    except Exception as e:
+        print(f"❌ Batch failed: {str(e)}")
+        sys.exit(1)
+    
+    print()
+    print("=" * 70)
+    print(
+        f"📊 Folders: {summary['completed']} completed, {summary['failed']} failed, "
+        f"{summary['resumed']} already completed (of {summary['folders']})"
+    )
+    print(
+        f"📄 Documents: {summary['documents']} "
+        f"({summary['duplicate_documents']} duplicates across folders, "
+        f"{summary['downloaded']} downloaded)"
+    )
+    print(
+        f"⏱️  Throughput: {summary['folders_per_hour']} folders/hour, "
+        f"{summary['documents_per_minute']} docs/minute "
+        f"over {round(summary['elapsed_seconds'] / 60, 1)} minutes"
+    )
+    _print_llm_cache_stats(llm_cache)
+    _print_rate_limit_stats()
+    _print_trace_summary()
+    
+    if summary['failed']:
+        sys.exit(1)
+
+
 def train():
     """Train the crew for the given number of iterations."""
     print("=" * 70)
@@ -98,17 +266,19 @@ def train():
     }
     
     try:
-        crew_instance = CrewSightCrew()
+        llm_cache = _llm_cache()
+        crew_instance = CrewSightCrew(llm_cache=llm_cache)
         crew_instance.crew().train(
-            n_iterations=int(sys.argv[2]) if len(sys.argv) > 2 else 5,
-            filename=sys.argv[3] if len(sys.argv) > 3 else "training_data.pkl",
+            n_iterations=int(_arg(2, 5)),
+            filename=_arg(3, "training_data.pkl"),
             inputs=inputs
         )
         
         print()
         print("✅ Training completed successfully!")
         print()
-        
+        _print_llm_cache_stats(llm_cache)
+    
     except Exception as e:
         print(f"❌ Training failed: {str(e)}")
         sys.exit(1)
@@ -122,13 +292,15 @@ def replay():
     print()
     
     try:
-        crew_instance = CrewSightCrew()
-        crew_instance.crew().replay(task_id=sys.argv[2])
+        llm_cache = _llm_cache()
+        crew_instance = CrewSightCrew(llm_cache=llm_cache)
+        crew_instance.crew().replay(task_id=_arg(2))
         
         print()
         print("✅ Replay completed successfully!")
         print()
-        
+        _print_llm_cache_stats(llm_cache)
+    
     except Exception as e:
         print(f"❌ Replay failed: {str(e)}")
         sys.exit(1)
@@ -149,40 +321,48 @@ def test():
     }
     
     try:
-        crew_instance = CrewSightCrew()
+        llm_cache = _llm_cache()
+        crew_instance = CrewSightCrew(llm_cache=llm_cache)
         crew_instance.crew().test(
-            n_iterations=int(sys.argv[2]) if len(sys.argv) > 2 else 3,
-            openai_model_name=sys.argv[3] if len(sys.argv) > 3 else "gpt-4",
+            n_iterations=int(_arg(2, 3)),
+            openai_model_name=_arg(3, "gpt-4"),
             inputs=inputs
         )
         
         print()
         print("✅ Testing completed successfully!")
         print()
-        
+        _print_llm_cache_stats(llm_cache)
+    
     except Exception as e:
         print(f"❌ Testing failed: {str(e)}")
         sys.exit(1)
 
 
 if __name__ == "__main__":
-    # Check if a specific command was provided
-    if len(sys.argv) > 1:
+    # Check if a specific command was provided (options such as --incremental are not commands)
+    if len(sys.argv) > 1 and not sys.argv[1].startswith("--"):
         command = sys.argv[1].lower()
         
         if command == "train":
             train()
         elif command == "replay":
-            if len(sys.argv) < 3:
+            if _arg(2) is None:
                 print("❌ Error: Task ID required for replay")
                 print("Usage: python -m src.crewsight.main replay <task_id>")
                 sys.exit(1)
             replay()
         elif command == "test":
             test()
+        elif command == "batch":
+            if _arg(2) is None:
+                print("❌ Error: Manifest file required for batch")
+                print("Usage: python -m src.crewsight.main batch <manifest> [--workers=N]")
+                sys.exit(1)
+            batch()
         else:
             print(f"❌ Unknown command: {command}")
-            print("Available commands: train, replay, test")
+            print("Available commands: train, replay, test, batch")
             sys.exit(1)
     else:
         # Run the default workflow
@@ -0,0 +1,23 @@
+"""
+CrewSight-AI Document Retrieval
+
+© 2025 Utilyst Inc. All rights reserved.
+"""
+
+from src.crewsight.retrieval.embeddings import HashingEmbedder, OpenAIEmbedder, default_embedder
+from src.crewsight.retrieval.troubleshooting_index import (
+    TroubleshootingIndex,
+    extract_error_codes,
+    normalize_code,
+)
+from src.crewsight.retrieval.vector_index import VectorIndex
+
+__all__ = [
+    "HashingEmbedder",
+    "OpenAIEmbedder",
+    "TroubleshootingIndex",
+    "VectorIndex",
+    "default_embedder",
+    "extract_error_codes",
+    "normalize_code",
+]
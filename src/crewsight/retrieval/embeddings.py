@@ -0,0 +1,107 @@
+"""
+Embeddings
+
+Text embedding backends for the document vector index.
+
+© 2025 Utilyst Inc. All rights reserved.
+"""
+
+import hashlib
+import os
+import re
+from typing import List
+
+import numpy as np
+
+
+class OpenAIEmbedder:
+    """
+    Embeds text with the OpenAI embeddings API.
+    
+    © 2025 Utilyst Inc. All rights reserved.
+    """
+    
+    def __init__(
+        self,
+        model: str = "text-embedding-3-small",
+        dim: int = 1536,
+        batch_size: int = 64,
+    ):
+        """
+        Initialize the embedder.
+        
+        Args:
+            model: Embedding model name
+            dim: Dimension of the model's vectors
+            batch_size: Number of texts sent per API request
+        """
+        from openai import OpenAI
+        
+        self.client = OpenAI()
+        self.model = model
+        self.dim = dim
+        self.batch_size = batch_size
+        self.name = f"openai:{model}:{dim}"
+    
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """Return an array of shape ``(len(texts), dim)``."""
+        vectors = []
+        for start in range(0, len(texts), self.batch_size):
+            response = self.client.embeddings.create(
+                model=self.model,
+                input=texts[start:start + self.batch_size],
+                dimensions=self.dim,
+            )
+            vectors.extend(item.embedding for item in response.data)
+        return np.asarray(vectors, dtype=np.float32).reshape(len(texts), self.dim)
+
+
+class HashingEmbedder:
+    """
+    Local embedder hashing word unigrams and bigrams into a fixed-size vector.
+    
+    Needs no API key or model download; useful offline and for benchmarks,
+    at lower retrieval quality than a learned model.
+    
+    © 2025 Utilyst Inc. All rights reserved.
+    """
+    
+    def __init__(self, dim: int = 1024):
+        """
+        Initialize the embedder.
+        
+        Args:
+            dim: Number of hash buckets, i.e. the vector dimension
+        """
+        self.dim = dim
+        self.name = f"hashing:{dim}"
+    
+    def _bucket(self, feature: str) -> int:
+        """Return the signed bucket of a feature; the sign reduces collision bias."""
+        digest = hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest()
+        digest = int.from_bytes(digest, 'little')
+        bucket = digest % self.dim
+        return bucket if digest & (1 << 63) else -bucket - 1
+    
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """Return an array of shape ``(len(texts), dim)``."""
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            words = re.findall(r'\w+', text.lower())
+            for feature in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+                bucket = self._bucket(feature)
+                if bucket >= 0:
+                    vectors[row, bucket] += 1.0
+                else:
+                    vectors[row, -bucket - 1] -= 1.0
+        return vectors
+
+
+def default_embedder():
+    """Return the OpenAI embedder when an API key is configured, else the hashing embedder."""
+    if os.getenv("OPENAI_API_KEY"):
+        try:
+            return OpenAIEmbedder()
+        except ImportError:
+            pass
+    return HashingEmbedder()
@@ -0,0 +1,317 @@
+"""
+Troubleshooting Index
+
+BM25 keyword and error-code index over processed equipment manuals.
+
+© 2025 Utilyst Inc. All rights reserved.
+"""
+
+import math
+import re
+import sqlite3
+import threading
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.crewsight.analysis import chunk_text
+
+
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have i if in into is it its my no not "
+    "of on or our so that the their then there these this to was we were what when "
+    "which while will with won't doesn't can't cannot does do".split()
+)
+
+# Codes following a keyword ("error E42", "fault code 0x1F", "alarm AL-03") ...
+CODE_AFTER_KEYWORD = re.compile(
+    r'\b(?:error|fault|alarm|alert|warning|code)s?(?:\s+code)?[\s:#]*'
+    r'((?:0x[0-9a-f]+)|(?:[a-z]{0,4}[-_]?\d{1,5}[a-z]?))\b',
+    re.IGNORECASE,
+)
+# ... and conventionally prefixed codes on their own ("E42", "ERR-101", "F03")
+PREFIXED_CODE = re.compile(r'\b((?:E|ER|ERR|F|AL|W|ALM)[-_]?\d{1,4})\b')
+
+ACTION_VERBS = frozenset(
+    "adjust calibrate check clean clear close confirm connect contact disconnect drain "
+    "ensure flush inspect install lubricate measure open power press reconnect refill "
+    "reinstall remove repair replace reset restart retighten run set test tighten turn "
+    "unplug update verify wait".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens without stopwords."""
+    return [t for t in re.findall(r'\w+', text.lower()) if t not in STOPWORDS]
+
+
+def normalize_code(code: str) -> str:
+    """Normalize an error code so that ``e-04``, ``E04`` and ``E4`` compare equal."""
+    code = re.sub(r'[-_\s]', '', code.upper())
+    if code.startswith('0X'):
+        return '0X' + code[2:].lstrip('0')
+    match = re.fullmatch(r'([A-Z]*)0*(\d+)([A-Z]?)', code)
+    return f"{match.group(1)}{match.group(2)}{match.group(3)}" if match else code
+
+
+def extract_error_codes(text: str) -> List[str]:
+    """Return the normalized error codes mentioned in a text."""
+    codes = {normalize_code(m.group(1)) for m in CODE_AFTER_KEYWORD.finditer(text)}
+    codes.update(normalize_code(m.group(1)) for m in PREFIXED_CODE.finditer(text))
+    return sorted(code for code in codes if re.search(r'\d', code))
+
+
+def extract_recommendations(text: str, limit: int = 5) -> List[str]:
+    """Return the actionable steps in a passage: list items and imperative sentences."""
+    steps = []
+    for line in text.splitlines():
+        line = line.strip()
+        is_list_item = re.match(r'^(?:[-*•]|\d+[.)])\s+', line)
+        line = re.sub(r'^(?:[-*•]|\d+[.)])\s+', '', line)
+        for sentence in re.split(r'(?<=[.!?])\s+', line):
+            words = re.findall(r'[A-Za-z]+', sentence)
+            if sentence and (is_list_item or (words and words[0].lower() in ACTION_VERBS)):
+                steps.append(sentence.rstrip())
+            if len(steps) >= limit:
+                return steps
+    return steps
+
+
+class TroubleshootingIndex:
+    """
+    Precomputed index answering equipment issues without an LLM call.
+    
+    Manual text is split into short passages, which are stored in SQLite
+    together with the error codes they mention. Lookups run against an
+    in-memory inverted index (BM25) and error-code table that are rebuilt
+    from the database whenever another connection, e.g. a crew run in
+    another process, has changed it. Documents are indexed by content hash
+    and re-indexing a document under a new hash replaces its passages.
+    
+    © 2025 Utilyst Inc. All rights reserved.
+    """
+    
+    def __init__(
+        self,
+        db_path: str,
+        passage_tokens: int = 120,
+        k1: float = 1.2,
+        b: float = 0.75,
+        min_coverage: float = 0.6,
+    ):
+        """
+        Open (and create if needed) the index.
+        
+        Args:
+            db_path: Path of the SQLite database
+            passage_tokens: Token budget per indexed passage
+            k1: BM25 term-frequency saturation
+            b: BM25 length normalization
+            min_coverage: Fraction of the query's terms the best passage must
+                contain for a keyword match to count as an answer
+        """
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.passage_tokens = passage_tokens
+        self.k1 = k1
+        self.b = b
+        self.min_coverage = min_coverage
+        
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS files (
+                sha256 TEXT PRIMARY KEY,
+                document TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS passages (
+                passage_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                sha256 TEXT NOT NULL,
+                document TEXT NOT NULL,
+                text TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS error_codes (
+                code TEXT NOT NULL,
+                passage_id INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS error_codes_code ON error_codes (code);
+            """
+        )
+        self._db.commit()
+        
+        self._data_version: Optional[int] = None
+        self._passages: Dict[int, Dict[str, Any]] = {}
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._codes: Dict[str, List[int]] = {}
+        self._avg_length = 0.0
+    
+    def _refresh(self) -> None:
+        """Rebuild the in-memory index if the database changed since it was built."""
+        data_version = self._db.execute("PRAGMA data_version").fetchone()[0]
+        if data_version == self._data_version:
+            return
+        
+        passages: Dict[int, Dict[str, Any]] = {}
+        postings: Dict[str, Dict[int, int]] = defaultdict(dict)
+        for passage_id, document, text in self._db.execute(
+            "SELECT passage_id, document, text FROM passages"
+        ):
+            terms = Counter(tokenize(text))
+            passages[passage_id] = {
+                'document': document,
+                'text': text,
+                'length': sum(terms.values())
+            }
+            for term, count in terms.items():
+                postings[term][passage_id] = count
+        
+        codes: Dict[str, List[int]] = defaultdict(list)
+        for code, passage_id in self._db.execute("SELECT code, passage_id FROM error_codes"):
+            codes[code].append(passage_id)
+        
+        self._passages = passages
+        self._postings = dict(postings)
+        self._codes = dict(codes)
+        self._avg_length = (
+            sum(p['length'] for p in passages.values()) / len(passages) if passages else 0.0
+        )
+        self._data_version = data_version
+    
+    def contains(self, sha256: str) -> bool:
+        """Return True if a file with this content hash is indexed."""
+        with self._lock:
+            return self._db.execute(
+                "SELECT 1 FROM files WHERE sha256 = ?", (sha256,)
+            ).fetchone() is not None
+    
+    def add_document(self, document: str, sha256: str, text: str) -> int:
+        """
+        Index a manual's text unless its content hash is already indexed.
+        
+        Returns:
+            int: Number of passages added
+        """
+        passages = chunk_text(text, self.passage_tokens)
+        with self._lock:
+            if self._db.execute("SELECT 1 FROM files WHERE sha256 = ?", (sha256,)).fetchone():
+                return 0
+            
+            self._db.execute(
+                "DELETE FROM error_codes WHERE passage_id IN "
+                "(SELECT passage_id FROM passages WHERE document = ?)",
+                (document,),
+            )
+            self._db.execute("DELETE FROM passages WHERE document = ?", (document,))
+            self._db.execute("DELETE FROM files WHERE document = ?", (document,))
+            
+            for passage in passages:
+                cursor = self._db.execute(
+                    "INSERT INTO passages (sha256, document, text) VALUES (?, ?, ?)",
+                    (sha256, document, passage),
+                )
+                self._db.executemany(
+                    "INSERT INTO error_codes (code, passage_id) VALUES (?, ?)",
+                    [(code, cursor.lastrowid) for code in extract_error_codes(passage)],
+                )
+            self._db.execute(
+                "INSERT INTO files (sha256, document) VALUES (?, ?)", (sha256, document)
+            )
+            self._db.commit()
+            # This connection's own writes do not change data_version
+            self._data_version = None
+        return len(passages)
+    
+    def _bm25(self, terms: List[str], candidates: Optional[List[int]] = None) -> Dict[int, float]:
+        """Score passages against query terms; limited to ``candidates`` when given."""
+        total = len(self._passages)
+        allowed = set(candidates) if candidates is not None else None
+        scores: Dict[int, float] = defaultdict(float)
+        for term in set(terms):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+            for passage_id, tf in postings.items():
+                if allowed is not None and passage_id not in allowed:
+                    continue
+                length = self._passages[passage_id]['length']
+                length_norm = 1 - self.b + self.b * length / self._avg_length
+                scores[passage_id] += idf * tf * (self.k1 + 1) / (tf + self.k1 * length_norm)
+        return scores
+    
+    def lookup(
+        self,
+        issue_description: str,
+        equipment_type: Optional[str] = None,
+        error_code: Optional[str] = None,
+        top_k: int = 3,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Answer an issue from the index.
+        
+        Passages mentioning ``error_code`` are preferred and ranked by BM25
+        against the description and equipment type. Otherwise the best BM25
+        passage must cover at least ``min_coverage`` of the query terms.
+        
+        Returns:
+            Dict: ``match`` (``"error_code"`` or ``"keyword"``), ``analysis``,
+            ``recommendations`` and ``sources``, or None on a miss
+        """
+        terms = tokenize(f"{issue_description} {equipment_type or ''}")
+        
+        with self._lock:
+            self._refresh()
+            if not self._passages:
+                return None
+            
+            match = None
+            candidates = self._codes.get(normalize_code(error_code)) if error_code else None
+            if candidates:
+                match = 'error_code'
+                scores = self._bm25(terms, candidates)
+                ranked = sorted(candidates, key=lambda pid: scores.get(pid, 0.0), reverse=True)
+            else:
+                scores = self._bm25(terms)
+                ranked = sorted(scores, key=scores.get, reverse=True)
+                if ranked:
+                    best_terms = set(tokenize(self._passages[ranked[0]]['text']))
+                    coverage = len(set(terms) & best_terms) / len(set(terms)) if terms else 0.0
+                    if coverage >= self.min_coverage:
+                        match = 'keyword'
+            
+            if match is None:
+                return None
+            
+            if equipment_type:
+                # Prefer passages from manuals for the reported equipment
+                equipment_terms = set(tokenize(equipment_type))
+                ranked.sort(key=lambda pid: not equipment_terms & set(
+                    tokenize(self._passages[pid]['document'])
+                ))
+            top = [self._passages[pid] | {'score': scores.get(pid, 0.0)} for pid in ranked[:top_k]]
+        
+        recommendations: List[str] = []
+        for passage in top:
+            for step in extract_recommendations(passage['text']):
+                if step not in recommendations:
+                    recommendations.append(step)
+        
+        return {
+            'match': match,
+            'analysis': top[0]['text'],
+            'recommendations': recommendations[:5],
+            'sources': [
+                {'document': p['document'], 'score': round(p['score'], 3)} for p in top
+            ]
+        }
+    
+    def stats(self) -> Dict[str, int]:
+        """Return the number of indexed documents, passages and error codes."""
+        with self._lock:
+            return {
+                'documents': self._db.execute("SELECT COUNT(*) FROM files").fetchone()[0],
+                'passages': self._db.execute("SELECT COUNT(*) FROM passages").fetchone()[0],
+                'error_codes': self._db.execute(
+                    "SELECT COUNT(DISTINCT code) FROM error_codes"
+                ).fetchone()[0],
+            }
@@ -0,0 +1,315 @@
+"""
+Vector Index
+
+Incremental, memory-mapped index of document chunk embeddings.
+
+© 2025 Utilyst Inc. All rights reserved.
+"""
+
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from src.crewsight.analysis import chunk_text
+
+
+class VectorIndex:
+    """
+    Top-k similarity index over chunk embeddings of extracted documents.
+    
+    Normalized float32 vectors are appended to ``vectors.f32`` and searched
+    through a read-only NumPy memmap, so the index is never loaded into
+    memory as a whole. Chunk text and provenance live in ``chunks.db``.
+    Documents are indexed by content hash: a file that is already indexed
+    is skipped, and re-indexing a document under a new hash retires its old
+    chunks once no other document has the same content. Every document's
+    content hash is recorded, so a search can be limited to a set of
+    documents even when their content was indexed under another name. The
+    vector file is compacted once most rows are retired.
+    
+    © 2025 Utilyst Inc. All rights reserved.
+    """
+    
+    def __init__(
+        self,
+        index_dir: str,
+        embedder: Any,
+        chunk_tokens: int = 400,
+        overlap_tokens: int = 50,
+    ):
+        """
+        Open (and create if needed) the index.
+        
+        Args:
+            index_dir: Directory holding the vector file and chunk database
+            embedder: Object with ``name``, ``dim`` and ``embed(texts)``
+                returning an array of shape ``(len(texts), dim)``
+            chunk_tokens: Token budget per indexed chunk
+            overlap_tokens: Tokens of context repeated between chunks
+        """
+        self.index_dir = Path(index_dir)
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        self.embedder = embedder
+        self.dim = embedder.dim
+        self.chunk_tokens = chunk_tokens
+        self.overlap_tokens = overlap_tokens
+        self.vectors_path = self.index_dir / "vectors.f32"
+        
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.index_dir / "chunks.db"), check_same_thread=False)
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS files (
+                sha256 TEXT PRIMARY KEY,
+                document TEXT NOT NULL,
+                chunks INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS chunks (
+                row INTEGER PRIMARY KEY,
+                sha256 TEXT NOT NULL,
+                document TEXT NOT NULL,
+                chunk INTEGER NOT NULL,
+                text TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS chunks_sha256 ON chunks (sha256);
+            CREATE TABLE IF NOT EXISTS documents (
+                document TEXT PRIMARY KEY,
+                sha256 TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS documents_sha256 ON documents (sha256);
+            """
+        )
+        # Indexes created before the documents table only know each content's first name
+        self._db.execute(
+            "INSERT OR IGNORE INTO documents (document, sha256) SELECT document, sha256 FROM files"
+        )
+        self._db.commit()
+        
+        row = self._db.execute("SELECT value FROM meta WHERE key = 'embedder'").fetchone()
+        if row is None or row[0] != embedder.name:
+            # Vectors from another embedder are not comparable; start over
+            self._reset()
+        
+        self._memmap: Optional[np.memmap] = None
+        self._active: Optional[np.ndarray] = None
+    
+    def _reset(self) -> None:
+        """Delete all indexed data and record the current embedder."""
+        self._db.execute("DELETE FROM files")
+        self._db.execute("DELETE FROM chunks")
+        self._db.execute("DELETE FROM documents")
+        self._db.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('embedder', ?)", (self.embedder.name,)
+        )
+        self._db.commit()
+        self.vectors_path.write_bytes(b"")
+    
+    def _rows(self) -> int:
+        """Number of rows in the vector file, retired ones included."""
+        if not self.vectors_path.exists():
+            return 0
+        return self.vectors_path.stat().st_size // (4 * self.dim)
+    
+    def _invalidate(self) -> None:
+        """Drop the cached memmap and active-row mask after a write."""
+        self._memmap = None
+        self._active = None
+    
+    def _load(self) -> None:
+        """Map the vector file and build the mask of active rows."""
+        rows = self._rows()
+        self._memmap = (
+            np.memmap(self.vectors_path, dtype=np.float32, mode='r', shape=(rows, self.dim))
+            if rows else None
+        )
+        self._active = np.zeros(rows, dtype=bool)
+        active_rows = [r for (r,) in self._db.execute("SELECT row FROM chunks")]
+        if active_rows:
+            self._active[np.asarray(active_rows)] = True
+    
+    def contains(self, sha256: str) -> bool:
+        """Return True if a file with this content hash is indexed."""
+        with self._lock:
+            return self._db.execute(
+                "SELECT 1 FROM files WHERE sha256 = ?", (sha256,)
+            ).fetchone() is not None
+    
+    def add_document(self, document: str, sha256: str, text: str) -> int:
+        """
+        Index a document's text unless its content hash is already indexed.
+        
+        The document is recorded under ``sha256`` either way. Chunks of its
+        previous content are retired unless another document has that content.
+        
+        Returns:
+            int: Number of chunks added
+        """
+        if self.contains(sha256):
+            with self._lock:
+                self._assign(document, sha256)
+                self._db.commit()
+            return 0
+        
+        chunks = chunk_text(text, self.chunk_tokens, self.overlap_tokens)
+        vectors = self.embedder.embed(chunks) if chunks else np.zeros((0, self.dim), np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = (vectors / np.where(norms == 0, 1, norms)).astype(np.float32)
+        
+        with self._lock:
+            self._assign(document, sha256)
+            if self._db.execute("SELECT 1 FROM files WHERE sha256 = ?", (sha256,)).fetchone():
+                self._db.commit()
+                return 0  # Indexed concurrently while this copy was being embedded
+            first_row = self._rows()
+            with open(self.vectors_path, 'ab') as f:
+                f.write(vectors.tobytes())
+            self._db.executemany(
+                "INSERT INTO chunks (row, sha256, document, chunk, text) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (first_row + i, sha256, document, i, chunk)
+                    for i, chunk in enumerate(chunks)
+                ],
+            )
+            self._db.execute(
+                "INSERT OR REPLACE INTO files (sha256, document, chunks) VALUES (?, ?, ?)",
+                (sha256, document, len(chunks)),
+            )
+            self._db.commit()
+            self._invalidate()
+            self._maybe_compact()
+        return len(chunks)
+    
+    def _assign(self, document: str, sha256: str) -> None:
+        """Record a document's content hash, retiring content no document has any more."""
+        row = self._db.execute(
+            "SELECT sha256 FROM documents WHERE document = ?", (document,)
+        ).fetchone()
+        self._db.execute(
+            "INSERT OR REPLACE INTO documents (document, sha256) VALUES (?, ?)", (document, sha256)
+        )
+        if row is None or row[0] == sha256:
+            return
+        if self._db.execute("SELECT 1 FROM documents WHERE sha256 = ?", (row[0],)).fetchone():
+            return
+        self._db.execute("DELETE FROM chunks WHERE sha256 = ?", (row[0],))
+        self._db.execute("DELETE FROM files WHERE sha256 = ?", (row[0],))
+        self._invalidate()
+    
+    def _scope(self, documents: Iterable[str]) -> Dict[str, str]:
+        """Map the content hashes of the given documents to one of their names."""
+        documents = sorted(set(documents))
+        names: Dict[str, str] = {}
+        for start in range(0, len(documents), 500):
+            batch = documents[start:start + 500]
+            placeholders = ", ".join("?" * len(batch))
+            for document, sha256 in self._db.execute(
+                f"SELECT document, sha256 FROM documents WHERE document IN ({placeholders})", batch
+            ):
+                names.setdefault(sha256, document)
+        return names
+    
+    def _maybe_compact(self) -> None:
+        """Rewrite the vector file without retired rows once they are the majority."""
+        rows = self._rows()
+        active = self._db.execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+        if rows < 1024 or active * 2 > rows:
+            return
+        
+        old_rows = [r for (r,) in self._db.execute("SELECT row FROM chunks ORDER BY row")]
+        vectors = np.memmap(self.vectors_path, dtype=np.float32, mode='r', shape=(rows, self.dim))
+        compact_path = self.vectors_path.with_suffix(".compact")
+        with open(compact_path, 'wb') as f:
+            for start in range(0, len(old_rows), 4096):
+                f.write(np.asarray(vectors[old_rows[start:start + 4096]]).tobytes())
+        del vectors
+        
+        self._db.execute("UPDATE chunks SET row = -row - 1")
+        self._db.executemany(
+            "UPDATE chunks SET row = ? WHERE row = ?",
+            [(new, -old - 1) for new, old in enumerate(old_rows)],
+        )
+        compact_path.replace(self.vectors_path)
+        self._db.commit()
+    
+    def search(
+        self,
+        query: str,
+        top_k: int = 5,
+        documents: Optional[Iterable[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Return the chunks most similar to a query.
+        
+        Args:
+            query: Natural-language query
+            top_k: Maximum number of matches
+            documents: Only search these documents, e.g. those of one folder;
+                matches are reported under these names. None searches the
+                whole index
+        
+        Returns:
+            List[Dict]: Up to ``top_k`` matches, best first, with
+            ``document``, ``chunk``, ``text`` and cosine ``score``
+        """
+        query_vector = self.embedder.embed([query])[0]
+        norm = np.linalg.norm(query_vector)
+        if norm:
+            query_vector = query_vector / norm
+        
+        with self._lock:
+            if self._active is None:
+                self._load()
+            if self._memmap is None or not self._active.any():
+                return []
+            
+            mask = self._active
+            names: Dict[str, str] = {}
+            if documents is not None:
+                names = self._scope(documents)
+                mask = np.zeros_like(self._active)
+                hashes = list(names)
+                for start in range(0, len(hashes), 500):
+                    batch = hashes[start:start + 500]
+                    placeholders = ", ".join("?" * len(batch))
+                    rows = [r for (r,) in self._db.execute(
+                        f"SELECT row FROM chunks WHERE sha256 IN ({placeholders})", batch
+                    )]
+                    if rows:
+                        mask[np.asarray(rows)] = True
+                if not mask.any():
+                    return []
+            
+            scores = np.asarray(self._memmap @ query_vector.astype(np.float32))
+            scores[~mask] = -np.inf
+            k = min(top_k, int(mask.sum()))
+            best = np.argpartition(-scores, k - 1)[:k]
+            best = best[np.argsort(-scores[best])]
+            
+            matches = []
+            for row in best:
+                sha256, document, chunk, text = self._db.execute(
+                    "SELECT sha256, document, chunk, text FROM chunks WHERE row = ?", (int(row),)
+                ).fetchone()
+                matches.append({
+                    'document': names.get(sha256, document),
+                    'chunk': chunk,
+                    'text': text,
+                    'score': round(float(scores[row]), 4)
+                })
+        return matches
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return the number of indexed documents and chunks and the vector file size."""
+        with self._lock:
+            documents = self._db.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+            chunks = self._db.execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+        return {
+            'documents': documents,
+            'chunks': chunks,
+            'embedder': self.embedder.name,
+            'vector_bytes': self.vectors_path.stat().st_size if self.vectors_path.exists() else 0
+        }
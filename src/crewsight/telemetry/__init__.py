@@ -0,0 +1,25 @@
+"""
+CrewSight-AI Telemetry
+
+© 2025 Utilyst Inc. All rights reserved.
+"""
+
+from src.crewsight.telemetry.metrics import SpanMetrics
+from src.crewsight.telemetry.tracing import (
+    Span,
+    Tracer,
+    configure_tracing,
+    get_tracer,
+    inherit_span,
+    span,
+)
+
+__all__ = [
+    "Span",
+    "SpanMetrics",
+    "Tracer",
+    "configure_tracing",
+    "get_tracer",
+    "inherit_span",
+    "span",
+]
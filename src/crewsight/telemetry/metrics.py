@@ -0,0 +1,137 @@
+"""
+Span Metrics
+
+In-process aggregation of span timings, rendered in the Prometheus text format.
+
+© 2025 Utilyst Inc. All rights reserved.
+"""
+
+import threading
+from typing import Any, Dict, List, Tuple
+
+
+# Histogram bucket upper bounds in seconds, from single requests to whole runs
+DURATION_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0
+)
+
+
+def _labels(**labels: str) -> str:
+    """Format Prometheus labels, escaping quotes, backslashes and newlines."""
+    escaped = (
+        f'{name}="'
+        + str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        + '"'
+        for name, value in labels.items()
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+class SpanMetrics:
+    """
+    Aggregates finished spans into duration histograms and counters.
+    
+    Every span is counted in ``crewsight_span_duration_seconds`` by name and
+    status. Spans carrying a ``bytes`` attribute add to
+    ``crewsight_span_bytes_total``, and spans carrying ``input_tokens`` or
+    ``output_tokens`` add to ``crewsight_llm_tokens_total`` by ``model``.
+    
+    © 2025 Utilyst Inc. All rights reserved.
+    """
+    
+    def __init__(self, buckets: Tuple[float, ...] = DURATION_BUCKETS):
+        """
+        Initialize the metrics.
+        
+        Args:
+            buckets: Upper bounds in seconds of the duration histogram buckets
+        """
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._durations: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._bytes: Dict[str, int] = {}
+        self._tokens: Dict[Tuple[str, str], int] = {}
+    
+    def observe(self, name: str, seconds: float, status: str, attributes: Dict[str, Any]) -> None:
+        """Add one finished span."""
+        with self._lock:
+            histogram = self._durations.setdefault(
+                (name, status), {'buckets': [0] * len(self.buckets), 'count': 0, 'sum': 0.0}
+            )
+            histogram['count'] += 1
+            histogram['sum'] += seconds
+            for index, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    histogram['buckets'][index] += 1
+                    break
+            
+            if isinstance(attributes.get('bytes'), int):
+                self._bytes[name] = self._bytes.get(name, 0) + attributes['bytes']
+            model = str(attributes.get('model', 'unknown'))
+            for kind in ('input', 'output'):
+                tokens = attributes.get(f'{kind}_tokens')
+                if isinstance(tokens, int):
+                    self._tokens[(model, kind)] = self._tokens.get((model, kind), 0) + tokens
+    
+    def summary(self) -> List[Dict[str, Any]]:
+        """
+        Return the total time per span name, longest first.
+        
+        Returns:
+            List[Dict]: ``span``, ``count``, ``errors`` and ``seconds`` per name
+        """
+        totals: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            for (name, status), histogram in self._durations.items():
+                total = totals.setdefault(
+                    name, {'span': name, 'count': 0, 'errors': 0, 'seconds': 0.0}
+                )
+                total['count'] += histogram['count']
+                total['seconds'] += histogram['sum']
+                if status == 'error':
+                    total['errors'] += histogram['count']
+        return sorted(totals.values(), key=lambda total: total['seconds'], reverse=True)
+    
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = [
+            "# HELP crewsight_span_duration_seconds Duration of pipeline spans.",
+            "# TYPE crewsight_span_duration_seconds histogram",
+        ]
+        with self._lock:
+            for (name, status), histogram in sorted(self._durations.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, histogram['buckets']):
+                    cumulative += count
+                    lines.append(
+                        f"crewsight_span_duration_seconds_bucket"
+                        f"{_labels(span=name, status=status, le=repr(bound))} {cumulative}"
+                    )
+                lines.append(
+                    f"crewsight_span_duration_seconds_bucket"
+                    f"{_labels(span=name, status=status, le='+Inf')} {histogram['count']}"
+                )
+                lines.append(
+                    f"crewsight_span_duration_seconds_sum"
+                    f"{_labels(span=name, status=status)} {histogram['sum']:.6f}"
+                )
+                lines.append(
+                    f"crewsight_span_duration_seconds_count"
+                    f"{_labels(span=name, status=status)} {histogram['count']}"
+                )
+            
+            lines += [
+                "# HELP crewsight_span_bytes_total Bytes transferred within spans.",
+                "# TYPE crewsight_span_bytes_total counter",
+            ]
+            for name, total in sorted(self._bytes.items()):
+                lines.append(f"crewsight_span_bytes_total{_labels(span=name)} {total}")
+            
+            lines += [
+                "# HELP crewsight_llm_tokens_total Estimated LLM tokens by model and direction.",
+                "# TYPE crewsight_llm_tokens_total counter",
+            ]
+            for (model, kind), total in sorted(self._tokens.items()):
+                lines.append(f"crewsight_llm_tokens_total{_labels(model=model, type=kind)} {total}")
+        
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,196 @@
+"""
+Tracing
+
+Nested timing spans for the processing pipeline, exported as JSON lines.
+
+© 2025 Utilyst Inc. All rights reserved.
+"""
+
+import contextvars
+import json
+import os
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+from src.crewsight.telemetry.metrics import SpanMetrics
+
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar(
+    'crewsight_current_span', default=None
+)
+
+
+class Span:
+    """One timed operation of a trace; attributes may be added while it is open."""
+    
+    def __init__(self, name: str, parent: Optional["Span"], attributes: Dict[str, Any]):
+        self.name = name
+        self.trace_id = parent.trace_id if parent else secrets.token_hex(16)
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent.span_id if parent else None
+        self.start = time.time()
+        self.attributes = attributes
+    
+    def set(self, **attributes: Any) -> None:
+        """Add or replace attributes of the span."""
+        self.attributes.update(attributes)
+
+
+class Tracer:
+    """
+    Records spans and feeds their timings to the span metrics.
+    
+    Spans nest through a context variable, so a span opened while another
+    is open in the same thread (or in a worker whose pool was created with
+    :func:`inherit_span`) becomes its child and shares its trace ID. Each
+    finished span is appended to ``path`` as one JSON line with its trace,
+    span and parent IDs, start time, duration, status and attributes.
+    
+    © 2025 Utilyst Inc. All rights reserved.
+    """
+    
+    def __init__(self, path: Optional[str] = None, metrics: Optional[SpanMetrics] = None):
+        """
+        Initialize the tracer.
+        
+        Args:
+            path: JSON-lines file receiving finished spans; None to only
+                aggregate metrics
+            metrics: Span metrics to update; a new instance by default
+        """
+        self.path = Path(path) if path else None
+        self.metrics = metrics or SpanMetrics()
+        self._lock = threading.Lock()
+        self._file = None
+    
+    @classmethod
+    def from_env(cls, metrics: Optional[SpanMetrics] = None) -> "Tracer":
+        """Create a tracer exporting to ``TRACE_FILE``, if set."""
+        return cls(os.getenv("TRACE_FILE") or None, metrics)
+    
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span]:
+        """
+        Time the enclosed block as a span.
+        
+        An exception leaving the block, or an ``error`` attribute set on the
+        span, marks the span as an error; the exception is re-raised.
+        
+        Args:
+            name: Span name, e.g. ``"drive.download"``
+            **attributes: Initial attributes; more can be set on the yielded span
+        """
+        current = Span(name, _current_span.get(), attributes)
+        token = _current_span.set(current)
+        started = time.perf_counter()
+        error = None
+        try:
+            yield current
+        except BaseException as e:
+            error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _current_span.reset(token)
+            self._finish(current, time.perf_counter() - started, error)
+    
+    def record(
+        self,
+        name: str,
+        seconds: float,
+        start: Optional[float] = None,
+        **attributes: Any,
+    ) -> None:
+        """
+        Record an operation timed elsewhere, e.g. in a worker process.
+        
+        Args:
+            name: Span name
+            seconds: Duration of the operation
+            start: Start as a Unix timestamp; by default ``seconds`` before now
+            **attributes: Span attributes; ``error`` marks the span as an error
+        """
+        completed = Span(name, _current_span.get(), attributes)
+        completed.start = start if start is not None else time.time() - seconds
+        self._finish(completed, seconds, None)
+    
+    def _finish(self, finished: Span, seconds: float, error: Optional[str]) -> None:
+        """Update the metrics with a finished span and export it."""
+        error = error or finished.attributes.pop('error', None)
+        status = 'error' if error else 'ok'
+        self.metrics.observe(finished.name, seconds, status, finished.attributes)
+        if self.path is None:
+            return
+        
+        record = {
+            'trace_id': finished.trace_id,
+            'span_id': finished.span_id,
+            'parent_id': finished.parent_id,
+            'name': finished.name,
+            'start': round(finished.start, 6),
+            'duration_ms': round(seconds * 1000, 3),
+            'status': status,
+            'attributes': finished.attributes
+        }
+        if error:
+            record['error'] = error
+        line = json.dumps(record, default=str)
+        
+        with self._lock:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.path, 'a', encoding='utf-8', buffering=1)
+            self._file.write(line + "\n")
+    
+    def close(self) -> None:
+        """Close the export file."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+_tracer: Optional[Tracer] = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer() -> Tracer:
+    """Return the process-wide tracer, created from the environment on first use."""
+    global _tracer
+    with _tracer_lock:
+        if _tracer is None:
+            _tracer = Tracer.from_env()
+        return _tracer
+
+
+def configure_tracing(path: Optional[str]) -> Tracer:
+    """
+    Replace the process-wide tracer, keeping the metrics collected so far.
+    
+    Args:
+        path: JSON-lines file receiving finished spans; None to stop exporting
+    """
+    global _tracer
+    previous = get_tracer()
+    with _tracer_lock:
+        previous.close()
+        _tracer = Tracer(path, previous.metrics)
+        return _tracer
+
+
+def span(name: str, **attributes: Any):
+    """Time the enclosed block as a span of the process-wide tracer; see :meth:`Tracer.span`."""
+    return get_tracer().span(name, **attributes)
+
+
+def inherit_span() -> Dict[str, Any]:
+    """
+    Return ``ThreadPoolExecutor`` arguments that make the current span the
+    parent of spans opened by the pool's workers.
+    
+    Only for pools created for the duration of the current span.
+    """
+    return {'initializer': _current_span.set, 'initargs': (_current_span.get(),)}
@@ -0,0 +1,237 @@
+"""
+Document Catalog
+
+Compact, typed catalog of a retrieval run, stored as JSON lines, with a
+terse text view for agents and a tool to query it.
+
+© 2025 Utilyst Inc. All rights reserved.
+"""
+
+import json
+import os
+from collections import Counter
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from crewai_tools import BaseTool
+from pydantic import ConfigDict
+
+
+@dataclass(frozen=True, slots=True)
+class CatalogRecord:
+    """One file of a retrieval run."""
+    id: str
+    name: str
+    ext: str
+    type: str
+    status: str
+    size: Optional[int] = None
+    modified: Optional[str] = None
+    sync: Optional[str] = None
+    cached: bool = False
+    error: Optional[str] = None
+    
+    @classmethod
+    def from_file(cls, file_info: Dict[str, Any]) -> "CatalogRecord":
+        """Create a record from a file of the Drive tool's results."""
+        size = file_info.get('file_size', file_info.get('size'))
+        return cls(
+            id=file_info['id'],
+            name=file_info['name'],
+            ext=Path(file_info['name']).suffix.lower().lstrip('.'),
+            type=file_info.get('type', 'Unknown'),
+            status=file_info['status'],
+            size=int(size) if size is not None else None,
+            modified=(file_info.get('modified_time') or '')[:10] or None,
+            sync=file_info.get('sync_status'),
+            cached=bool(file_info.get('cached')),
+            error=file_info.get('error') if file_info['status'] != 'success' else None
+        )
+    
+    def row(self) -> str:
+        """Render the record as one ``name|ext|kb|modified|flags`` row."""
+        flags = [] if self.status == 'success' else [self.status]
+        if self.cached:
+            flags.append('cached')
+        if self.sync:
+            flags.append(self.sync)
+        if self.error:
+            flags.append(self.error.replace('|', '/').replace('\n', ' ')[:80])
+        size = str(round(self.size / 1024)) if self.size is not None else ''
+        return f"{self.name}|{self.ext}|{size}|{self.modified or ''}|{','.join(flags)}"
+
+
+ROW_HEADER = "name|ext|kb|modified|flags"
+
+
+class DocumentCatalog:
+    """
+    Catalog of the files of one retrieval run.
+    
+    Written once per run as JSON lines (one :class:`CatalogRecord` per
+    line) and rendered for agents as a header with counts followed by one
+    pipe-separated row per file, instead of a decorated report.
+    
+    © 2025 Utilyst Inc. All rights reserved.
+    """
+    
+    def __init__(self, folder_id: str, records: List[CatalogRecord]):
+        """
+        Initialize the catalog.
+        
+        Args:
+            folder_id: Drive folder the files were retrieved from
+            records: One record per listed file
+        """
+        self.folder_id = folder_id
+        self.records = records
+        self.path: Optional[Path] = None
+    
+    @classmethod
+    def from_results(cls, results: Dict[str, Any]) -> "DocumentCatalog":
+        """Create a catalog from the Drive tool's results (``last_results``)."""
+        return cls(results['folder_id'], [CatalogRecord.from_file(f) for f in results['files']])
+    
+    @classmethod
+    def load(cls, path: str) -> "DocumentCatalog":
+        """Read a catalog written by :meth:`write`."""
+        names = {field.name for field in fields(CatalogRecord)}
+        records = []
+        folder_id = Path(path).stem
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    data = json.loads(line)
+                    records.append(CatalogRecord(**{k: v for k, v in data.items() if k in names}))
+        catalog = cls(folder_id, records)
+        catalog.path = Path(path)
+        return catalog
+    
+    def write(self, path: str) -> Path:
+        """Write the catalog as JSON lines, replacing any earlier one atomically."""
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".jsonl.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.writelines(
+                json.dumps(asdict(record), separators=(',', ':')) + "\n" for record in self.records
+            )
+        os.replace(tmp_path, self.path)
+        return self.path
+    
+    def query(
+        self,
+        file_type: str = "",
+        name: str = "",
+        min_kb: Optional[float] = None,
+        max_kb: Optional[float] = None,
+        status: str = "",
+    ) -> List[CatalogRecord]:
+        """
+        Return the records matching every given filter.
+        
+        Args:
+            file_type: Extension (``pdf``) or type name (``Word Document``), case-insensitive
+            name: Case-insensitive substring of the file name or path
+            min_kb: Minimum size in KB
+            max_kb: Maximum size in KB
+            status: ``success``, ``skipped`` or ``failed``, or a sync status
+                (``new``, ``modified``, ``unchanged``)
+        """
+        file_type = file_type.lower().lstrip('.')
+        name = name.lower()
+        status = status.lower()
+        matches = []
+        for record in self.records:
+            if file_type and file_type not in (record.ext, record.type.lower()):
+                continue
+            if name and name not in record.name.lower():
+                continue
+            if min_kb is not None and (record.size is None or record.size < min_kb * 1024):
+                continue
+            if max_kb is not None and (record.size is None or record.size > max_kb * 1024):
+                continue
+            if status and status not in (record.status, record.sync):
+                continue
+            matches.append(record)
+        return matches
+    
+    def render(
+        self,
+        records: Optional[Iterable[CatalogRecord]] = None,
+        max_rows: int = 200,
+        header: str = "",
+    ) -> str:
+        """
+        Render records (all by default) as a terse text view.
+        
+        Args:
+            records: Records to list
+            max_rows: Rows listed before the rest are summarized as a count
+            header: Lines placed before the counts
+        """
+        records = self.records if records is None else list(records)
+        statuses = Counter(record.status for record in records)
+        types = Counter(record.ext or '?' for record in records)
+        lines = [header] if header else []
+        lines.append(
+            f"files {len(records)}: "
+            + ", ".join(f"{count} {status}" for status, count in statuses.most_common())
+        )
+        lines.append("types: " + ", ".join(f"{ext} {count}" for ext, count in types.most_common()))
+        lines.append(ROW_HEADER)
+        lines.extend(record.row() for record in records[:max_rows])
+        if len(records) > max_rows:
+            lines.append(f"... {len(records) - max_rows} more; query the Document Catalog tool")
+        return "\n".join(lines)
+
+
+class DocumentCatalogTool(BaseTool):
+    """
+    Tool for querying the catalog of the current run's retrieved files.
+    
+    © 2025 Utilyst Inc. All rights reserved.
+    """
+    
+    model_config = ConfigDict(extra='allow')
+    
+    name: str = "Document Catalog"
+    description: str = (
+        "Query the catalog of retrieved files by type (extension such as pdf, or type "
+        "name), name substring, size range in KB, or status (success, skipped, failed, "
+        "new, modified, unchanged). All arguments are optional; returns one "
+        "name|ext|kb|modified|flags row per matching file."
+    )
+    
+    def __init__(self, max_rows: int = 200):
+        """
+        Initialize the tool.
+        
+        Args:
+            max_rows: Maximum number of rows returned per query
+        """
+        super().__init__()
+        self.max_rows = max_rows
+        self.catalog: Optional[DocumentCatalog] = None
+    
+    def set_catalog(self, catalog: Optional[DocumentCatalog]) -> None:
+        """Register the catalog of the current run."""
+        self.catalog = catalog
+    
+    def _run(
+        self,
+        file_type: str = "",
+        name: str = "",
+        min_kb: Optional[float] = None,
+        max_kb: Optional[float] = None,
+        status: str = "",
+    ) -> str:
+        """Main execution method for the tool."""
+        if self.catalog is None:
+            return "No documents have been retrieved yet."
+        
+        matches = self.catalog.query(file_type, name, min_kb, max_kb, status)
+        if not matches:
+            return "No files match."
+        return self.catalog.render(matches, self.max_rows)
@@ -0,0 +1,65 @@
+"""
+Document Search Tool
+
+Tool for top-k semantic search over the indexed document chunks.
+
+© 2025 Utilyst Inc. All rights reserved.
+"""
+
+from typing import FrozenSet, Iterable, Optional
+
+from crewai_tools import BaseTool
+from pydantic import ConfigDict
+
+from src.crewsight.retrieval import VectorIndex
+
+
+class DocumentSearchTool(BaseTool):
+    """
+    Tool for querying the VectorIndex of downloaded documents.
+    
+    © 2025 Utilyst Inc. All rights reserved.
+    """
+    
+    model_config = ConfigDict(extra='allow')
+    
+    name: str = "Document Search"
+    description: str = (
+        "Find the passages of the retrieved documents most relevant to a query. "
+        "Call with a natural-language query and optionally top_k (default 5); "
+        "returns matching passages with their document names and similarity scores."
+    )
+    
+    def __init__(self, index: VectorIndex, max_top_k: int = 20):
+        """
+        Initialize the tool.
+        
+        Args:
+            index: Vector index of the downloaded documents
+            max_top_k: Upper bound on the passages returned per query
+        """
+        super().__init__()
+        self.index = index
+        self.max_top_k = max_top_k
+        # Documents of the current run; None searches every indexed document
+        self.documents: Optional[FrozenSet[str]] = None
+    
+    def set_documents(self, documents: Iterable[str]) -> None:
+        """Limit searches to the documents of the current run."""
+        self.documents = frozenset(documents)
+    
+    def _run(self, query: str, top_k: int = 5) -> str:
+        """Main execution method for the tool."""
+        matches = self.index.search(
+            query, top_k=max(1, min(int(top_k), self.max_top_k)), documents=self.documents
+        )
+        if not matches:
+            return "No indexed passages match the query."
+        
+        lines = [f"Top {len(matches)} passages for: {query}"]
+        for rank, match in enumerate(matches, start=1):
+            lines.append(
+                f"\n[{rank}] {match['document']} (chunk {match['chunk']}, "
+                f"score {match['score']:.3f})\n{match['text']}"
+            )
+        return "\n".join(lines) + "\n"
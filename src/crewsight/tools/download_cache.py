@@ -0,0 +1,306 @@
+"""
+Download Cache
+
+Persistent, content-addressed cache of files downloaded from Google Drive.
+
+© 2025 Utilyst Inc. All rights reserved.
+"""
+
+import hashlib
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+def hash_file(path: Path) -> str:
+    """Compute the SHA-256 digest of a file."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class DownloadCache:
+    """
+    Content-addressed cache for Drive downloads.
+    
+    File contents are stored once under ``objects/<sha256>`` regardless of
+    how many Drive files or folders reference them. A SQLite index maps each
+    Drive file ID to its content digest together with the ``ETag`` and
+    ``Last-Modified`` validators returned by Drive, which are replayed as a
+    conditional request on the next download, and to the MD5 checksum Drive
+    lists for it, so a file whose content is already cached under another
+    ID (e.g. the same manual in several folders) needs no download at all.
+    Total stored bytes are bounded by evicting the least recently used objects.
+    
+    © 2025 Utilyst Inc. All rights reserved.
+    """
+    
+    def __init__(self, cache_dir: str, max_bytes: int = 2 * 1024 ** 3):
+        """
+        Initialize the cache.
+        
+        Args:
+            cache_dir: Directory holding the index and the stored objects
+            max_bytes: Upper bound on the total size of stored objects
+        """
+        self.cache_dir = Path(cache_dir)
+        self.objects_dir = self.cache_dir / "objects"
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.cache_dir / "index.db"), check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                file_id TEXT PRIMARY KEY,
+                sha256 TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        columns = {row['name'] for row in self._db.execute("PRAGMA table_info(entries)")}
+        if 'md5' not in columns:
+            self._db.execute("ALTER TABLE entries ADD COLUMN md5 TEXT")
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_sha256 ON entries (sha256)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_md5 ON entries (md5)")
+        self._db.commit()
+        
+        self._hits = 0
+        self._misses = 0
+        self._bytes_saved = 0
+    
+    def _object_path(self, sha256: str) -> Path:
+        """Return the storage path of the object with the given digest."""
+        return self.objects_dir / sha256[:2] / sha256
+    
+    @staticmethod
+    def _link_or_copy(source: Path, destination: Path) -> None:
+        """Hard-link ``source`` to ``destination``, copying when linking is not possible."""
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = destination.with_name(destination.name + ".link")
+        if tmp_path.exists():
+            tmp_path.unlink()
+        try:
+            os.link(source, tmp_path)
+        except OSError:
+            shutil.copy2(source, tmp_path)
+        os.replace(tmp_path, destination)
+    
+    def lookup(self, file_id: str) -> Optional[Dict[str, Any]]:
+        """Return the cache entry for a Drive file, or None if it is not cached."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT * FROM entries WHERE file_id = ?", (file_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        
+        entry = dict(row)
+        if not self._object_path(entry['sha256']).exists():
+            self.discard(file_id)
+            return None
+        return entry
+    
+    def lookup_content(self, md5: str) -> Optional[Dict[str, Any]]:
+        """Return a cache entry of any Drive file with the given MD5 checksum, or None."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT * FROM entries WHERE md5 = ? ORDER BY last_used DESC LIMIT 1", (md5,)
+            ).fetchone()
+        if row is None or not self._object_path(row['sha256']).exists():
+            return None
+        return dict(row)
+    
+    def link(self, file_id: str, entry: Dict[str, Any], destination: Path) -> Dict[str, Any]:
+        """
+        Serve a Drive file from another file's cached content and index it.
+        
+        Records a cache hit. The new entry has no validators, so the next
+        download of ``file_id`` is unconditional unless its content is still
+        shared.
+        
+        Args:
+            file_id: Drive file ID to index
+            entry: Cache entry with the same content, from :meth:`lookup_content`
+            destination: Where the file is placed
+        
+        Returns:
+            Dict: The new cache entry
+        """
+        self._link_or_copy(self._object_path(entry['sha256']), destination)
+        linked = {
+            'file_id': file_id,
+            'sha256': entry['sha256'],
+            'size': entry['size'],
+            'etag': None,
+            'last_modified': None,
+            'md5': entry['md5'],
+            'last_used': time.time(),
+        }
+        with self._lock:
+            self._db.execute(
+                """
+                INSERT OR REPLACE INTO entries
+                    (file_id, sha256, size, etag, last_modified, md5, last_used)
+                VALUES (:file_id, :sha256, :size, :etag, :last_modified, :md5, :last_used)
+                """,
+                linked,
+            )
+            self._db.commit()
+            self._hits += 1
+            self._bytes_saved += entry['size']
+        return linked
+    
+    def conditional_headers(self, entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """Build the revalidation headers for a cached entry."""
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+    
+    def materialize(self, entry: Dict[str, Any], destination: Path) -> Path:
+        """
+        Place a cached object at ``destination`` and record the cache hit.
+        
+        Returns:
+            Path: The destination path
+        """
+        self._link_or_copy(self._object_path(entry['sha256']), destination)
+        with self._lock:
+            self._db.execute(
+                "UPDATE entries SET last_used = ? WHERE file_id = ?",
+                (time.time(), entry['file_id']),
+            )
+            self._db.commit()
+            self._hits += 1
+            self._bytes_saved += entry['size']
+        return destination
+    
+    def store(
+        self,
+        file_id: str,
+        source: Path,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        sha256: Optional[str] = None,
+        md5: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Add a freshly downloaded file to the cache and record the cache miss.
+        
+        Args:
+            file_id: Drive file ID
+            source: Path of the downloaded file
+            etag: ``ETag`` response header, if any
+            last_modified: ``Last-Modified`` response header, if any
+            sha256: Precomputed digest of the file, hashed here when omitted
+            md5: MD5 checksum listed by Drive, for finding the content by checksum
+        
+        Returns:
+            Dict: The new cache entry
+        """
+        sha256 = sha256 or hash_file(source)
+        object_path = self._object_path(sha256)
+        if not object_path.exists():
+            self._link_or_copy(source, object_path)
+        
+        entry = {
+            'file_id': file_id,
+            'sha256': sha256,
+            'size': object_path.stat().st_size,
+            'etag': etag,
+            'last_modified': last_modified,
+            'md5': md5,
+            'last_used': time.time(),
+        }
+        with self._lock:
+            previous = self._db.execute(
+                "SELECT sha256 FROM entries WHERE file_id = ?", (file_id,)
+            ).fetchone()
+            self._db.execute(
+                """
+                INSERT OR REPLACE INTO entries
+                    (file_id, sha256, size, etag, last_modified, md5, last_used)
+                VALUES (:file_id, :sha256, :size, :etag, :last_modified, :md5, :last_used)
+                """,
+                entry,
+            )
+            self._db.commit()
+            self._misses += 1
+            
+            if previous and previous['sha256'] != sha256:
+                self._remove_unreferenced(previous['sha256'])
+        
+        self.evict()
+        return entry
+    
+    def _remove_unreferenced(self, sha256: str) -> None:
+        """Delete a stored object once no index entry references it."""
+        referenced = self._db.execute(
+            "SELECT 1 FROM entries WHERE sha256 = ? LIMIT 1", (sha256,)
+        ).fetchone()
+        if not referenced:
+            try:
+                self._object_path(sha256).unlink()
+            except FileNotFoundError:
+                pass
+    
+    def discard(self, file_id: str) -> None:
+        """Remove the index entry for a Drive file."""
+        with self._lock:
+            self._db.execute("DELETE FROM entries WHERE file_id = ?", (file_id,))
+            self._db.commit()
+    
+    def evict(self) -> int:
+        """
+        Evict least recently used objects until the cache fits ``max_bytes``.
+        
+        Returns:
+            int: Number of bytes freed
+        """
+        freed = 0
+        with self._lock:
+            objects = self._db.execute(
+                """
+                SELECT sha256, MAX(size) AS size, MAX(last_used) AS last_used
+                FROM entries GROUP BY sha256 ORDER BY last_used ASC
+                """
+            ).fetchall()
+            total = sum(row['size'] for row in objects)
+            
+            for row in objects:
+                if total <= self.max_bytes:
+                    break
+                self._db.execute("DELETE FROM entries WHERE sha256 = ?", (row['sha256'],))
+                try:
+                    self._object_path(row['sha256']).unlink()
+                except FileNotFoundError:
+                    pass
+                total -= row['size']
+                freed += row['size']
+            
+            self._db.commit()
+        return freed
+    
+    def stats(self) -> Dict[str, int]:
+        """Return hit, miss and bytes-saved counters."""
+        with self._lock:
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'bytes_saved': self._bytes_saved,
+            }
@@ -0,0 +1,165 @@
+"""
+Drive Listing
+
+Recursive, paginated folder enumeration through the Drive v3 files API.
+
+© 2025 Utilyst Inc. All rights reserved.
+"""
+
+import re
+import threading
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import PurePosixPath
+from typing import Any, Dict, List, Optional
+
+from src.crewsight.tools.drive_session import DriveSession
+
+
+FOLDER_MIME_TYPE = "application/vnd.google-apps.folder"
+SHORTCUT_MIME_TYPE = "application/vnd.google-apps.shortcut"
+
+# Only the metadata the processor uses, to keep listing responses small
+LISTING_FIELDS = (
+    "id,name,mimeType,size,modifiedTime,md5Checksum,"
+    "shortcutDetails(targetId,targetMimeType)"
+)
+
+
+def safe_name(name: str) -> str:
+    """Make a Drive item name usable as a single path component."""
+    name = re.sub(r'[/\\\x00]', '_', name).strip()
+    return name if name not in ('', '.', '..') else '_'
+
+
+def unique_names(files: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Give files sharing a local name (Drive allows duplicates) distinct names.
+    
+    Every file whose name repeats, case-insensitively, is renamed to
+    ``name (<first 8 characters of its ID>).ext``, so concurrent downloads
+    never write the same path and each file keeps its name across runs.
+    """
+    counts = Counter(f['name'].lower() for f in files)
+    for file_info in files:
+        if counts[file_info['name'].lower()] > 1:
+            path = PurePosixPath(file_info['name'])
+            file_info['name'] = str(
+                path.with_name(f"{path.stem} ({file_info['id'][:8]}){path.suffix}")
+            )
+    return files
+
+
+class DriveLister:
+    """
+    Lists every file below a Drive folder with its metadata.
+    
+    Each folder is paged through with ``pageToken`` using the largest page
+    size and a ``fields`` projection limited to the metadata the processor
+    needs. Subfolders, including folders reached through shortcuts, are
+    traversed breadth-first, with different folders listed concurrently on
+    a thread pool. Folders already visited are skipped so shortcut cycles
+    terminate.
+    
+    © 2025 Utilyst Inc. All rights reserved.
+    """
+    
+    def __init__(
+        self,
+        session: DriveSession,
+        list_api_url: str,
+        api_key: Optional[str] = None,
+        max_workers: int = 8,
+        page_size: int = 1000,
+        max_depth: int = 10,
+    ):
+        """
+        Initialize the lister.
+        
+        Args:
+            session: HTTP session used for the listing requests
+            list_api_url: URL of the Drive v3 ``files`` endpoint
+            api_key: Google API key; required by Drive for public folders
+                when no OAuth credentials are used
+            max_workers: Maximum number of folders listed concurrently
+            page_size: Items requested per page (Drive allows up to 1000)
+            max_depth: Maximum subfolder depth below the root folder
+        """
+        self.session = session
+        self.list_api_url = list_api_url
+        self.api_key = api_key
+        self.max_workers = max(1, max_workers)
+        self.page_size = page_size
+        self.max_depth = max_depth
+        self.requests_made = 0
+        self._lock = threading.Lock()
+    
+    def _list_folder(self, folder_id: str) -> List[Dict[str, Any]]:
+        """Return the direct children of a folder, following every page."""
+        items: List[Dict[str, Any]] = []
+        page_token: Optional[str] = None
+        while True:
+            params = {
+                'q': f"'{folder_id}' in parents and trashed = false",
+                'fields': f"nextPageToken,files({LISTING_FIELDS})",
+                'pageSize': self.page_size,
+                'supportsAllDrives': 'true',
+                'includeItemsFromAllDrives': 'true',
+            }
+            if self.api_key:
+                params['key'] = self.api_key
+            if page_token:
+                params['pageToken'] = page_token
+            
+            response = self.session.get(self.list_api_url, params=params)
+            with self._lock:
+                self.requests_made += 1
+            response.raise_for_status()
+            page = response.json()
+            items.extend(page.get('files', []))
+            
+            page_token = page.get('nextPageToken')
+            if not page_token:
+                return items
+    
+    def list(self, folder_id: str) -> List[Dict[str, Any]]:
+        """
+        List every file below a folder.
+        
+        Returns:
+            List[Dict]: Drive file resources, sorted by path, each with a
+            ``path`` key holding the folder path relative to the root
+            (``""`` for files directly in it). Shortcuts to files are
+            returned as the target file under the shortcut's name.
+        """
+        files: List[Dict[str, Any]] = []
+        visited = {folder_id}
+        
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="drive-list"
+        ) as pool:
+            pending = {pool.submit(self._list_folder, folder_id): ("", 0)}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path, depth = pending.pop(future)
+                    for item in future.result():
+                        shortcut = item.get('shortcutDetails')
+                        if item.get('mimeType') == SHORTCUT_MIME_TYPE and shortcut:
+                            item = dict(
+                                item,
+                                id=shortcut['targetId'],
+                                mimeType=shortcut.get('targetMimeType', ''),
+                            )
+                        
+                        if item.get('mimeType') != FOLDER_MIME_TYPE:
+                            files.append(dict(item, path=path))
+                        elif depth < self.max_depth and item['id'] not in visited:
+                            visited.add(item['id'])
+                            subfolder_path = f"{path}/{safe_name(item['name'])}".lstrip('/')
+                            pending[pool.submit(self._list_folder, item['id'])] = (
+                                subfolder_path, depth + 1
+                            )
+        
+        files.sort(key=lambda f: (f['path'], f['name']))
+        return files
@@ -0,0 +1,179 @@
+"""
+Drive HTTP Session
+
+Shared, pooled HTTP session used by the Google Drive tools, with keep-alive
+connections, timeouts and jittered exponential backoff.
+
+© 2025 Utilyst Inc. All rights reserved.
+"""
+
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+class DriveSession:
+    """
+    Thread-safe pooled HTTP session with retry and backoff.
+    
+    A single instance is shared by every download thread of a tool so that
+    TCP and TLS connections are kept alive and reused across files. Failed
+    requests (connection errors, timeouts, 429 and 5xx responses) are retried
+    with full-jitter exponential backoff, honoring ``Retry-After`` when the
+    server sends one.
+    
+    © 2025 Utilyst Inc. All rights reserved.
+    """
+    
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 16,
+        connect_timeout: float = 10.0,
+        read_timeout: float = 60.0,
+        max_retries: int = 4,
+        backoff_factor: float = 0.5,
+        backoff_max: float = 30.0,
+    ):
+        """
+        Initialize the session.
+        
+        Args:
+            pool_connections: Number of per-host connection pools to keep
+            pool_maxsize: Maximum number of connections kept per host
+            connect_timeout: Seconds to wait for a connection to be established
+            read_timeout: Seconds to wait between bytes from the server
+            max_retries: Retries after the first attempt before giving up
+            backoff_factor: Base delay in seconds for exponential backoff
+            backoff_max: Upper bound in seconds for any single retry delay
+        """
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max(0, max_retries)
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=True,
+            max_retries=0,
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._retries = 0
+        self._failures = 0
+    
+    def _backoff_delay(self, attempt: int, response: Optional[requests.Response]) -> float:
+        """Compute the delay before retry number ``attempt`` (starting at 0)."""
+        if response is not None:
+            retry_after = self._parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                return min(retry_after, self.backoff_max)
+        
+        ceiling = min(self.backoff_max, self.backoff_factor * (2 ** attempt))
+        return random.uniform(0, ceiling)
+    
+    @staticmethod
+    def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """Parse a ``Retry-After`` header given either in seconds or as an HTTP date."""
+        if not value:
+            return None
+        
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+        
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        """
+        Send a GET request, retrying transient failures.
+        
+        Accepts the same keyword arguments as ``requests.get``. The last
+        response is returned once retries are exhausted; the last exception
+        is re-raised if no response was ever received.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        
+        for attempt in range(self.max_retries + 1):
+            with self._lock:
+                self._requests += 1
+            
+            response = None
+            try:
+                response = self._session.get(url, **kwargs)
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    return response
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.max_retries:
+                    with self._lock:
+                        self._failures += 1
+                    raise
+            
+            if attempt == self.max_retries:
+                with self._lock:
+                    self._failures += 1
+                return response
+            
+            delay = self._backoff_delay(attempt, response)
+            if response is not None:
+                response.close()
+            with self._lock:
+                self._retries += 1
+            time.sleep(delay)
+        
+        raise RuntimeError("unreachable")
+    
+    def _pool_counters(self) -> Dict[str, int]:
+        """Sum connection and request counters over the live connection pools."""
+        opened = sent = 0
+        for adapter in set(self._session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                try:
+                    pool = pools[key]
+                except KeyError:
+                    continue
+                opened += pool.num_connections
+                sent += pool.num_requests
+        return {'opened': opened, 'sent': sent}
+    
+    def stats(self) -> Dict[str, int]:
+        """
+        Return connection reuse and retry counters.
+        
+        ``connections_reused`` counts requests served over an already open
+        keep-alive connection.
+        """
+        counters = self._pool_counters()
+        with self._lock:
+            return {
+                'requests': self._requests,
+                'retries': self._retries,
+                'failures': self._failures,
+                'connections_opened': counters['opened'],
+                'connections_reused': max(0, counters['sent'] - counters['opened']),
+            }
+    
+    def close(self) -> None:
+        """Close all pooled connections."""
+        self._session.close()
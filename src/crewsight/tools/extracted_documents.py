@@ -0,0 +1,71 @@
+"""
+Extracted Documents Tool
+
+Tool giving agents the locally extracted text of retrieved documents.
+
+© 2025 Utilyst Inc. All rights reserved.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, List
+
+from crewai_tools import BaseTool
+from pydantic import ConfigDict
+
+
+class ExtractedDocumentsTool(BaseTool):
+    """
+    Tool for reading documents extracted by the ExtractionPipeline.
+    
+    © 2025 Utilyst Inc. All rights reserved.
+    """
+    
+    model_config = ConfigDict(extra='allow')
+    
+    name: str = "Extracted Document Reader"
+    description: str = (
+        "Read the normalized text and tables extracted from the retrieved documents. "
+        "Call with an empty file_name to list the extracted documents, or with a "
+        "file name from that list to get its text."
+    )
+    
+    def __init__(self, max_chars: int = 40000):
+        """
+        Initialize the tool.
+        
+        Args:
+            max_chars: Maximum number of characters returned per document
+        """
+        super().__init__()
+        self.max_chars = max_chars
+        self.documents: Dict[str, Dict[str, Any]] = {}
+    
+    def set_documents(self, results: List[Dict[str, Any]]) -> None:
+        """Register the results of an extraction run."""
+        self.documents = {result['file_name']: result for result in results}
+    
+    def _run(self, file_name: str = "") -> str:
+        """Main execution method for the tool."""
+        if not self.documents:
+            return "No documents have been extracted yet."
+        
+        if not file_name:
+            lines = ["Extracted Documents", ""]
+            for name, result in self.documents.items():
+                if result['status'] == 'success':
+                    lines.append(f"- {name} ({result['chars']} chars, {result['tables']} tables)")
+                else:
+                    lines.append(f"- {name} [not extracted: {result.get('error', 'Unknown')}]")
+            return "\n".join(lines)
+        
+        result = self.documents.get(file_name)
+        if result is None:
+            return f"Unknown document: {file_name}. Call with an empty file_name to list documents."
+        if result['status'] != 'success':
+            return f"{file_name} could not be extracted: {result.get('error', 'Unknown')}"
+        
+        text = Path(result['text_path']).read_text(encoding='utf-8')
+        if len(text) > self.max_chars:
+            truncated = f"[Truncated at {self.max_chars} of {len(text)} chars]"
+            text = text[:self.max_chars] + f"\n\n{truncated}"
+        return text
@@ -0,0 +1,127 @@
+"""
+Map-Reduce Analysis Tool
+
+Tool running the chunked map-reduce analysis over extracted documents.
+
+© 2025 Utilyst Inc. All rights reserved.
+"""
+
+import hashlib
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from crewai_tools import BaseTool
+from pydantic import ConfigDict
+
+from src.crewsight.analysis import MapReduceAnalyzer
+from src.crewsight.tools.extracted_documents import ExtractedDocumentsTool
+
+
+class MapReduceAnalysisTool(BaseTool):
+    """
+    Tool for analyzing every extracted document with a MapReduceAnalyzer.
+    
+    The analysis runs once per focus and is reused if the agent calls the
+    tool again. Only the cross-document analysis is returned; per-document
+    analyses are written to a file under ``output_dir`` and returned one at
+    a time on request, so the agent's context stays bounded however many
+    documents the folder holds.
+    
+    © 2025 Utilyst Inc. All rights reserved.
+    """
+    
+    model_config = ConfigDict(extra='allow')
+    
+    name: str = "Map-Reduce Document Analyzer"
+    description: str = (
+        "Analyze all extracted documents at once, regardless of their size. "
+        "Call with the analysis focus; returns the cross-document analysis and "
+        "where the per-document analyses are stored. Call again with the same "
+        "focus and a document_name to read one document's analysis."
+    )
+    
+    def __init__(
+        self,
+        documents_tool: ExtractedDocumentsTool,
+        analyzer: MapReduceAnalyzer,
+        stats_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+        output_dir: str = "./downloads/.analyses",
+    ):
+        """
+        Initialize the tool.
+        
+        Args:
+            documents_tool: Tool holding this run's extracted documents
+            analyzer: Analyzer used for the map-reduce
+            stats_callback: Receives the per-stage statistics of each analysis
+            output_dir: Directory receiving the per-document analyses
+        """
+        super().__init__()
+        self.documents_tool = documents_tool
+        self.analyzer = analyzer
+        self.stats_callback = stats_callback
+        self.output_dir = Path(output_dir)
+        self.results: Dict[str, Dict[str, Any]] = {}
+    
+    def _analyses_path(self, analysis_focus: str) -> Path:
+        """Return the file of the per-document analyses of this run's documents for a focus."""
+        digest = hashlib.sha256(analysis_focus.encode('utf-8'))
+        for result in sorted(self.documents_tool.documents.values(), key=lambda r: r['file_name']):
+            digest.update(result.get('text_path', result['file_name']).encode('utf-8'))
+        return self.output_dir / f"{digest.hexdigest()[:16]}.md"
+    
+    def _run(
+        self,
+        analysis_focus: str = "general content analysis",
+        document_name: str = "",
+    ) -> str:
+        """Main execution method for the tool."""
+        documents = {
+            name: Path(result['text_path']).read_text(encoding='utf-8')
+            for name, result in self.documents_tool.documents.items()
+            if result['status'] == 'success'
+        }
+        if not documents:
+            return "No documents have been extracted yet."
+        
+        if analysis_focus not in self.results:
+            result = self.analyzer.analyze(documents, analysis_focus)
+            result['path'] = self._analyses_path(analysis_focus)
+            result['path'].parent.mkdir(parents=True, exist_ok=True)
+            result['path'].write_text("\n\n".join(
+                f"# {name}\n\n{analysis}" for name, analysis in result['documents'].items()
+            ), encoding='utf-8')
+            self.results[analysis_focus] = result
+            if self.stats_callback:
+                self.stats_callback(result['stats'])
+        result = self.results[analysis_focus]
+        
+        if document_name:
+            analysis = result['documents'].get(document_name)
+            if analysis is None:
+                return (
+                    f"No analysis for '{document_name}'; the Extracted Document Reader "
+                    f"lists the document names."
+                )
+            return f"# {document_name}\n\n{analysis}"
+        
+        sections = [
+            "# Cross-Document Analysis",
+            result['summary'],
+            f"Per-document analyses of {len(result['documents'])} documents: {result['path']}. "
+            f"Call this tool again with a document_name to read one.",
+        ]
+        
+        stats = result['stats']
+        stats_lines = ["# Analysis Statistics"]
+        for stage in ('map', 'reduce_document', 'reduce_folder'):
+            stage_stats = stats.get(stage, {})
+            stats_lines.append(
+                f"- {stage}: {stage_stats.get('calls', 0)} calls, "
+                f"~{stage_stats.get('input_tokens', 0)} tokens in, "
+                f"~{stage_stats.get('output_tokens', 0)} tokens out, "
+                f"{stage_stats.get('wall_seconds', 0):.1f}s"
+            )
+        sections.append("\n".join(stats_lines))
+        
+        return "\n\n".join(sections)
@@ -0,0 +1,55 @@
+"""
+Previous Analyses Tool
+
+Tool exposing the stored analyses of files left unchanged by an incremental sync.
+
+© 2025 Utilyst Inc. All rights reserved.
+"""
+
+from crewai_tools import BaseTool
+from pydantic import ConfigDict
+
+from src.crewsight.tools.public_google_drive_processor import PublicGoogleDriveProcessorTool
+
+
+class PreviousAnalysesTool(BaseTool):
+    """
+    Tool returning the reusable analyses recorded by the last incremental sync.
+    
+    © 2025 Utilyst Inc. All rights reserved.
+    """
+    
+    model_config = ConfigDict(extra='allow')
+    
+    name: str = "Previous Analyses Reader"
+    description: str = (
+        "Retrieve the analyses produced on earlier runs for documents that have not "
+        "changed since. Use them together with the analyses of new or modified "
+        "documents; newer analyses take precedence where they overlap."
+    )
+    
+    def __init__(self, drive_tool: PublicGoogleDriveProcessorTool):
+        """Initialize the tool with the Drive processor whose manifest it reads."""
+        super().__init__()
+        self.drive_tool = drive_tool
+    
+    def _run(self) -> str:
+        """Main execution method for the tool."""
+        manifest = self.drive_tool.last_manifest
+        
+        if manifest is None:
+            return "No incremental sync has run yet; there are no previous analyses."
+        
+        analyses = manifest.reusable_analyses()
+        
+        if not analyses:
+            return "No previous analyses to reuse; every document was analyzed on this run."
+        
+        lines = [
+            "Previous Analyses (unchanged documents)",
+            "=======================================",
+        ]
+        for file_name, analysis in analyses.items():
+            lines.append(f"\n## {file_name}\n\n{analysis}")
+        
+        return "\n".join(lines) + "\n"
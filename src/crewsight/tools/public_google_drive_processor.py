@@ -6,14 +6,40 @@ Tool for accessing and processing documents from publicly shared Google Drive fo
 © 2025 Utilyst Inc. All rights reserved.
 """
 
+import copy
+import html
 import os
 import re
-import requests
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-from urllib.parse import urlparse, parse_qs
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlencode, urljoin, urlparse, parse_qs
 
 from crewai_tools import BaseTool
+from pydantic import ConfigDict
+
+from src.crewsight.telemetry import inherit_span, span
+from src.crewsight.tools.document_catalog import DocumentCatalog
+from src.crewsight.tools.download_cache import DownloadCache
+from src.crewsight.tools.drive_listing import DriveLister, safe_name, unique_names
+from src.crewsight.tools.drive_session import DriveSession
+from src.crewsight.tools.streaming_download import FileTooLarge, stream_download
+from src.crewsight.tools.sync_manifest import SYNC_UNCHANGED, SyncManifest
+
+
+GOOGLE_APPS_MIME_PREFIX = "application/vnd.google-apps."
+
+# Export format per native Google Workspace type: (export MIME type, file extension)
+EXPORT_FORMATS = {
+    "application/vnd.google-apps.document": ("text/plain", ".txt"),
+    "application/vnd.google-apps.spreadsheet": ("text/csv", ".csv"),
+    "application/vnd.google-apps.presentation": ("text/plain", ".txt"),
+    "application/vnd.google-apps.drawing": ("application/pdf", ".pdf"),
+    "application/vnd.google-apps.script": ("application/vnd.google-apps.script+json", ".json"),
+}
 
 
 class PublicGoogleDriveProcessorTool(BaseTool):
@@ -23,22 +49,94 @@ class PublicGoogleDriveProcessorTool(BaseTool):
     © 2025 Utilyst Inc. All rights reserved.
     """
     
+    # crewai tools are pydantic models; allow the runtime state set in __init__
+    model_config = ConfigDict(extra='allow')
+    
     name: str = "Public Google Drive Processor"
     description: str = (
         "Access and download documents from publicly shared Google Drive folders. "
         "Provide a Google Drive folder URL and this tool will retrieve all accessible files. "
-        "Returns a structured list of files with metadata and download status."
+        "Returns a compact catalog: run statistics, then one name|ext|kb|modified|flags "
+        "row per file with its download status."
     )
     
-    def __init__(self, download_dir: str = "./downloads"):
-        """Initialize the Google Drive processor."""
+    def __init__(
+        self,
+        download_dir: str = "./downloads",
+        max_workers: int = 8,
+        max_connections_per_host: int = 4,
+        session: Optional[DriveSession] = None,
+        use_cache: bool = True,
+        cache_max_bytes: int = 2 * 1024 ** 3,
+        incremental: bool = False,
+        chunk_size: int = 1024 * 1024,
+        download_attempts: int = 3,
+        api_key: Optional[str] = None,
+        max_depth: int = 10,
+        max_file_size: Optional[int] = 512 * 1024 ** 2,
+        progress_interval: float = 0.5,
+    ):
+        """
+        Initialize the Google Drive processor.
+        
+        Args:
+            download_dir: Directory where downloaded files are stored
+            max_workers: Maximum number of concurrent downloads per folder
+            max_connections_per_host: Maximum number of simultaneous
+                connections opened against a single host
+            session: Shared HTTP session; a pooled session sized for
+                ``max_connections_per_host`` is created when omitted
+            use_cache: Keep a persistent download cache under
+                ``download_dir/.cache`` and revalidate cached files instead
+                of downloading them again
+            cache_max_bytes: Maximum total size of the download cache
+            incremental: Compare each run against the folder's manifest
+                under ``download_dir/.manifests`` and flag which files are
+                new, modified or unchanged since the last run
+            chunk_size: Read and write buffer size in bytes for downloads
+            download_attempts: Attempts per file; interrupted transfers are
+                resumed from their ``.part`` file with a Range request
+            api_key: Google API key for listing folders through the Drive v3
+                API; defaults to ``GOOGLE_API_KEY``. Without one, listing falls
+                back to reading the folder's web page, which only sees the
+                first page of files and no subfolders
+            max_depth: Maximum subfolder depth traversed when listing
+            max_file_size: Maximum size in bytes of a downloaded file. Files
+                listed as larger are skipped without being downloaded, and
+                downloads are aborted once they pass it; None for no limit
+            progress_interval: Minimum seconds between a file's
+                ``download_progress`` events; its last chunk is always reported
+        """
         super().__init__()
         self.download_dir = Path(download_dir)
         self.download_dir.mkdir(parents=True, exist_ok=True)
         
+        self.max_workers = max(1, max_workers)
+        self.max_connections_per_host = max(1, max_connections_per_host)
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._host_slots_lock = threading.Lock()
+        self.session = session or DriveSession(pool_maxsize=self.max_connections_per_host)
+        self.cache = (
+            DownloadCache(str(self.download_dir / ".cache"), max_bytes=cache_max_bytes)
+            if use_cache else None
+        )
+        self.incremental = incremental
+        self.last_manifest: Optional[SyncManifest] = None
+        self.last_results: Optional[Dict[str, Any]] = None
+        self.last_catalog: Optional[DocumentCatalog] = None
+        self.chunk_size = max(8192, chunk_size)
+        self.download_attempts = max(1, download_attempts)
+        
+        # Optional progress hook, called with an event type and event data
+        self.progress_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None
+        
         self.list_api_url = "https://www.googleapis.com/drive/v3/files"
         self.download_url = "https://www.googleapis.com/drive/v3/files/{file_id}/export"
         self.direct_download_url = "https://drive.google.com/uc?export=download&id={file_id}"
+        self.api_key = api_key or os.getenv("GOOGLE_API_KEY")
+        self.max_depth = max_depth
+        self.max_file_size = max_file_size
+        self.progress_interval = progress_interval
     
     def _extract_folder_id(self, url: str) -> Optional[str]:
         """Extract the folder ID from a Google Drive URL."""
@@ -73,23 +171,82 @@ class PublicGoogleDriveProcessorTool(BaseTool):
         return type_mapping.get(extension, 'Unknown')
     
     def _list_files_in_folder(self, folder_id: str) -> List[Dict[str, Any]]:
-        """List all files in a public Google Drive folder."""
+        """
+        List all files in a public Google Drive folder and its subfolders.
+        
+        Uses the Drive v3 API when an API key is configured and falls back
+        to the folder's web page otherwise, or if the API request fails.
+        Files in subfolders are named by their path relative to the folder,
+        and files sharing a name are told apart by their ID (see
+        :func:`unique_names`).
+        """
+        with span('drive.list', folder_id=folder_id) as current:
+            files = None
+            if self.api_key:
+                try:
+                    files = self._list_files_from_api(folder_id)
+                    current.set(source='api')
+                except Exception as e:
+                    print(f"Drive API listing failed, reading folder page instead: {str(e)}")
+            
+            if files is None:
+                files = self._list_files_from_page(folder_id)
+                current.set(source='page')
+            current.set(files=len(files))
+            return unique_names(files)
+    
+    def _list_files_from_api(self, folder_id: str) -> List[Dict[str, Any]]:
+        """List a folder tree with its metadata through the Drive v3 files API."""
+        lister = DriveLister(
+            self.session,
+            self.list_api_url,
+            api_key=self.api_key,
+            max_workers=self.max_workers,
+            max_depth=self.max_depth,
+        )
+        
         files = []
+        for item in lister.list(folder_id):
+            name = f"{item['path']}/{safe_name(item['name'])}".lstrip('/')
+            export_format = EXPORT_FORMATS.get(item.get('mimeType'))
+            if export_format and not name.endswith(export_format[1]):
+                # Native files are exported, so name them after the export format
+                name += export_format[1]
+            files.append({
+                'id': item['id'],
+                'name': name,
+                'type': self._get_file_type(name),
+                'url': f"https://drive.google.com/file/d/{item['id']}/view",
+                'mime_type': item.get('mimeType'),
+                'size': int(item['size']) if item.get('size') else None,
+                'modified_time': item.get('modifiedTime'),
+                'md5_checksum': item.get('md5Checksum')
+            })
+        return files
+    
+    def _list_files_from_page(self, folder_id: str) -> List[Dict[str, Any]]:
+        """List the files shown on a public folder's web page."""
+        files = []
+        seen_ids = set()
         
         try:
             folder_url = f"https://drive.google.com/drive/folders/{folder_id}"
-            response = requests.get(folder_url, allow_redirects=True)
+            response = self.session.get(folder_url, allow_redirects=True)
             
             if response.status_code == 200:
                 content = response.text
                 
-                file_id_pattern = r'data-id="([a-zA-Z0-9_-]+)"'
-                file_ids = re.findall(file_id_pattern, content)
-                
-                file_name_pattern = r'data-tooltip="([^"]+)"'
-                file_names = re.findall(file_name_pattern, content)
-                
-                for file_id, file_name in zip(file_ids, file_names):
+                # Pair each ID with the first tooltip before the next ID, so a
+                # missing tooltip cannot shift every later name onto the wrong file
+                entries = re.split(r'(?=data-id="[a-zA-Z0-9_-]+")', content)[1:]
+                for entry in entries:
+                    file_id = re.match(r'data-id="([a-zA-Z0-9_-]+)"', entry).group(1)
+                    name_match = re.search(r'data-tooltip="([^"]+)"', entry)
+                    if not name_match or file_id in seen_ids:
+                        continue
+                    seen_ids.add(file_id)
+                    
+                    file_name = safe_name(name_match.group(1))
                     files.append({
                         'id': file_id,
                         'name': file_name,
@@ -98,40 +255,246 @@ class PublicGoogleDriveProcessorTool(BaseTool):
                     })
             
             return files
-            
+        
         except Exception as e:
             print(f"Error listing files: {str(e)}")
             return []
     
-    def _download_file(self, file_id: str, file_name: str) -> Dict[str, Any]:
-        """Download a file from Google Drive."""
+    def for_run(
+        self,
+        incremental: bool = False,
+        progress_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+    ) -> "PublicGoogleDriveProcessorTool":
+        """
+        Return a copy of the tool for a single run.
+        
+        The copy shares the HTTP session, download cache and per-host
+        connection limits with this tool but has its own incremental setting,
+        manifest and progress callback.
+        """
+        run_tool = copy.copy(self)
+        run_tool.incremental = incremental
+        run_tool.last_manifest = None
+        run_tool.last_results = None
+        run_tool.last_catalog = None
+        run_tool.progress_callback = progress_callback
+        return run_tool
+    
+    def _emit(self, event_type: str, data: Dict[str, Any]) -> None:
+        """Report a progress event to the progress callback, if one is set."""
+        if self.progress_callback:
+            self.progress_callback(event_type, data)
+    
+    def _progress_reporter(self, file_name: str) -> Callable[[int, Optional[int]], None]:
+        """Return a download progress hook emitting at most one event per ``progress_interval``."""
+        last_reported = [float('-inf')]
+        
+        def report(written: int, total: Optional[int]) -> None:
+            now = time.monotonic()
+            if written == total or now - last_reported[0] >= self.progress_interval:
+                last_reported[0] = now
+                self._emit(
+                    'download_progress', {'file_name': file_name, 'bytes': written, 'total': total}
+                )
+        return report
+    
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        """Return the semaphore limiting concurrent connections to the URL's host."""
+        host = urlparse(url).netloc
+        with self._host_slots_lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = threading.BoundedSemaphore(self.max_connections_per_host)
+                self._host_slots[host] = slot
+            return slot
+    
+    def _source_url(self, file_id: str, mime_type: Optional[str]) -> Optional[str]:
+        """
+        Return the URL a file's contents are fetched from.
+        
+        Native Google Docs, Sheets and Slides have no binary content and are
+        exported to compact text formats through the export endpoint;
+        drawings are exported to PDF. Other native types (forms, sites,
+        maps, ...) cannot be exported and return None. Everything else is
+        downloaded directly.
+        """
+        if not mime_type or not mime_type.startswith(GOOGLE_APPS_MIME_PREFIX):
+            return self.direct_download_url.format(file_id=file_id)
+        
+        export_format = EXPORT_FORMATS.get(mime_type)
+        if export_format is None:
+            return None
+        
+        params = {'mimeType': export_format[0]}
+        if self.api_key:
+            params['key'] = self.api_key
+        return self.download_url.format(file_id=file_id) + "?" + urlencode(params)
+    
+    def _confirm_url(self, page: str, url: str, headers: Any) -> Optional[str]:
+        """
+        Return the URL that confirms a large-file download, or None.
+        
+        Drive answers direct downloads of files too large to virus-scan with
+        a warning page instead of the file. Depending on its generation, the
+        page carries a download form (whose hidden fields include the confirm
+        token), a ``confirm=`` link, or a ``download_warning`` cookie.
+        """
+        form = re.search(r'<form[^>]*id="download-form"[^>]*action="([^"]+)"', page)
+        if form:
+            fields = dict(re.findall(
+                r'<input[^>]*type="hidden"[^>]*name="([^"]+)"[^>]*value="([^"]*)"', page
+            ))
+            if fields:
+                action = urljoin(url, html.unescape(form.group(1)))
+                fields = {name: html.unescape(value) for name, value in fields.items()}
+                return action + ("&" if "?" in action else "?") + urlencode(fields)
+        
+        link = re.search(r'href="([^"]*[?&]confirm=[^"]+)"', page)
+        if link:
+            return urljoin(url, html.unescape(link.group(1)))
+        
+        cookie = re.search(r'download_warning[^=]*=([^;]+)', headers.get('Set-Cookie', ''))
+        if cookie:
+            return f"{url}&confirm={cookie.group(1)}"
+        
+        return None
+    
+    @staticmethod
+    def _is_html(file_name: str, mime_type: Optional[str]) -> bool:
+        """Whether a listed file is itself an HTML document."""
+        if mime_type:
+            return mime_type == 'text/html'
+        # Page-scrape listings carry no MIME type
+        return Path(file_name).suffix.lower() in ('.html', '.htm')
+    
+    def _download_file(
+        self,
+        file_id: str,
+        file_name: str,
+        mime_type: Optional[str] = None,
+        md5_checksum: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Download a file from Google Drive, exporting native Google files.
+        
+        A file not yet cached under its own ID whose listed MD5 checksum
+        matches cached content of another file is served from the cache
+        without a request. An HTML response is taken for a Drive interstitial
+        page only when the file itself is not an HTML document.
+        """
         try:
-            download_url = self.direct_download_url.format(file_id=file_id)
-            response = requests.get(download_url, stream=True)
+            download_url = self._source_url(file_id, mime_type)
+            if download_url is None:
+                return {
+                    'status': 'skipped',
+                    'file_name': file_name,
+                    'error': f"Google file type cannot be exported: {mime_type}"
+                }
             
-            if response.status_code == 200:
-                file_path = self.download_dir / file_name
+            file_path = self.download_dir / file_name
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            cache_entry = self.cache.lookup(file_id) if self.cache else None
+            headers = self.cache.conditional_headers(cache_entry) if self.cache else {}
+            
+            shared_entry = (
+                self.cache.lookup_content(md5_checksum)
+                if self.cache and cache_entry is None and md5_checksum else None
+            )
+            if shared_entry:
+                self.cache.link(file_id, shared_entry, file_path)
+                return {
+                    'status': 'success',
+                    'file_name': file_name,
+                    'file_path': str(file_path),
+                    'file_size': shared_entry['size'],
+                    'file_size_mb': round(shared_entry['size'] / (1024 * 1024), 2),
+                    'sha256': shared_entry['sha256'],
+                    'cached': True,
+                    'deduplicated': True
+                }
+            
+            with self._host_slot(download_url):
+                print(f"Downloading: {file_name}")
+                self._emit('download_started', {'file_id': file_id, 'file_name': file_name})
+                download_kwargs = dict(
+                    headers=headers,
+                    chunk_size=self.chunk_size,
+                    attempts=self.download_attempts,
+                    progress=self._progress_reporter(file_name),
+                    max_bytes=self.max_file_size,
+                    allow_html=self._is_html(file_name, mime_type),
+                )
+                download = stream_download(self.session, download_url, file_path, **download_kwargs)
+                
+                if 'html' in download:
+                    confirm_url = self._confirm_url(
+                        download['html'], download_url, download['headers']
+                    )
+                    if confirm_url is None:
+                        return {
+                            'status': 'failed',
+                            'file_name': file_name,
+                            'error': "Drive returned a web page instead of the file "
+                                     "(access denied or download quota exceeded)"
+                        }
+                    download = stream_download(
+                        self.session, confirm_url, file_path, **download_kwargs
+                    )
+                    if 'html' in download:
+                        return {
+                            'status': 'failed',
+                            'file_name': file_name,
+                            'error': "Drive did not accept the large-file download confirmation"
+                        }
+            
+            if download['status_code'] == 304 and cache_entry:
+                self.cache.materialize(cache_entry, file_path)
                 
-                with open(file_path, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        f.write(chunk)
+                return {
+                    'status': 'success',
+                    'file_name': file_name,
+                    'file_path': str(file_path),
+                    'file_size': cache_entry['size'],
+                    'file_size_mb': round(cache_entry['size'] / (1024 * 1024), 2),
+                    'sha256': cache_entry['sha256'],
+                    'cached': True
+                }
+            elif download['status_code'] == 200:
+                file_size = download['size']
+                sha256 = download['sha256']
                 
-                file_size = os.path.getsize(file_path)
+                if self.cache:
+                    self.cache.store(
+                        file_id,
+                        file_path,
+                        etag=download['headers'].get('ETag'),
+                        last_modified=download['headers'].get('Last-Modified'),
+                        sha256=sha256,
+                        md5=md5_checksum,
+                    )
                 
                 return {
                     'status': 'success',
                     'file_name': file_name,
                     'file_path': str(file_path),
                     'file_size': file_size,
-                    'file_size_mb': round(file_size / (1024 * 1024), 2)
+                    'file_size_mb': round(file_size / (1024 * 1024), 2),
+                    'sha256': sha256,
+                    'cached': False
                 }
             else:
                 return {
                     'status': 'failed',
                     'file_name': file_name,
-                    'error': f"HTTP {response.status_code}"
+                    'error': f"HTTP {download['status_code']}"
                 }
-                
+        
+        except FileTooLarge as e:
+            return {
+                'status': 'skipped',
+                'file_name': file_name,
+                'error': str(e)
+            }
         except Exception as e:
             return {
                 'status': 'failed',
@@ -139,6 +502,88 @@ class PublicGoogleDriveProcessorTool(BaseTool):
                 'error': str(e)
             }
     
+    def _download_files(self, files: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Download a folder's files concurrently.
+        
+        Downloads run on a thread pool bounded by ``max_workers`` and, per
+        host, by ``max_connections_per_host``. Files whose listed size is
+        over ``max_file_size`` are skipped without a request. Results are
+        returned in the same order as ``files`` regardless of completion order.
+        """
+        if not files:
+            return []
+        
+        download_results: List[Optional[Dict[str, Any]]] = [None] * len(files)
+        workers = min(self.max_workers, len(files))
+        
+        def download(file_info: Dict[str, Any]) -> Dict[str, Any]:
+            with span('drive.download', file_name=file_info['name']) as current:
+                download_result = self._download_file(
+                    file_info['id'],
+                    file_info['name'],
+                    file_info.get('mime_type'),
+                    file_info.get('md5_checksum')
+                )
+                current.set(
+                    status=download_result['status'],
+                    cached=download_result.get('cached', False),
+                    bytes=(
+                        0 if download_result.get('cached') else download_result.get('file_size', 0)
+                    )
+                )
+                if download_result['status'] == 'failed':
+                    current.set(error=download_result.get('error'))
+                return download_result
+        
+        def finished(index: int, download_result: Dict[str, Any]) -> None:
+            download_results[index] = download_result
+            self._emit('download_finished', {
+                'file_name': download_result['file_name'],
+                'status': download_result['status'],
+                'file_size': download_result.get('file_size'),
+                'cached': download_result.get('cached', False),
+                'error': download_result.get('error')
+            })
+        
+        with span('drive.downloads', files=len(files)), ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="drive-download", **inherit_span()
+        ) as pool:
+            futures = {}
+            for index, file_info in enumerate(files):
+                listed_size = file_info.get('size')
+                if (
+                    self.max_file_size is not None and listed_size
+                    and listed_size > self.max_file_size
+                ):
+                    finished(index, {
+                        'status': 'skipped',
+                        'file_name': file_info['name'],
+                        'error': f"{round(listed_size / (1024 * 1024), 1)} MB is over the "
+                                 f"{round(self.max_file_size / (1024 * 1024), 1)} MB limit; "
+                                 f"not downloaded"
+                    })
+                    continue
+                
+                futures[pool.submit(download, file_info)] = index
+            
+            for future in as_completed(futures):
+                finished(futures[future], future.result())
+        
+        return download_results
+    
+    def _sync_manifest(self, folder_id: str, files: List[Dict[str, Any]]) -> SyncManifest:
+        """Flag each downloaded file's sync status and record the run in the folder manifest."""
+        manifest = SyncManifest(str(self.download_dir / ".manifests"), folder_id)
+        
+        for file_info in files:
+            if file_info['status'] == 'success':
+                file_info['sync_status'] = manifest.classify(file_info)
+        
+        manifest.record_run(files)
+        manifest.save()
+        return manifest
+    
     def _run(self, url: str) -> str:
         """Main execution method for the tool."""
         folder_id = self._extract_folder_id(url)
@@ -147,6 +592,8 @@ class PublicGoogleDriveProcessorTool(BaseTool):
             return "Error: Could not extract folder ID from URL."
         
         print(f"Processing folder: {folder_id}")
+        http_stats_before = self.session.stats()
+        cache_stats_before = self.cache.stats() if self.cache else {}
         
         files = self._list_files_in_folder(folder_id)
         
@@ -154,6 +601,20 @@ class PublicGoogleDriveProcessorTool(BaseTool):
             return f"Warning: No files found in folder. Folder ID: {folder_id}"
         
         print(f"Found {len(files)} files")
+        self._emit('files_listed', {
+            'folder_id': folder_id,
+            'total_files': len(files),
+            'files': [
+                {
+                    'id': f['id'],
+                    'name': f['name'],
+                    'type': f['type'],
+                    'size': f.get('size'),
+                    'modified_time': f.get('modified_time')
+                }
+                for f in files
+            ]
+        })
         
         results = {
             'folder_id': folder_id,
@@ -161,39 +622,62 @@ class PublicGoogleDriveProcessorTool(BaseTool):
             'total_files': len(files),
             'files': [],
             'successful_downloads': 0,
-            'failed_downloads': 0
+            'failed_downloads': 0,
+            'skipped_downloads': 0,
+            'http_stats': {},
+            'cache_stats': {}
         }
         
-        for file_info in files:
-            print(f"Downloading: {file_info['name']}")
-            download_result = self._download_file(file_info['id'], file_info['name'])
-            
+        for file_info, download_result in zip(files, self._download_files(files)):
             file_info.update(download_result)
             results['files'].append(file_info)
             
             if download_result['status'] == 'success':
                 results['successful_downloads'] += 1
+            elif download_result['status'] == 'skipped':
+                results['skipped_downloads'] += 1
             else:
                 results['failed_downloads'] += 1
         
-        summary = f"""
-Google Drive Processing Complete
-=================================
-
-Folder ID: {folder_id}
-Total Files: {results['total_files']}
-Successful Downloads: {results['successful_downloads']}
-Failed Downloads: {results['failed_downloads']}
-
-Files Downloaded:
-"""
+        http_stats = {
+            key: value - http_stats_before.get(key, 0)
+            for key, value in self.session.stats().items()
+        }
+        results['http_stats'] = http_stats
         
-        for file_info in results['files']:
-            if file_info['status'] == 'success':
-                summary += f"\n✓ {file_info['name']} ({file_info.get('file_size_mb', 0)} MB)"
-            else:
-                summary += f"\n✗ {file_info['name']} - Error: {file_info.get('error', 'Unknown')}"
+        if self.incremental:
+            self.last_manifest = self._sync_manifest(folder_id, results['files'])
+        
+        self.last_results = results
+        
+        if self.cache:
+            results['cache_stats'] = {
+                key: value - cache_stats_before.get(key, 0)
+                for key, value in self.cache.stats().items()
+            }
+        
+        catalog = DocumentCatalog.from_results(results)
+        catalog.write(str(self.download_dir / ".catalogs" / f"{folder_id}.jsonl"))
+        self.last_catalog = catalog
         
-        summary += f"\n\nAll files saved to: {self.download_dir}\n"
+        header = [
+            f"folder {folder_id} -> {self.download_dir} (catalog: {catalog.path})",
+            f"http: {http_stats['requests']} requests, {http_stats['connections_reused']} reused, "
+            f"{http_stats['retries']} retries"
+        ]
+        if results['cache_stats']:
+            cache_stats = results['cache_stats']
+            header.append(
+                f"cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, "
+                f"{round(cache_stats['bytes_saved'] / (1024 * 1024), 2)} MB saved"
+            )
+        if self.incremental:
+            statuses = Counter(
+                f.get('sync_status') for f in results['files'] if f['status'] == 'success'
+            )
+            header.append(
+                f"sync: {statuses['new']} new, {statuses['modified']} modified, "
+                f"{statuses[SYNC_UNCHANGED]} unchanged (previous analysis reused)"
+            )
         
-        return summary
+        return catalog.render(header="\n".join(header))
@@ -0,0 +1,193 @@
+"""
+Streaming Download
+
+Resumable, hash-on-the-fly file downloads through a DriveSession.
+
+© 2025 Utilyst Inc. All rights reserved.
+"""
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+import requests
+
+from src.crewsight.tools.drive_session import DriveSession
+
+
+PART_SUFFIX = ".part"
+
+INTERRUPTED_ERRORS = (
+    requests.ConnectionError,
+    requests.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+)
+
+
+# Bytes of an HTML response kept for inspection, e.g. of a confirmation page
+HTML_PREVIEW_BYTES = 512 * 1024
+
+
+class IncompleteDownload(IOError):
+    """Raised when a response body ends before its announced length."""
+
+
+class FileTooLarge(IOError):
+    """Raised when a download exceeds its maximum size."""
+
+
+def _content_range_start(response: requests.Response) -> Optional[int]:
+    """Return the first byte position of a ``206`` response's ``Content-Range``."""
+    match = re.match(r'bytes (\d+)-', response.headers.get('Content-Range', ''))
+    return int(match.group(1)) if match else None
+
+
+def _validator(response: requests.Response) -> Optional[str]:
+    """Return the strongest validator usable in ``If-Range`` for a response."""
+    etag = response.headers.get('ETag')
+    if etag and not etag.startswith('W/'):
+        return etag
+    return response.headers.get('Last-Modified')
+
+
+def _hash_existing(path: Path, chunk_size: int) -> "hashlib._Hash":
+    """Start a SHA-256 digest over the bytes already present in a partial file."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(chunk_size), b''):
+            digest.update(block)
+    return digest
+
+
+def stream_download(
+    session: DriveSession,
+    url: str,
+    destination: Path,
+    headers: Optional[Dict[str, str]] = None,
+    chunk_size: int = 1024 * 1024,
+    attempts: int = 3,
+    progress: Optional[Callable[[int, Optional[int]], None]] = None,
+    max_bytes: Optional[int] = None,
+    allow_html: bool = True,
+) -> Dict[str, Any]:
+    """
+    Stream a URL to ``destination`` through a resumable ``.part`` file.
+    
+    The body is written to ``<destination>.part`` and hashed with SHA-256 as
+    it streams. Once complete, the partial file is atomically renamed to
+    ``destination``. If the transfer is interrupted, the partial file is kept
+    together with the response validator, and the next attempt (in this call
+    or a later one) resumes it with a ``Range``/``If-Range`` request.
+    
+    Args:
+        session: HTTP session used for the requests
+        url: URL to download
+        destination: Final path of the downloaded file
+        headers: Extra request headers, e.g. cache revalidation headers
+        chunk_size: Size in bytes of the read and write buffers
+        attempts: Number of attempts, resuming after each interruption
+        progress: Called after every chunk with the bytes written so far and
+            the total size, when known
+        max_bytes: Maximum file size; larger files are rejected from their
+            ``Content-Length`` or as soon as the limit is passed while streaming
+        allow_html: When False, an HTML response to a full request is not
+            written to disk but returned as ``html``, e.g. so the caller can
+            handle an interstitial page served instead of the file
+    
+    Returns:
+        Dict: ``status_code`` and ``headers`` of the final response and, when
+        the status code is 200, the file's ``sha256``, ``size`` and the
+        ``resumed_from`` byte offset, or ``html`` (the start of the page)
+        when ``allow_html`` is False and the response is an HTML page
+    
+    Raises:
+        FileTooLarge: The file is larger than ``max_bytes``; no partial
+            file is kept
+    """
+    part_path = destination.with_name(destination.name + PART_SUFFIX)
+    meta_path = destination.with_name(destination.name + PART_SUFFIX + ".json")
+    last_error: Optional[Exception] = None
+    
+    for _ in range(max(1, attempts)):
+        offset = part_path.stat().st_size if part_path.exists() else 0
+        meta = json.loads(meta_path.read_text()) if offset and meta_path.exists() else {}
+        
+        request_headers = dict(headers or {})
+        if offset and meta.get('validator'):
+            request_headers['Range'] = f"bytes={offset}-"
+            request_headers['If-Range'] = meta['validator']
+        
+        try:
+            with session.get(url, stream=True, headers=request_headers) as response:
+                if response.status_code == 206 and _content_range_start(response) == offset:
+                    mode = 'ab'
+                    digest = _hash_existing(part_path, chunk_size)
+                elif response.status_code == 200:
+                    if not allow_html and 'text/html' in response.headers.get('Content-Type', ''):
+                        html = response.raw.read(HTML_PREVIEW_BYTES, decode_content=True)
+                        return {
+                            'status_code': 200,
+                            'headers': response.headers,
+                            'html': html.decode(response.encoding or 'utf-8', 'replace')
+                        }
+                    mode = 'wb'
+                    digest = hashlib.sha256()
+                    offset = 0
+                    meta_path.write_text(json.dumps({'validator': _validator(response)}))
+                elif response.status_code in (206, 416):
+                    part_path.unlink(missing_ok=True)
+                    meta_path.unlink(missing_ok=True)
+                    last_error = IncompleteDownload(f"Unusable partial content for {url}")
+                    continue
+                else:
+                    return {'status_code': response.status_code, 'headers': response.headers}
+                
+                # Content-Length counts encoded bytes, so only check identity responses
+                expected = (
+                    response.headers.get('Content-Length')
+                    if response.headers.get('Content-Encoding', 'identity') == 'identity'
+                    else None
+                )
+                total = offset + int(expected) if expected is not None else None
+                if max_bytes is not None and total is not None and total > max_bytes:
+                    raise FileTooLarge(f"File is {total} bytes, over the {max_bytes} byte limit")
+                written = offset
+                with open(part_path, mode, buffering=chunk_size) as f:
+                    for chunk in response.iter_content(chunk_size=chunk_size):
+                        if max_bytes is not None and written + len(chunk) > max_bytes:
+                            raise FileTooLarge(f"File exceeds the {max_bytes} byte limit")
+                        f.write(chunk)
+                        digest.update(chunk)
+                        written += len(chunk)
+                        if progress:
+                            progress(written, total)
+                
+                size = part_path.stat().st_size
+                if expected is not None and size != offset + int(expected):
+                    raise IncompleteDownload(
+                        f"Received {size - offset} of {expected} bytes from {url}"
+                    )
+                response_headers = response.headers
+        
+        except INTERRUPTED_ERRORS + (IncompleteDownload,) as e:
+            last_error = e
+            continue
+        except FileTooLarge:
+            part_path.unlink(missing_ok=True)
+            meta_path.unlink(missing_ok=True)
+            raise
+        
+        os.replace(part_path, destination)
+        meta_path.unlink(missing_ok=True)
+        return {
+            'status_code': 200,
+            'headers': response_headers,
+            'sha256': digest.hexdigest(),
+            'size': size,
+            'resumed_from': offset,
+        }
+    
+    raise last_error or IncompleteDownload(f"Download of {url} did not complete")
@@ -0,0 +1,210 @@
+"""
+Sync Manifest
+
+Per-folder record of the last processed run, used for incremental syncs.
+
+© 2025 Utilyst Inc. All rights reserved.
+"""
+
+import json
+import os
+import re
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+SYNC_NEW = 'new'
+SYNC_MODIFIED = 'modified'
+SYNC_UNCHANGED = 'unchanged'
+
+MARKDOWN_HEADING = re.compile(r'^(#{1,6})[ \t]+(.*?)[ \t#]*$', re.MULTILINE)
+
+
+def split_analysis(analysis: str, file_names: List[str]) -> Dict[str, str]:
+    """
+    Split an analysis into the sections about each file.
+    
+    A section starts at a Markdown heading naming a file and runs until the
+    next heading of the same or a higher level. Text outside such sections,
+    e.g. cross-document findings, belongs to no file.
+    
+    Returns:
+        Dict[str, str]: Section text keyed by file name, for the files that have one
+    """
+    # Longest names first, so "a/report.pdf" is not taken for "report.pdf"
+    names = sorted(file_names, key=len, reverse=True)
+    headings = list(MARKDOWN_HEADING.finditer(analysis))
+    sections: Dict[str, List[str]] = {}
+    for index, heading in enumerate(headings):
+        title = heading.group(2).strip('*_` ')
+        name = next((n for n in names if n in title), None)
+        if name is None:
+            continue
+        level = len(heading.group(1))
+        end = next(
+            (h.start() for h in headings[index + 1:] if len(h.group(1)) <= level), len(analysis)
+        )
+        sections.setdefault(name, []).append(analysis[heading.start():end].strip())
+    return {name: "\n\n".join(parts) for name, parts in sections.items()}
+
+
+class SyncManifest:
+    """
+    Manifest of the files seen in a Drive folder on the previous run.
+    
+    Each entry records the file ID, name, size and SHA-256 digest of a
+    downloaded file, plus the file's own analysis, stored under its ID and
+    digest. Comparing a new listing against the manifest tells which files
+    are new or modified and must be analyzed again, and which analyses can
+    be reused as-is.
+    
+    © 2025 Utilyst Inc. All rights reserved.
+    """
+    
+    def __init__(self, manifest_dir: str, folder_id: str):
+        """
+        Load the manifest of a folder, starting empty if none exists.
+        
+        Args:
+            manifest_dir: Directory holding manifests and stored analyses
+            folder_id: Google Drive folder ID
+        """
+        self.manifest_dir = Path(manifest_dir)
+        self.analyses_dir = self.manifest_dir / "analyses"
+        self.analyses_dir.mkdir(parents=True, exist_ok=True)
+        self.folder_id = folder_id
+        self.path = self.manifest_dir / f"{folder_id}.json"
+        
+        self._lock = threading.Lock()
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.pending: List[str] = []
+        self.unchanged: List[str] = []
+        if self.path.exists():
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+            self.files = data.get('files', {})
+            self.pending = data.get('pending', [])
+    
+    @staticmethod
+    def analysis_id(file_id: str, sha256: Optional[str]) -> str:
+        """Return the ID a file's analysis is stored under for one version of its content."""
+        return f"{file_id}-{(sha256 or 'unknown')[:16]}"
+    
+    def classify(self, file_info: Dict[str, Any]) -> str:
+        """Classify a downloaded file as new, modified or unchanged since the last run."""
+        previous = self.files.get(file_info['id'])
+        if previous is None:
+            return SYNC_NEW
+        
+        unchanged = (
+            previous.get('name') == file_info.get('name')
+            and previous.get('size') == file_info.get('file_size')
+            and previous.get('sha256') == file_info.get('sha256')
+            # Manifests from before per-file analyses hold run-wide ones
+            and previous.get('analysis')
+            == self.analysis_id(file_info['id'], previous.get('sha256'))
+        )
+        return SYNC_UNCHANGED if unchanged else SYNC_MODIFIED
+    
+    def record_run(self, files: List[Dict[str, Any]]) -> None:
+        """
+        Replace the manifest entries with the files of the current run.
+        
+        Files must already carry their ``sync_status``. Unchanged files keep
+        their previous analysis; new and modified files become pending until
+        :meth:`record_analysis` is called. Files that failed to download keep
+        their previous entry so they are retried on the next run.
+        """
+        with self._lock:
+            entries = {}
+            pending = []
+            unchanged = []
+            for file_info in files:
+                previous = self.files.get(file_info['id'])
+                if file_info.get('status') != 'success':
+                    if previous:
+                        entries[file_info['id']] = previous
+                    continue
+                
+                entries[file_info['id']] = {
+                    'name': file_info['name'],
+                    'size': file_info.get('file_size'),
+                    'sha256': file_info.get('sha256'),
+                    'analysis': (
+                        previous.get('analysis')
+                        if previous and file_info.get('sync_status') == SYNC_UNCHANGED
+                        else None
+                    ),
+                }
+                if file_info.get('sync_status') == SYNC_UNCHANGED:
+                    unchanged.append(file_info['id'])
+                else:
+                    pending.append(file_info['id'])
+            
+            self.files = entries
+            self.pending = pending
+            self.unchanged = unchanged
+    
+    def record_analysis(self, analysis: str, file_name: Optional[str] = None) -> None:
+        """
+        Store the analyses of pending files found in an analysis of this run.
+        
+        Each pending file gets its own section of the analysis (see
+        :func:`split_analysis`). Pending files the analysis has no section
+        for stay pending and are analyzed again on the next run.
+        
+        Args:
+            analysis: Analysis output of the run, or of one fan-out branch
+            file_name: The one file the whole analysis is about, if so
+        """
+        with self._lock:
+            pending = {
+                self.files[file_id]['name']: file_id
+                for file_id in self.pending if file_id in self.files
+            }
+            if file_name is not None:
+                sections = {file_name: analysis} if file_name in pending else {}
+            else:
+                sections = split_analysis(analysis, list(pending))
+            
+            for name, text in sections.items():
+                file_id = pending[name]
+                entry = self.files[file_id]
+                analysis_id = self.analysis_id(file_id, entry.get('sha256'))
+                (self.analyses_dir / f"{analysis_id}.md").write_text(text, encoding='utf-8')
+                entry['analysis'] = analysis_id
+            self.pending = [
+                file_id for file_id in self.pending
+                if file_id in self.files and self.files[file_id]['analysis'] is None
+            ]
+    
+    def reusable_analyses(self) -> Dict[str, str]:
+        """
+        Return the stored analyses of the files unchanged on this run.
+        
+        Returns:
+            Dict[str, str]: Analysis text keyed by file name
+        """
+        with self._lock:
+            entries = [self.files[file_id] for file_id in self.unchanged if file_id in self.files]
+        
+        analyses = {}
+        for entry in sorted(entries, key=lambda e: e['name']):
+            analysis_path = self.analyses_dir / f"{entry['analysis']}.md"
+            if analysis_path.exists():
+                analyses[entry['name']] = analysis_path.read_text(encoding='utf-8')
+        return analyses
+    
+    def save(self) -> None:
+        """Write the manifest atomically."""
+        with self._lock:
+            data = {
+                'folder_id': self.folder_id,
+                'updated_at': datetime.now(timezone.utc).isoformat(),
+                'files': self.files,
+                'pending': self.pending,
+            }
+            tmp_path = self.path.with_suffix(".json.tmp")
+            tmp_path.write_text(json.dumps(data, indent=2), encoding='utf-8')
+            os.replace(tmp_path, self.path)
@@ -0,0 +1,102 @@
+"""
+Tests for the SQLite work broker.
+
+© 2025 Utilyst Inc. All rights reserved.
+"""
+
+from api.broker import UNIT_CLAIMED, UNIT_DEAD, UNIT_DONE, UNIT_QUEUED, SQLiteBroker
+
+
+def _broker(tmp_path, **settings):
+    return SQLiteBroker(db_path=str(tmp_path / "broker.db"), **settings)
+
+
+def test_completion_queues_the_follow_up_unit(tmp_path):
+    broker = _broker(tmp_path)
+    broker.enqueue("job", "retrieve", {'url': "folder"})
+    unit = broker.claim("worker-1")
+    
+    assert broker.complete(unit['unit_id'], "worker-1", ("extract", {'files': 3}))
+    
+    follow_up = broker.claim("worker-1")
+    assert (follow_up['job_id'], follow_up['kind']) == ("job", "extract")
+    assert follow_up['payload'] == {'files': 3}
+    assert broker.stats() == {'retrieve': {UNIT_DONE: 1}, 'extract': {UNIT_CLAIMED: 1}}
+
+
+def test_lost_lease_does_not_queue_the_follow_up_twice(tmp_path):
+    broker = _broker(tmp_path, visibility_timeout=0)
+    broker.enqueue("job", "retrieve", {})
+    stalled = broker.claim("worker-1")
+    broker.expire_leases()
+    retried = broker.claim("worker-2")
+    
+    assert broker.complete(retried['unit_id'], "worker-2", ("extract", {}))
+    assert not broker.complete(stalled['unit_id'], "worker-1", ("extract", {}))
+    
+    assert broker.stats()['extract'] == {UNIT_QUEUED: 1}
+
+
+def test_claim_leases_a_unit_to_one_worker_of_its_kind(tmp_path):
+    broker = _broker(tmp_path)
+    broker.enqueue("job", "analyze", {})
+    
+    assert broker.claim("worker-1", kinds=["retrieve"]) is None
+    unit = broker.claim("worker-1", kinds=["analyze"])
+    assert unit['attempts'] == 1
+    assert broker.claim("worker-2") is None
+    assert broker.heartbeat(unit['unit_id'], "worker-1")
+    assert not broker.heartbeat(unit['unit_id'], "worker-2")
+
+
+def test_expired_leases_are_retried_then_dead_lettered(tmp_path):
+    broker = _broker(tmp_path, visibility_timeout=0, max_attempts=2)
+    broker.enqueue("job", "extract", {})
+    
+    broker.claim("worker-1")
+    assert broker.expire_leases() == []
+    unit = broker.claim("worker-2")
+    assert unit['attempts'] == 2
+    assert not broker.heartbeat(unit['unit_id'], "worker-1")
+    
+    dead = broker.expire_leases()
+    assert [d['unit_id'] for d in dead] == [unit['unit_id']]
+    assert "worker-2" in dead[0]['error']
+    assert broker.claim("worker-3") is None
+
+
+def test_failed_units_back_off_and_can_be_retried_by_hand(tmp_path):
+    broker = _broker(tmp_path, max_attempts=2, retry_delay=0)
+    broker.enqueue("job", "analyze", {})
+    
+    unit = broker.claim("worker-1")
+    assert broker.fail(unit, "worker-1", "timeout") == UNIT_QUEUED
+    unit = broker.claim("worker-1")
+    assert broker.fail(unit, "worker-1", "timeout again") == UNIT_DEAD
+    assert broker.fail(unit, "worker-1", "lease lost") is None
+    assert [d['error'] for d in broker.dead_letters()] == ["timeout again"]
+    
+    assert broker.retry_dead() == ["job"]
+    assert broker.claim("worker-1")['attempts'] == 1
+
+
+def test_failed_unit_waits_for_its_retry_delay(tmp_path):
+    broker = _broker(tmp_path, retry_delay=60)
+    broker.enqueue("job", "analyze", {})
+    
+    broker.fail(broker.claim("worker-1"), "worker-1", "timeout")
+    
+    assert broker.claim("worker-1") is None
+
+
+def test_cancelling_a_job_drops_only_its_queued_units(tmp_path):
+    broker = _broker(tmp_path)
+    broker.enqueue("job", "retrieve", {})
+    running = broker.claim("worker-1")
+    broker.enqueue("job", "extract", {})
+    broker.enqueue("other", "retrieve", {})
+    
+    assert broker.cancel_job("job") == 1
+    
+    assert broker.complete(running['unit_id'], "worker-1")
+    assert broker.claim("worker-1")['job_id'] == "other"
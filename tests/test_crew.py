@@ -0,0 +1,83 @@
+"""
+Tests for CrewSightCrew runs with offline model clients.
+
+© 2025 Utilyst Inc. All rights reserved.
+"""
+
+import pytest
+from PIL import Image
+
+from benchmarks.fake_drive import FakeDriveServer, synthetic_folder
+from benchmarks.stub_llm import stub_llm_factory
+from src.crewsight.crew import EXECUTION_FAN_OUT, CrewSightCrew
+
+
+FOLDER_URL = "https://drive.google.com/drive/folders/root"
+
+
+@pytest.fixture
+def crew_env(tmp_path, monkeypatch):
+    """Run crews offline in a scratch directory."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("DOWNLOAD_DIRECTORY", raising=False)
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setenv("CREW_MEMORY", "false")
+    monkeypatch.setenv("CREW_PLANNING", "false")
+    monkeypatch.setenv("LLM_CACHE", "false")
+    monkeypatch.setenv("OTEL_SDK_DISABLED", "true")
+    return tmp_path
+
+
+def _crew(events, **settings):
+    return CrewSightCrew(
+        llm_factory=stub_llm_factory(latency=0, output_tokens=20),
+        event_callback=lambda event_type, data: events.append((event_type, data)),
+        **settings
+    )
+
+
+def test_fan_out_reports_the_tasks_of_each_crew(crew_env):
+    events = []
+    with FakeDriveServer(synthetic_folder(3, 200), latency=0) as server:
+        crew = _crew(events, execution_mode=EXECUTION_FAN_OUT, max_concurrency=2)
+        server.configure(crew.google_drive_tool)
+        crew.kickoff(inputs={
+            'google_drive_url': FOLDER_URL,
+            'document_type': "general",
+            'analysis_focus': "comprehensive_review",
+            'output_format': "structured_summary",
+        })
+    
+    started = [data['task'] for event_type, data in events if event_type == 'task_started']
+    finished = [data['task'] for event_type, data in events if event_type == 'task_finished']
+    assert started[0] == "retrieve_documents_task"
+    assert len(finished) == 4
+    assert all(finished)
+    branches = [name for name in finished if name.startswith("Analyze the following")]
+    assert len(branches) == 2
+
+
+def test_troubleshoot_reports_its_task(crew_env):
+    events = []
+    crew = _crew(events)
+    
+    result = crew.troubleshoot({'issue_description': "Pump hums but does not start"})
+    
+    assert result.raw.startswith("Stub analysis.")
+    finished = [data for event_type, data in events if event_type == 'task_finished']
+    assert len(finished) == 1
+    assert finished[0]['task'].startswith("A technician reports the following equipment issue")
+
+
+def test_analyze_image_reports_its_task(crew_env):
+    image_path = crew_env / "pump.jpg"
+    Image.new('RGB', (32, 32), "gray").save(image_path)
+    events = []
+    crew = _crew(events)
+    
+    result = crew.analyze_image(str(image_path), "Red light blinking")
+    
+    assert result.raw.startswith("Stub analysis.")
+    finished = [data for event_type, data in events if event_type == 'task_finished']
+    assert len(finished) == 1
+    assert finished[0]['task'].startswith("A technician uploaded a photo")
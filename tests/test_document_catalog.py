@@ -0,0 +1,73 @@
+"""
+Tests for the document catalog and its tool.
+
+© 2025 Utilyst Inc. All rights reserved.
+"""
+
+from src.crewsight.tools.document_catalog import (
+    ROW_HEADER,
+    DocumentCatalog,
+    DocumentCatalogTool,
+)
+
+
+RESULTS = {
+    'folder_id': "folder",
+    'files': [
+        {
+            'id': "1", 'name': "manuals/Pump.PDF", 'type': "PDF Document",
+            'status': "success", 'file_size': 204800,
+            'modified_time': "2025-03-01T10:00:00Z", 'sync_status': "new", 'cached': True,
+        },
+        {
+            'id': "2", 'name': "specs.docx", 'type': "Word Document",
+            'status': "failed", 'size': "4096",
+            'error': "Drive returned a web page | quota\nexceeded",
+        },
+        {'id': "3", 'name': "README", 'type': "Unknown", 'status': "skipped"},
+    ],
+}
+
+
+def test_render_lists_counts_then_one_row_per_file():
+    lines = DocumentCatalog.from_results(RESULTS).render(header="Drive folder").splitlines()
+    
+    assert lines == [
+        "Drive folder",
+        "files 3: 1 success, 1 failed, 1 skipped",
+        "types: pdf 1, docx 1, ? 1",
+        ROW_HEADER,
+        "manuals/Pump.PDF|pdf|200|2025-03-01|cached,new",
+        "specs.docx|docx|4||failed,Drive returned a web page / quota exceeded",
+        "README||||skipped",
+    ]
+
+
+def test_render_summarizes_rows_beyond_the_limit():
+    lines = DocumentCatalog.from_results(RESULTS).render(max_rows=1).splitlines()
+    
+    assert lines[-2] == "manuals/Pump.PDF|pdf|200|2025-03-01|cached,new"
+    assert lines[-1] == "... 2 more; query the Document Catalog tool"
+
+
+def test_catalog_round_trips_through_json_lines(tmp_path):
+    catalog = DocumentCatalog.from_results(RESULTS)
+    path = catalog.write(str(tmp_path / "folder.jsonl"))
+    
+    loaded = DocumentCatalog.load(str(path))
+    
+    assert loaded.folder_id == "folder"
+    assert loaded.records == catalog.records
+    assert loaded.render() == catalog.render()
+
+
+def test_tool_filters_the_current_catalog():
+    tool = DocumentCatalogTool()
+    assert tool._run() == "No documents have been retrieved yet."
+    tool.set_catalog(DocumentCatalog.from_results(RESULTS))
+    
+    assert tool._run(file_type="PDF").splitlines()[-1].startswith("manuals/Pump.PDF|")
+    assert tool._run(file_type="word document").splitlines()[-1].startswith("specs.docx|")
+    assert tool._run(min_kb=100).splitlines()[0] == "files 1: 1 success"
+    assert tool._run(status="new").splitlines()[-1].startswith("manuals/Pump.PDF|")
+    assert tool._run(name="pump", status="failed") == "No files match."
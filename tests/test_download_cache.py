@@ -0,0 +1,75 @@
+"""
+Tests for the content-addressed download cache.
+
+© 2025 Utilyst Inc. All rights reserved.
+"""
+
+import hashlib
+
+from src.crewsight.tools.download_cache import DownloadCache
+
+
+def _download(tmp_path, name, content):
+    path = tmp_path / "downloads" / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+    return path
+
+
+def test_stored_file_is_revalidated_and_materialized(tmp_path):
+    cache = DownloadCache(str(tmp_path / "cache"))
+    cache.store("file1", _download(tmp_path, "a.pdf", b"manual"), etag='"v1"')
+    
+    entry = cache.lookup("file1")
+    assert cache.conditional_headers(entry) == {'If-None-Match': '"v1"'}
+    destination = cache.materialize(entry, tmp_path / "run" / "a.pdf")
+    
+    assert destination.read_bytes() == b"manual"
+    assert entry['sha256'] == hashlib.sha256(b"manual").hexdigest()
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'bytes_saved': 6}
+
+
+def test_content_shared_by_several_files_is_stored_once(tmp_path):
+    cache = DownloadCache(str(tmp_path / "cache"))
+    md5 = hashlib.md5(b"manual").hexdigest()
+    cache.store("file1", _download(tmp_path, "a.pdf", b"manual"), md5=md5)
+    
+    shared = cache.lookup_content(md5)
+    linked = cache.link("file2", shared, tmp_path / "other" / "a.pdf")
+    
+    assert (tmp_path / "other" / "a.pdf").read_bytes() == b"manual"
+    assert linked['sha256'] == shared['sha256']
+    assert cache.lookup("file2")['etag'] is None
+    objects = [p for p in (tmp_path / "cache" / "objects").rglob("*") if p.is_file()]
+    assert len(objects) == 1
+
+
+def test_replaced_content_frees_the_old_object(tmp_path):
+    cache = DownloadCache(str(tmp_path / "cache"))
+    old = cache.store("file1", _download(tmp_path, "a.pdf", b"version 1"))
+    cache.store("file1", _download(tmp_path, "a.pdf", b"version 2"))
+    
+    assert not cache._object_path(old['sha256']).exists()
+    assert cache.lookup("file1")['size'] == len(b"version 2")
+
+
+def test_least_recently_used_objects_are_evicted(tmp_path):
+    cache = DownloadCache(str(tmp_path / "cache"), max_bytes=25)
+    cache.store("old", _download(tmp_path, "old.pdf", b"o" * 10))
+    cache.store("used", _download(tmp_path, "used.pdf", b"u" * 10))
+    cache.materialize(cache.lookup("old"), tmp_path / "run" / "old.pdf")
+    
+    cache.store("new", _download(tmp_path, "new.pdf", b"n" * 10))
+    
+    assert cache.lookup("used") is None
+    assert cache.lookup("old") is not None
+    assert cache.lookup("new") is not None
+
+
+def test_entries_whose_object_is_gone_are_dropped(tmp_path):
+    cache = DownloadCache(str(tmp_path / "cache"))
+    entry = cache.store("file1", _download(tmp_path, "a.pdf", b"manual"))
+    cache._object_path(entry['sha256']).unlink()
+    
+    assert cache.lookup("file1") is None
+    assert cache.lookup_content("anything") is None
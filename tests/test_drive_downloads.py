@@ -0,0 +1,59 @@
+"""
+Tests for Drive file downloads.
+
+© 2025 Utilyst Inc. All rights reserved.
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from src.crewsight.tools.public_google_drive_processor import PublicGoogleDriveProcessorTool
+
+
+PAGE = b"<html><body>Pump P-200 manual</body></html>"
+
+
+class HTMLHandler(BaseHTTPRequestHandler):
+    """Answer every download with the same HTML page."""
+    
+    def log_message(self, format, *args):
+        pass
+    
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(PAGE)))
+        self.end_headers()
+        self.wfile.write(PAGE)
+
+
+@pytest.fixture
+def html_tool(tmp_path):
+    server = HTTPServer(("127.0.0.1", 0), HTMLHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    tool = PublicGoogleDriveProcessorTool(download_dir=str(tmp_path / "downloads"), use_cache=False)
+    tool.direct_download_url = f"http://127.0.0.1:{server.server_port}/uc?id={{file_id}}"
+    yield tool
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize("file_name, mime_type", [
+    ("manual.html", "text/html"),
+    ("manual.htm", None),
+])
+def test_html_files_are_downloaded(html_tool, file_name, mime_type):
+    result = html_tool._download_file("1", file_name, mime_type)
+    
+    assert result['status'] == "success"
+    assert (html_tool.download_dir / file_name).read_bytes() == PAGE
+
+
+def test_web_page_served_instead_of_a_file_is_a_failure(html_tool):
+    result = html_tool._download_file("1", "manual.pdf", "application/pdf")
+    
+    assert result['status'] == "failed"
+    assert result['error'].startswith("Drive returned a web page")
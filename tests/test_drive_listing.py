@@ -0,0 +1,47 @@
+"""
+Tests for Drive folder listing.
+
+© 2025 Utilyst Inc. All rights reserved.
+"""
+
+from benchmarks.fake_drive import FakeDriveServer, synthetic_tree
+from src.crewsight.tools.drive_listing import DriveLister, safe_name, unique_names
+from src.crewsight.tools.drive_session import DriveSession
+
+
+def test_safe_name_replaces_path_separators():
+    assert safe_name("a/b\\c") == "a_b_c"
+    assert safe_name("..") == "_"
+
+
+def test_unique_names_tells_duplicates_apart_by_id():
+    files = unique_names([
+        {'id': "1111111111", 'name': "manuals/Report.pdf"},
+        {'id': "2222222222", 'name': "manuals/report.pdf"},
+        {'id': "3333333333", 'name': "manuals/other.pdf"},
+    ])
+    
+    assert [f['name'] for f in files] == [
+        "manuals/Report (11111111).pdf",
+        "manuals/report (22222222).pdf",
+        "manuals/other.pdf",
+    ]
+
+
+def test_unique_names_is_stable_across_listing_order():
+    first = [{'id': "aaaaaaaaaa", 'name': "x.txt"}, {'id': "bbbbbbbbbb", 'name': "x.txt"}]
+    second = [dict(f) for f in reversed(first)]
+    
+    names = {f['id']: f['name'] for f in unique_names(first)}
+    assert names == {f['id']: f['name'] for f in unique_names(second)}
+
+
+def test_lister_counts_every_request_of_concurrent_folders():
+    files, tree = synthetic_tree(folder_count=30, files_per_folder=10, file_size=10)
+    with FakeDriveServer(files, latency=0.01, tree=tree, max_page_size=3) as server:
+        lister = DriveLister(DriveSession(), server.list_api_url, api_key="test", max_workers=8)
+        listed = lister.list("root")
+        requests = server.request_count
+    
+    assert len(listed) == len(files)
+    assert lister.requests_made == requests
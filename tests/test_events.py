@@ -0,0 +1,39 @@
+"""
+Tests for the job event bus.
+
+© 2025 Utilyst Inc. All rights reserved.
+"""
+
+import asyncio
+
+from api.events import EventBus
+
+
+def test_history_is_bounded_per_job():
+    bus = EventBus(max_events_per_job=3)
+    for index in range(5):
+        bus.publish("job", "agent_step", {'index': index})
+    
+    async def replay():
+        history, _ = bus.subscribe("job")
+        return [event['data']['index'] for event in history]
+    
+    assert asyncio.run(replay()) == [2, 3, 4]
+
+
+def test_transient_events_reach_live_subscribers_only():
+    bus = EventBus(max_events_per_job=3)
+    
+    async def run():
+        _, queue = bus.subscribe("job")
+        bus.publish("job", "files_listed", {'total_files': 2})
+        for written in range(10):
+            bus.publish("job", "download_progress", {'bytes': written})
+        await asyncio.sleep(0)
+        live = [queue.get_nowait()['type'] for _ in range(queue.qsize())]
+        history, _ = bus.subscribe("job")
+        return live, [event['type'] for event in history]
+    
+    live, history = asyncio.run(run())
+    assert live == ["files_listed"] + ["download_progress"] * 10
+    assert history == ["files_listed"]
@@ -0,0 +1,33 @@
+"""
+Tests for the document extraction pipeline.
+
+© 2025 Utilyst Inc. All rights reserved.
+"""
+
+from pathlib import Path
+
+from src.crewsight.extraction.pipeline import ExtractionPipeline
+
+
+def test_names_that_sanitize_alike_keep_their_own_text(tmp_path):
+    files = []
+    for index, name in enumerate(["a/b.txt", "a b.txt", "a_b.txt"]):
+        path = tmp_path / f"download{index}.txt"
+        path.write_text(f"contents of document {index}", encoding='utf-8')
+        files.append({
+            'id': f"file{index}", 'name': name, 'type': "Text File", 'file_path': str(path)
+        })
+    
+    pipeline = ExtractionPipeline(
+        output_dir=str(tmp_path / "extracted"), max_workers=1, use_memo=False
+    )
+    try:
+        results = pipeline.extract_all(files, namespace="folder")
+    finally:
+        pipeline.shutdown()
+    
+    assert [r['status'] for r in results] == ["success"] * 3
+    assert len({r['text_path'] for r in results}) == 3
+    for index, result in enumerate(results):
+        text = Path(result['text_path']).read_text(encoding='utf-8')
+        assert f"contents of document {index}" in text
@@ -0,0 +1,45 @@
+"""
+Tests for the crew's LLM clients.
+
+© 2025 Utilyst Inc. All rights reserved.
+"""
+
+import litellm
+import pytest
+from litellm.integrations.custom_logger import CustomLogger
+
+from src.crewsight.llm import CachedLLM, TracedLLM
+from src.crewsight.llm.response_cache import LLMResponseCache
+
+
+@pytest.fixture(autouse=True)
+def litellm_callbacks(monkeypatch):
+    """Keep the callbacks crewai registers on litellm local to each test."""
+    monkeypatch.setattr(litellm, "callbacks", [])
+
+
+def test_traced_llm_accepts_crewai_call_signature():
+    # crewai's agents call llm.call(messages, callbacks=...); litellm answers
+    # mock_response without a request
+    llm = TracedLLM(model="gpt-4o-mini", api_key="test", mock_response="Pump is primed.")
+    handler = CustomLogger()
+    
+    response = llm.call([{'role': "user", 'content': "Is the pump primed?"}], callbacks=[handler])
+    
+    assert response == "Pump is primed."
+    assert litellm.callbacks == [handler]
+
+
+def test_cached_llm_answers_repeated_crewai_calls_from_the_cache(tmp_path):
+    cache = LLMResponseCache(db_path=str(tmp_path / "llm_cache.db"))
+    llm = CachedLLM(
+        model="gpt-4o-mini", cache=cache, api_key="test", mock_response="Pump is primed."
+    )
+    messages = [{'role': "user", 'content': "Is the pump primed?"}]
+    
+    first = llm.call(messages, callbacks=[CustomLogger()])
+    second = llm.call(messages, callbacks=[CustomLogger()])
+    
+    assert first == second == "Pump is primed."
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 1
@@ -0,0 +1,47 @@
+"""
+Tests for the map-reduce analyzer.
+
+© 2025 Utilyst Inc. All rights reserved.
+"""
+
+import threading
+import time
+
+from src.crewsight.analysis.map_reduce import MapReduceAnalyzer
+
+
+class ConcurrencyLLM:
+    """LLM client that records the most calls in flight per prompt kind."""
+    
+    def __init__(self, latency=0.05):
+        self.latency = latency
+        self.in_flight = 0
+        self.peak = {}
+        self._lock = threading.Lock()
+    
+    def call(self, messages):
+        prompt = messages[-1]['content']
+        kind = prompt.split()[0]
+        with self._lock:
+            self.in_flight += 1
+            self.peak[kind] = max(self.peak.get(kind, 0), self.in_flight)
+        time.sleep(self.latency)
+        with self._lock:
+            self.in_flight -= 1
+        return f"{kind} analysis"
+
+
+def test_documents_are_reduced_concurrently():
+    llm = ConcurrencyLLM()
+    analyzer = MapReduceAnalyzer(
+        llm, max_rpm=0, max_concurrency=4, chunk_tokens=50, overlap_tokens=0
+    )
+    documents = {f"doc{i}.pdf": "pump maintenance schedule " * 60 for i in range(4)}
+    
+    result = analyzer.analyze(documents, "maintenance")
+    
+    assert set(result['documents']) == set(documents)
+    assert result['stats']['reduce_document']['calls'] == 4
+    # "Combine these partial analyses" prompts of different documents overlap
+    assert llm.peak['Combine'] > 1
+    assert result['summary'] == "Combine analysis"
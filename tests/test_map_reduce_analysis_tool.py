@@ -0,0 +1,65 @@
+"""
+Tests for the Map-Reduce Document Analyzer tool.
+
+© 2025 Utilyst Inc. All rights reserved.
+"""
+
+from pathlib import Path
+
+from src.crewsight.tools.extracted_documents import ExtractedDocumentsTool
+from src.crewsight.tools.map_reduce_analysis import MapReduceAnalysisTool
+
+
+class RecordingAnalyzer:
+    """Analyzer returning one fixed analysis per document."""
+    
+    def __init__(self):
+        self.calls = 0
+    
+    def analyze(self, documents, focus):
+        self.calls += 1
+        return {
+            'documents': {name: f"Findings of {name}. " * 50 for name in documents},
+            'summary': f"Summary for {focus}.",
+            'stats': {},
+        }
+
+
+def _tool(tmp_path, count=20):
+    results = []
+    for index in range(count):
+        text_path = tmp_path / f"doc{index}.txt"
+        text_path.write_text(f"document {index}", encoding='utf-8')
+        results.append({
+            'file_name': f"doc{index}.pdf", 'status': "success", 'text_path': str(text_path)
+        })
+    documents_tool = ExtractedDocumentsTool()
+    documents_tool.set_documents(results)
+    analyzer = RecordingAnalyzer()
+    tool = MapReduceAnalysisTool(documents_tool, analyzer, output_dir=str(tmp_path / "analyses"))
+    return tool, analyzer
+
+
+def test_returns_only_the_cross_document_analysis(tmp_path):
+    tool, _ = _tool(tmp_path)
+    
+    output = tool._run("safety")
+    
+    assert "Summary for safety." in output
+    assert "Findings of" not in output
+    stored = Path(tool.results["safety"]['path']).read_text(encoding='utf-8')
+    assert stored.count("# doc") == 20
+    assert str(tool.results["safety"]['path']) in output
+
+
+def test_looks_up_one_document_without_analyzing_again(tmp_path):
+    tool, analyzer = _tool(tmp_path)
+    tool._run("safety")
+    
+    output = tool._run("safety", document_name="doc3.pdf")
+    
+    assert output.startswith("# doc3.pdf")
+    assert "Findings of doc3.pdf." in output
+    assert "doc4.pdf" not in output
+    assert analyzer.calls == 1
+    assert "No analysis" in tool._run("safety", document_name="missing.pdf")
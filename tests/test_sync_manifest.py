@@ -0,0 +1,105 @@
+"""
+Tests for the incremental sync manifest.
+
+© 2025 Utilyst Inc. All rights reserved.
+"""
+
+from src.crewsight.tools.sync_manifest import (
+    SYNC_MODIFIED,
+    SYNC_NEW,
+    SYNC_UNCHANGED,
+    SyncManifest,
+    split_analysis,
+)
+
+
+ANALYSIS = """Overview of both manuals.
+
+## pump.pdf
+Pump findings.
+
+### Tables
+Pressure table.
+
+## valve.pdf
+Valve findings.
+
+# Cross-document findings
+Both mention the same seal.
+"""
+
+
+PUMP = ("1", "pump.pdf", "a" * 64)
+VALVE = ("2", "valve.pdf", "b" * 64)
+MOTOR = ("3", "motor.pdf", "d" * 64)
+
+
+def _downloaded(file_id, name, sha256):
+    return {'id': file_id, 'name': name, 'status': 'success', 'file_size': 10, 'sha256': sha256}
+
+
+def _sync(manifest, files):
+    for file_info in files:
+        file_info['sync_status'] = manifest.classify(file_info)
+    manifest.record_run(files)
+    return {f['name']: f['sync_status'] for f in files}
+
+
+def test_split_analysis_keeps_subsections_and_drops_shared_text():
+    sections = split_analysis(ANALYSIS, ["pump.pdf", "valve.pdf", "missing.pdf"])
+    
+    assert set(sections) == {"pump.pdf", "valve.pdf"}
+    assert "Pressure table." in sections["pump.pdf"]
+    assert "Valve findings." not in sections["pump.pdf"]
+    assert "same seal" not in sections["valve.pdf"]
+
+
+def test_split_analysis_prefers_the_longest_matching_name():
+    analysis = "## docs/pump.pdf\nA\n## pump.pdf\nB\n"
+    sections = split_analysis(analysis, ["pump.pdf", "docs/pump.pdf"])
+    
+    assert sections == {"docs/pump.pdf": "## docs/pump.pdf\nA", "pump.pdf": "## pump.pdf\nB"}
+
+
+def test_changed_file_analysis_is_not_reused(tmp_path):
+    manifest = SyncManifest(str(tmp_path), "folder")
+    statuses = _sync(manifest, [_downloaded(*PUMP), _downloaded(*VALVE)])
+    assert statuses == {"pump.pdf": SYNC_NEW, "valve.pdf": SYNC_NEW}
+    manifest.record_analysis(ANALYSIS)
+    manifest.save()
+    
+    manifest = SyncManifest(str(tmp_path), "folder")
+    statuses = _sync(manifest, [_downloaded(*PUMP), _downloaded("2", "valve.pdf", "c" * 64)])
+    assert statuses == {"pump.pdf": SYNC_UNCHANGED, "valve.pdf": SYNC_MODIFIED}
+    
+    reusable = manifest.reusable_analyses()
+    assert list(reusable) == ["pump.pdf"]
+    assert "Pump findings." in reusable["pump.pdf"]
+    assert "Valve findings." not in reusable["pump.pdf"]
+
+
+def test_files_without_a_section_stay_pending(tmp_path):
+    manifest = SyncManifest(str(tmp_path), "folder")
+    _sync(manifest, [_downloaded(*PUMP), _downloaded(*MOTOR)])
+    
+    manifest.record_analysis(ANALYSIS)
+    
+    assert manifest.pending == ["3"]
+
+
+def test_single_file_analysis_is_stored_whole(tmp_path):
+    manifest = SyncManifest(str(tmp_path), "folder")
+    _sync(manifest, [_downloaded(*PUMP)])
+    
+    manifest.record_analysis("No headings at all.", file_name="pump.pdf")
+    
+    assert manifest.pending == []
+    assert manifest.files["1"]['analysis'] == SyncManifest.analysis_id("1", "a" * 64)
+
+
+def test_run_wide_analyses_of_older_manifests_are_redone(tmp_path):
+    manifest = SyncManifest(str(tmp_path), "folder")
+    _sync(manifest, [_downloaded(*PUMP)])
+    manifest.files["1"]['analysis'] = "0123456789abcdef"
+    
+    assert manifest.classify(_downloaded(*PUMP)) == SYNC_MODIFIED
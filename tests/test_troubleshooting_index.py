@@ -0,0 +1,99 @@
+"""
+Tests for the troubleshooting index.
+
+© 2025 Utilyst Inc. All rights reserved.
+"""
+
+import pytest
+
+from src.crewsight.retrieval.troubleshooting_index import (
+    TroubleshootingIndex,
+    extract_error_codes,
+    normalize_code,
+)
+
+
+PUMP_MANUAL = """Pump P-200 troubleshooting.
+
+Error E-04 means the motor overheated. Turn off the pump and let it cool.
+- Check the cooling fan for blockages.
+- Clean the air intake filter.
+
+If the pump is noisy or vibrates, inspect the impeller for debris and tighten
+the mounting bolts.
+"""
+
+VALVE_MANUAL = """Valve V-10 troubleshooting.
+
+Error E4 on the valve display indicates a stuck actuator. Reset the controller.
+"""
+
+
+@pytest.mark.parametrize("code", ["E-04", "E04", "e_4", "E 4", "E4"])
+def test_normalize_code_ignores_separators_and_leading_zeros(code):
+    assert normalize_code(code) == "E4"
+
+
+def test_normalize_code_keeps_hex_and_suffixes():
+    assert normalize_code("0x001F") == "0X1F"
+    assert normalize_code("AL-003b") == "AL3B"
+    assert normalize_code("not a code") == "NOTACODE"
+
+
+def test_extract_error_codes_finds_keyword_and_prefixed_codes():
+    text = "Fault code 0x1F shown; alarm AL-03 follows ERR-101, then error 7."
+    
+    assert extract_error_codes(text) == ["0X1F", "7", "AL3", "ERR101"]
+
+
+def _index(tmp_path, **settings):
+    index = TroubleshootingIndex(str(tmp_path / "troubleshooting.db"), **settings)
+    index.add_document("pump_p200.pdf", "a" * 64, PUMP_MANUAL)
+    index.add_document("valve_v10.pdf", "b" * 64, VALVE_MANUAL)
+    return index
+
+
+def test_lookup_by_error_code_prefers_the_reported_equipment(tmp_path):
+    index = _index(tmp_path)
+    
+    result = index.lookup("display shows an error", equipment_type="pump", error_code="e04")
+    
+    assert result['match'] == "error_code"
+    assert result['sources'][0]['document'] == "pump_p200.pdf"
+    assert {s['document'] for s in result['sources']} == {"pump_p200.pdf", "valve_v10.pdf"}
+    assert "Check the cooling fan for blockages." in result['recommendations']
+
+
+def test_lookup_by_keywords_needs_enough_query_coverage(tmp_path):
+    index = _index(tmp_path)
+    
+    result = index.lookup("impeller noisy vibrates")
+    assert result['match'] == "keyword"
+    assert result['sources'][0]['document'] == "pump_p200.pdf"
+    
+    assert index.lookup("impeller leaking refrigerant compressor") is None
+    # Unknown error codes fall back to the keyword search
+    assert index.lookup("impeller noisy", error_code="E99")['match'] == "keyword"
+
+
+def test_reindexing_a_document_replaces_its_passages(tmp_path):
+    index = _index(tmp_path)
+    assert index.add_document("pump_p200.pdf", "a" * 64, PUMP_MANUAL) == 0
+    
+    index.add_document("pump_p200.pdf", "c" * 64, "Error E-09: replace the seal.")
+    
+    assert index.lookup("motor overheated", error_code="E4")['sources'] == [
+        {'document': "valve_v10.pdf", 'score': 0.0}
+    ]
+    assert index.lookup("seal", error_code="E9")['analysis'] == "Error E-09: replace the seal."
+    assert index.stats()['documents'] == 2
+
+
+def test_lookup_sees_documents_added_by_another_connection(tmp_path):
+    index = _index(tmp_path)
+    assert index.lookup("compressor refrigerant leak") is None
+    
+    other = TroubleshootingIndex(str(tmp_path / "troubleshooting.db"))
+    other.add_document("chiller.pdf", "d" * 64, "Compressor refrigerant leak: check the seals.")
+    
+    assert index.lookup("compressor refrigerant leak")['sources'][0]['document'] == "chiller.pdf"
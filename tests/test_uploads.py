@@ -0,0 +1,116 @@
+"""
+Tests for streaming image uploads.
+
+© 2025 Utilyst Inc. All rights reserved.
+"""
+
+import asyncio
+import hashlib
+import io
+
+import pytest
+from fastapi import Request
+from PIL import Image
+
+from api.uploads import ImageStore, InvalidUpload, SpooledUpload, UploadTooLarge, stream_upload
+
+
+BOUNDARY = "crewsight-boundary"
+
+
+def _multipart(field_name, content, filename="pump.jpg"):
+    return (
+        f"--{BOUNDARY}\r\n"
+        f'Content-Disposition: form-data; name="note"\r\n\r\n'
+        f"Red light blinking\r\n"
+        f"--{BOUNDARY}\r\n"
+        f'Content-Disposition: form-data; name="{field_name}"; filename="{filename}"\r\n'
+        f"Content-Type: image/jpeg\r\n\r\n"
+    ).encode() + content + f"\r\n--{BOUNDARY}--\r\n".encode()
+
+
+def _request(body, content_length=None, chunk_size=1000):
+    """Build a request whose body arrives in ``chunk_size`` byte messages."""
+    chunks = [body[i:i + chunk_size] for i in range(0, len(body), chunk_size)] or [b""]
+    messages = [
+        {'type': "http.request", 'body': chunk, 'more_body': index < len(chunks) - 1}
+        for index, chunk in enumerate(chunks)
+    ]
+    headers = [(b"content-type", f"multipart/form-data; boundary={BOUNDARY}".encode())]
+    headers.append((b"content-length", str(content_length or len(body)).encode()))
+    
+    async def receive():
+        return messages.pop(0)
+    
+    return Request({'type': "http", 'method': "POST", 'headers': headers}, receive)
+
+
+def _stream(request, **settings):
+    return asyncio.run(stream_upload(request, **settings))
+
+
+def test_file_field_is_spooled_and_hashed():
+    content = bytes(range(256)) * 40
+    
+    upload = _stream(_request(_multipart("file", content)))
+    
+    assert upload.filename == "pump.jpg"
+    assert upload.content_type == "image/jpeg"
+    assert upload.size == len(content)
+    assert upload.sha256 == hashlib.sha256(content).hexdigest()
+    assert upload.file.read() == content
+
+
+def test_oversized_file_is_rejected_while_streaming():
+    body = _multipart("file", b"x" * 5000)
+    
+    # The declared length passes the early check; the limit still applies to the data
+    with pytest.raises(UploadTooLarge):
+        _stream(_request(body, content_length=100), max_bytes=4096)
+
+
+def test_oversized_declared_length_is_rejected_before_reading():
+    request = _request(_multipart("file", b"x"), content_length=10 * 1024 * 1024)
+    
+    with pytest.raises(UploadTooLarge):
+        _stream(request, max_bytes=1024 * 1024)
+
+
+def test_file_at_the_limit_is_accepted():
+    upload = _stream(_request(_multipart("file", b"x" * 4096)), max_bytes=4096)
+    
+    assert upload.size == 4096
+
+
+def test_missing_file_field_is_invalid():
+    with pytest.raises(InvalidUpload):
+        _stream(_request(_multipart("image", b"x")))
+
+
+def _jpeg(size=(640, 480)):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, "gray").save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+def _spooled(content):
+    sha256 = hashlib.sha256(content).hexdigest()
+    return SpooledUpload(io.BytesIO(content), "pump.jpg", "image/jpeg", sha256, len(content))
+
+
+def test_image_is_stored_with_its_derivatives(tmp_path):
+    meta = ImageStore(str(tmp_path), max_side=320).process(_spooled(_jpeg()))
+    
+    assert (meta['width'], meta['height']) == (640, 480)
+    with Image.open(meta['image_path']) as image:
+        assert image.size == (320, 240)
+
+
+@pytest.mark.parametrize("length", [100, 1000])
+def test_truncated_image_is_invalid(tmp_path, length):
+    store = ImageStore(str(tmp_path))
+    
+    # Cut in the header, or in the image data that only fails once decoded
+    with pytest.raises(InvalidUpload):
+        store.process(_spooled(_jpeg()[:length]))
+    assert list(tmp_path.iterdir()) == []
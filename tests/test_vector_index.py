@@ -0,0 +1,51 @@
+"""
+Tests for the vector index.
+
+© 2025 Utilyst Inc. All rights reserved.
+"""
+
+from src.crewsight.retrieval import VectorIndex
+from src.crewsight.retrieval.embeddings import HashingEmbedder
+
+
+PUMP = "Pump P-200: prime the pump before starting the motor."
+VALVE = "Valve V-10: reset the actuator controller after a stuck valve alarm."
+
+
+def _index(tmp_path):
+    return VectorIndex(str(tmp_path / "index"), HashingEmbedder())
+
+
+def test_search_is_limited_to_the_given_documents(tmp_path):
+    index = _index(tmp_path)
+    index.add_document("customer-a/pump.pdf", "a" * 64, PUMP)
+    index.add_document("customer-b/valve.pdf", "b" * 64, VALVE)
+    
+    matches = index.search("stuck valve actuator", documents=["customer-a/pump.pdf"])
+    
+    assert [m['document'] for m in matches] == ["customer-a/pump.pdf"]
+    assert index.search("stuck valve actuator", documents=[]) == []
+    assert index.search("stuck valve actuator")[0]['document'] == "customer-b/valve.pdf"
+
+
+def test_shared_content_is_found_under_each_folder_name(tmp_path):
+    index = _index(tmp_path)
+    index.add_document("customer-a/pump.pdf", "a" * 64, PUMP)
+    assert index.add_document("customer-b/pump copy.pdf", "a" * 64, PUMP) == 0
+    
+    matches = index.search("prime the pump", documents=["customer-b/pump copy.pdf"])
+    
+    assert matches[0]['document'] == "customer-b/pump copy.pdf"
+
+
+def test_content_is_retired_once_no_document_has_it(tmp_path):
+    index = _index(tmp_path)
+    index.add_document("customer-a/pump.pdf", "a" * 64, PUMP)
+    index.add_document("customer-b/pump.pdf", "a" * 64, PUMP)
+    
+    index.add_document("customer-a/pump.pdf", "c" * 64, VALVE)
+    assert index.search("prime the pump", documents=["customer-b/pump.pdf"])
+    
+    index.add_document("customer-b/pump.pdf", "c" * 64, VALVE)
+    assert index.stats()['documents'] == 1
+    assert {m['document'] for m in index.search("prime the pump")} == {"customer-a/pump.pdf"}